@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""
+번역 동기화 도구 성능 측정 스크립트 모음
+
+저장소 루트에서 모듈로 실행합니다. 예: python -m benchmarks.bench_tsv_memory
+"""
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+이스케이프/복원 함수 마이크로벤치마크
+
+변경 전 구현(정규식 4회 / str.replace 5회 연쇄)과 현재 한 번의 스캔으로 처리하는 구현의
+필드당 처리 시간을 비교하고, 무작위 입력으로 왕복 변환이 무손실인지 확인합니다.
+
+사용법: python -m benchmarks.bench_escape [필드_수]   (기본 100000)
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import translation_sync
+
+
+def legacy_escape_special_chars(text):
+    """변경 전 escape_special_chars (비교용)"""
+    if not isinstance(text, str):
+        return text
+    text = re.sub(r'\\(?![\\nrt"])', r'\\\\', text)
+    text = re.sub(r'(?<!\\)"', r'\\"', text)
+    text = re.sub(r'(?<!\\)\n', r'\\n', text)
+    text = re.sub(r'(?<!\\)\r', r'\\r', text)
+    return text
+
+
+def legacy_unescape_special_chars(text):
+    """변경 전 unescape_special_chars (비교용)"""
+    if not isinstance(text, str):
+        return text
+    text = text.replace('\\"', '"')
+    text = text.replace('\\n', '\n')
+    text = text.replace('\\r', '\r')
+    text = text.replace('\\t', '\t')
+    text = text.replace('\\\\', '\\')
+    return text
+
+
+def legacy_clean_tsv_field(text):
+    """변경 전 clean_tsv_field (비교용)"""
+    if not isinstance(text, str):
+        return str(text) if text is not None else ''
+    text = text.replace('\t', ' ')
+    text = text.replace('\n', '\\n')
+    text = text.replace('\r', '\\r')
+    return text
+
+
+def legacy_prepare_translation_input(text):
+    """변경 전 prepare_translation_input (비교용)"""
+    if not isinstance(text, str):
+        return str(text) if text is not None else ''
+    text = legacy_escape_special_chars(text)
+    text = text.replace('\t', ' ')
+    return text
+
+
+def make_fields(count, seed=0):
+    """실제 로케일과 비슷한 비율의 필드 생성 (대부분 평문, 일부 여러 줄/따옴표/백슬래시)"""
+    rng = random.Random(seed)
+    fields = []
+    for i in range(count):
+        kind = rng.random()
+        if kind < 0.6:
+            text = f'아이템 이름 {i}'
+        elif kind < 0.85:
+            text = f'첫 줄 설명 {i}\n두 번째 줄 "인용" 문장\n세 번째 줄'
+        elif kind < 0.95:
+            text = f'Plain English description number {i} with some length to it.'
+        else:
+            text = f'경로 C:\\Game\\{i}\t탭과 \\n 리터럴'
+        fields.append(text)
+    return fields
+
+
+def check_round_trip(samples=20000, seed=1):
+    """무작위 문자열로 unescape(escape(x)) == x, escape(unescape(y)) == y 확인"""
+    rng = random.Random(seed)
+    alphabet = 'ab가\\"\n\rnrt'
+    escape = translation_sync.escape_special_chars
+    unescape = translation_sync.unescape_special_chars
+    legacy_failures = 0
+    for _ in range(samples):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+        escaped = escape(text)
+        assert unescape(escaped) == text, repr(text)
+        assert translation_sync.is_canonical_escaped(escaped), repr(escaped)
+        assert escape(unescape(escaped)) == escaped, repr(escaped)
+        if legacy_unescape_special_chars(legacy_escape_special_chars(text)) != text:
+            legacy_failures += 1
+    print(f"왕복 변환 확인: {samples:,}개 무작위 문자열 모두 무손실 "
+          f"(변경 전 구현은 {legacy_failures:,}개 손실)")
+
+
+def bench(label, func, fields, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in fields:
+            func(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    fields = make_fields(count)
+    escaped = [translation_sync.escape_special_chars(text) for text in fields]
+
+    check_round_trip()
+    print(f"\n필드 {count:,}개 기준 (3회 중 최솟값)")
+    pairs = [
+        ('escape_special_chars', legacy_escape_special_chars,
+         translation_sync.escape_special_chars, fields),
+        ('unescape_special_chars', legacy_unescape_special_chars,
+         translation_sync.unescape_special_chars, escaped),
+        ('clean_tsv_field', legacy_clean_tsv_field,
+         translation_sync.clean_tsv_field, fields),
+        ('prepare_translation_input', legacy_prepare_translation_input,
+         translation_sync.prepare_translation_input, fields),
+    ]
+    for name, legacy, current, data in pairs:
+        before = bench(name, legacy, data)
+        after = bench(name, current, data)
+        print(f"{name:<28} 변경 전 {before * 1e3:8.1f} ms   변경 후 {after * 1e3:8.1f} ms   "
+              f"{before / after:5.1f}배")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+동기화 파이프라인 단계별 벤치마크
+
+합성 kr.json / en.json / TSV 세트를 크기별로 만들고 단계마다 소요 시간(벽시계/CPU),
+tracemalloc 최대 메모리, 초당 처리 행 수를 측정합니다. 측정값은 benchmarks/baseline.json 의
+기준값과 비교해 허용 범위를 넘으면 회귀로 표시하고 종료 코드 1 을 반환합니다.
+기준값은 측정한 컴퓨터에 따라 다르므로, 같은 컴퓨터에서 변경 전후를 비교할 때 사용하세요.
+write_snapshot 단계는 --snapshot 처럼 파싱 스냅샷을 함께 저장하며 TSV 를 쓰는 시간이고 (write_tsv 와 비교),
+load_snapshot 단계는 그 스냅샷으로 TSV 를 다시 읽는 시간입니다 (load_tsv 와 비교).
+load_concurrent 단계는 세 입력 파일을 동시에 읽는 시간이며, 순서대로 읽은 세 단계의 합과 비교해 속도 향상을 표시합니다.
+
+사용법: python -m benchmarks.bench_pipeline [옵션]
+  --sizes=10000,100000,500000  측정할 키 수 (기본값)
+  --output=결과.json           측정 결과 저장
+  --save-baseline              측정 결과를 기준값으로 저장
+  --tolerance=0.5              시간 허용 증가율 (기본 50%)
+  --memory-tolerance=0.2       메모리 허용 증가율 (기본 20%)
+"""
+
+import gc
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import translation_sync
+import translation_sync_loader
+from benchmarks.synthetic import write_locale_triple
+
+DEFAULT_SIZES = (10000, 100000, 500000)
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+STAGES = ('load_kr', 'load_en', 'load_tsv', 'load_concurrent', 'escape', 'write_tsv', 'write_snapshot',
+          'load_snapshot', 'deleted_report')
+SEQUENTIAL_LOAD_STAGES = ('load_kr', 'load_en', 'load_tsv')
+
+
+def pipeline_stages(paths, work_dir):
+    """(단계 이름, 실행 함수) 목록 - 각 함수는 처리한 행 수를 반환하고, 결과는 state 에 보관"""
+    kr_path, en_path, tsv_path = paths
+    state = {}
+
+    def load_kr():
+        state['kr'] = translation_sync.load_json_file(kr_path)
+        return len(state['kr'])
+
+    def load_en():
+        state['en'] = translation_sync.load_json_file(en_path)
+        return len(state['en'])
+
+    def load_tsv():
+        state['tsv'], state['header'] = translation_sync.load_tsv_file(tsv_path, use_snapshot=False)
+        return len(state['tsv'])
+
+    def load_concurrent():
+        kr, en, (tsv, _) = translation_sync_loader.load_inputs(kr_path, en_path, tsv_path)
+        return len(kr) + len(en) + len(tsv)
+
+    def escape():
+        escape_special_chars = translation_sync.escape_special_chars
+        for value in state['kr'].values():
+            escape_special_chars(value)
+        return len(state['kr'])
+
+    output_path = os.path.join(work_dir, 'output.tsv')
+    snapshot_output_path = os.path.join(work_dir, 'output_snapshot.tsv')
+
+    def write_tsv():
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        new_entries, updated_entries, state['deleted'] = translation_sync.create_updated_tsv(
+            state['kr'], state['en'], state['tsv'], state['header'], output_path
+        )
+        return len(new_entries) + len(updated_entries)
+
+    def write_snapshot():
+        if os.path.exists(snapshot_output_path):
+            os.remove(snapshot_output_path)
+        new_entries, updated_entries, _ = translation_sync.create_updated_tsv(
+            state['kr'], state['en'], state['tsv'], state['header'], snapshot_output_path, write_snapshot=True
+        )
+        return len(new_entries) + len(updated_entries)
+
+    def load_snapshot():
+        translations, _ = translation_sync.load_tsv_file(snapshot_output_path)
+        return len(translations)
+
+    def deleted_report():
+        translation_sync.save_deleted_items_to_file(
+            state['deleted'], state['tsv'], os.path.join(work_dir, 'deleted.txt')
+        )
+        return len(state['deleted'])
+
+    return [
+        ('load_kr', load_kr), ('load_en', load_en), ('load_tsv', load_tsv),
+        ('load_concurrent', load_concurrent), ('escape', escape), ('write_tsv', write_tsv),
+        ('write_snapshot', write_snapshot), ('load_snapshot', load_snapshot), ('deleted_report', deleted_report),
+    ]
+
+
+def run_pipeline(paths, work_dir, trace_memory):
+    """파이프라인을 한 번 실행하며 단계별 측정값 반환 (메모리 추적은 시간을 왜곡하므로 따로 실행)"""
+    results = {}
+    for name, stage in pipeline_stages(paths, work_dir):
+        gc.collect()
+        if trace_memory:
+            tracemalloc.start()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        with redirect_stdout(io.StringIO()):
+            rows = stage()
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[name] = {'peak_mb': round(peak / 2**20, 2)}
+        else:
+            results[name] = {
+                'seconds': round(wall, 4),
+                'cpu_seconds': round(cpu, 4),
+                'rows': rows,
+                'rows_per_sec': round(rows / wall) if wall > 0 else None,
+            }
+    return results
+
+
+def measure_size(count):
+    """키 수 하나에 대해 합성 데이터를 만들고 단계별 시간/메모리 측정"""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_locale_triple(tmp, count)
+        timings = run_pipeline(paths, tmp, trace_memory=False)
+        memory = run_pipeline(paths, tmp, trace_memory=True)
+    for name in STAGES:
+        timings[name].update(memory[name])
+    return timings
+
+
+def compare_with_baseline(results, baseline, tolerance, memory_tolerance):
+    """기준값 대비 회귀 목록 [(크기, 단계, 설명)]"""
+    regressions = []
+    for size, stages in results.items():
+        for name, current in stages.items():
+            base = baseline.get(size, {}).get(name)
+            if not base:
+                continue
+            if base.get('seconds') and current['seconds'] > base['seconds'] * (1 + tolerance):
+                regressions.append((size, name, f"시간 {base['seconds']}s → {current['seconds']}s"))
+            if base.get('peak_mb') and current['peak_mb'] > base['peak_mb'] * (1 + memory_tolerance):
+                regressions.append((size, name, f"메모리 {base['peak_mb']} MB → {current['peak_mb']} MB"))
+    return regressions
+
+
+def print_results(count, stages):
+    print(f"\n키 {count:,}개")
+    print(f"  {'단계':<16}{'시간':>10}{'CPU':>10}{'최대 메모리':>14}{'초당 행':>14}")
+    for name in STAGES:
+        r = stages[name]
+        rate = f"{r['rows_per_sec']:,}" if r['rows_per_sec'] else '-'
+        print(f"  {name:<16}{r['seconds']:>9.3f}s{r['cpu_seconds']:>9.3f}s"
+              f"{r['peak_mb']:>11.1f} MB{rate:>14}")
+    sequential = sum(stages[name]['seconds'] for name in SEQUENTIAL_LOAD_STAGES)
+    concurrent = stages['load_concurrent']['seconds']
+    if concurrent > 0:
+        print(f"  동시 로드: 순서대로 {sequential:.3f}s → 동시 {concurrent:.3f}s ({sequential / concurrent:.2f}배, "
+              f"CPU {os.cpu_count() or 1}개)")
+
+
+def main():
+    _, options = translation_sync.parse_cli_args(sys.argv[1:])
+    sizes = DEFAULT_SIZES
+    if options.get('sizes'):
+        sizes = tuple(int(size) for size in options['sizes'].split(','))
+    tolerance = float(options.get('tolerance', 0.5))
+    memory_tolerance = float(options.get('memory_tolerance', 0.2))
+
+    results = {}
+    for count in sizes:
+        results[str(count)] = measure_size(count)
+        print_results(count, results[str(count)])
+
+    if options.get('output'):
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n측정 결과를 저장했습니다: {options['output']}")
+
+    if options.get('save_baseline'):
+        baseline = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f"\n기준값을 저장했습니다: {BASELINE_PATH}")
+        return
+
+    if not os.path.exists(BASELINE_PATH):
+        print("\n기준값 파일이 없어 비교를 건너뜁니다. (--save-baseline 으로 생성)")
+        return
+    with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(results, baseline, tolerance, memory_tolerance)
+    if regressions:
+        print("\n기준값 대비 회귀:")
+        for size, name, detail in regressions:
+            print(f"  - 키 {int(size):,}개 {name}: {detail}")
+        sys.exit(1)
+    print("\n기준값 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
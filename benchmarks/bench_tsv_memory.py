@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+TSV 로더 메모리 벤치마크
+
+기존 방식(list(reader) 로 시트 전체를 올린 뒤 행마다 9개 키 딕셔너리 생성)과
+현재 load_tsv_file(행 스트리밍 + TranslationRow 레코드)의 소요 시간과 최대 메모리 사용량을 비교합니다.
+
+사용법: python -m benchmarks.bench_tsv_memory [행_수]   (기본 200000)
+"""
+
+import csv
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import translation_sync
+from benchmarks.synthetic import write_sheet
+
+
+def legacy_load_tsv_file(tsv_path):
+    """변경 전 load_tsv_file 구현 (비교용)"""
+    unescape = translation_sync.unescape_special_chars
+    translations = {}
+    with open(tsv_path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE, quotechar=None)
+        rows = list(reader)
+        data_start_row = 0
+        for i, row in enumerate(rows):
+            if len(row) > 0 and '원문 ID' in str(row[0]):
+                data_start_row = i + 1
+                break
+        for row in rows[data_start_row:]:
+            if len(row) >= 5 and row[0].strip():
+                item_id = translation_sync.parse_item_id(row[0])
+                if item_id:
+                    translations[item_id] = {
+                        '한글_원문': unescape(row[1]) if len(row) > 1 else '',
+                        '번역문_ID': row[2] if len(row) > 2 else '',
+                        '번역문': unescape(row[3]) if len(row) > 3 else '',
+                        '번역_입력문': unescape(row[4]) if len(row) > 4 else '',
+                        '카테고리': row[5] if len(row) > 5 else '',
+                        '번역_상태': row[6] if len(row) > 6 else '',
+                        '비고': row[7] if len(row) > 7 else '',
+                        '영문_원문': unescape(row[8]) if len(row) > 8 else '',
+                        '영문_아이템_ID': row[9] if len(row) > 9 else ''
+                    }
+    return translations, rows[:data_start_row]
+
+
+def measure(label, loader, tsv_path, repeat=3):
+    """로더의 소요 시간(repeat 번 중 최소)과 tracemalloc 최대 메모리 측정
+
+    tracemalloc 은 할당마다 기록 비용이 들어 작은 객체를 많이 만드는 쪽이 더 느려 보이므로
+    시간은 tracemalloc 을 끈 실행에서 따로 잽니다.
+    """
+    elapsed = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        loader(tsv_path)
+        duration = time.perf_counter() - start
+        elapsed = duration if elapsed is None else min(elapsed, duration)
+    gc.collect()
+    tracemalloc.start()
+    translations, _ = loader(tsv_path)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} 행 {len(translations):>8,}  시간 {elapsed:6.2f}s  "
+          f"유지 {current / 2**20:8.1f} MB  최대 {peak / 2**20:8.1f} MB")
+    del translations
+    return peak
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as tmp:
+        tsv_path = os.path.join(tmp, 'sheet.tsv')
+        write_sheet(tsv_path, rows)
+        print(f"합성 시트: {rows:,}행, {os.path.getsize(tsv_path) / 2**20:.1f} MB")
+        before = measure('변경 전', legacy_load_tsv_file, tsv_path)
+        after = measure('변경 후', translation_sync.load_tsv_file, tsv_path)
+        print(f"최대 메모리 {before / after:.1f}배 감소")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 합성 데이터 생성기 (항상 같은 시드로 같은 데이터를 만듦)
+"""
+
+import json
+import os
+import random
+
+SHEET_HEADER = ['원문 ID', '한글 원문', '번역문 ID', '번역문', '번역 입력문',
+                '카테고리', '번역 상태', '비고', '영문 원문', '영문 아이템 ID']
+
+
+def make_keys(count, seed=0):
+    """타르코프 스타일 키 생성 (<24자리 hex ID> Name/ShortName/Description)"""
+    rng = random.Random(seed)
+    suffixes = ('Name', 'ShortName', 'Description')
+    keys = []
+    for i in range(count):
+        keys.append(f"{rng.getrandbits(96):024x} {suffixes[i % 3]}")
+    return keys
+
+
+def write_sheet(path, rows, seed=0):
+    """번역 시트 형태의 TSV 파일 작성"""
+    rng = random.Random(seed)
+    keys = make_keys(rows, seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write('SPT 타르코프 한글화 프로젝트 - 메인 번역 작업\n')
+        f.write('\t'.join(SHEET_HEADER) + '\n')
+        for i, key in enumerate(keys):
+            ko = f'한글 원문 {i} \\"따옴표\\"\\n두 번째 줄' if i % 5 == 0 else f'한글 원문 {i}'
+            en = f'English source {i}\\nline {rng.randint(0, 999)}'
+            f.write('\t'.join([
+                f'"{key}":', ko, f'"{key}":',
+                '=IF(INDIRECT("RC[1]", FALSE)<>"", CHAR(34) & INDIRECT("RC[1]", FALSE) & CHAR(34) & ",", CHAR(34) & CHAR(34) & ",")',
+                ko + ' 번역', '아이템', '번역완료', '', en, key,
+            ]) + '\n')
+    return keys
+
+
+def make_locale_value(rng, i, language='ko'):
+    """로케일 값 하나 생성 (대부분 평문, 일부 여러 줄 설명/따옴표/백슬래시/탭)"""
+    kind = rng.random()
+    if language == 'ko':
+        if kind < 0.55:
+            return f'아이템 이름 {i}'
+        if kind < 0.85:
+            return f'첫 줄 설명 {i}\n두 번째 줄 "인용" 문장\n\n세 번째 줄 {rng.randint(0, 9999)}'
+        if kind < 0.95:
+            return f'"{i}번" 퀘스트 대사 - 상인이 말했다: "조심해"'
+        return f'경로 C:\\Game\\{i}\t탭과 \\n 리터럴'
+    if kind < 0.55:
+        return f'Item name {i}'
+    if kind < 0.85:
+        return f'First line of description {i}\nSecond line with a "quote"\n\nThird line {rng.randint(0, 9999)}'
+    if kind < 0.95:
+        return f'Quest "{i}" dialogue - the trader said: "be careful"'
+    return f'Path C:\\Game\\{i}\ttab and \\n literal'
+
+
+def _sheet_field(text):
+    """구글 스프레드시트 TSV 내보내기 형태로 필드 변환 (탭 → 공백, 개행/백슬래시/따옴표 이스케이프)"""
+    return (text.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\t', ' ').replace('\r', '\\r').replace('\n', '\\n'))
+
+
+def write_locale_triple(directory, count, seed=0, drift=0.02):
+    """kr.json / en.json / TSV 세 파일을 같은 시드로 항상 똑같이 생성
+
+    TSV 는 한 버전 이전의 시트처럼 만듭니다. 키의 drift 비율만큼은 새 kr.json 에만 있고(새 항목),
+    같은 수만큼은 TSV 에만 있으며(삭제 항목), 일부 키는 순서가 바뀌어 있습니다.
+    (kr.json 경로, en.json 경로, TSV 경로) 를 반환합니다.
+    """
+    rng = random.Random(seed)
+    keys = make_keys(count, seed)
+    kr = {key: make_locale_value(rng, i, 'ko') for i, key in enumerate(keys)}
+    en = {key: make_locale_value(rng, i, 'en') for i, key in enumerate(keys)}
+
+    changed = int(count * drift)
+    new_keys = set(rng.sample(keys, changed)) if changed else set()
+    removed_keys = make_keys(changed, seed + 1)
+    sheet_keys = [key for key in keys if key not in new_keys]
+    for _ in range(changed):
+        a, b = rng.randrange(len(sheet_keys)), rng.randrange(len(sheet_keys))
+        sheet_keys[a], sheet_keys[b] = sheet_keys[b], sheet_keys[a]
+    for key in removed_keys:
+        sheet_keys.insert(rng.randrange(len(sheet_keys) + 1), key)
+
+    kr_path = os.path.join(directory, 'kr.json')
+    en_path = os.path.join(directory, 'en.json')
+    tsv_path = os.path.join(directory, 'sheet.tsv')
+    with open(kr_path, 'w', encoding='utf-8') as f:
+        json.dump(kr, f, ensure_ascii=False, indent=2)
+    with open(en_path, 'w', encoding='utf-8') as f:
+        json.dump(en, f, ensure_ascii=False, indent=2)
+
+    formula = '=IF(INDIRECT("RC[1]", FALSE)<>"", CHAR(34) & INDIRECT("RC[1]", FALSE) & CHAR(34) & ",", CHAR(34) & CHAR(34) & ",")'
+    with open(tsv_path, 'w', encoding='utf-8', newline='') as f:
+        f.write('SPT 타르코프 한글화 프로젝트 - 메인 번역 작업\n')
+        f.write('\t'.join(SHEET_HEADER) + '\n')
+        for i, key in enumerate(sheet_keys):
+            ko = kr.get(key) or make_locale_value(rng, i, 'ko')
+            en_text = en.get(key) or make_locale_value(rng, i, 'en')
+            translated = rng.random() < 0.7
+            f.write('\t'.join([
+                f'"{key}":', _sheet_field(ko), f'"{key}":', formula,
+                _sheet_field(ko + ' 번역') if translated else _sheet_field(ko),
+                rng.choice(('아이템', '퀘스트', '대사', '')),
+                '번역완료' if translated else '미번역', '',
+                _sheet_field(en_text), key,
+            ]) + '\n')
+    return kr_path, en_path, tsv_path
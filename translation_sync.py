@@ -7,10 +7,19 @@
 
 import json
 import csv
+import hashlib
 import sys
 import os
 import re
+from array import array
 from datetime import datetime
+from json.decoder import scanstring
+
+
+# 스트리밍 JSON 로더가 한 번에 읽어들이는 문자 수
+JSON_STREAM_CHUNK_SIZE = 1 << 20
+
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
 
 
 def load_json_file(json_path):
@@ -23,31 +32,194 @@ def load_json_file(json_path):
         return None
 
 
+def iter_json_items(json_path, chunk_size=JSON_STREAM_CHUNK_SIZE):
+    """최상위 JSON 객체를 파일 순서대로 (키, 값) 쌍으로 하나씩 읽어들임
+
+    파일 전체를 한 번에 파싱하지 않고 chunk_size 단위로 읽으면서 항목을 내보내므로
+    수십 MB짜리 로케일 파일도 첫 항목을 바로 받을 수 있습니다.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(json_path, 'r', encoding='utf-8-sig') as f:
+        buf = ''
+        pos = 0
+        eof = False
+
+        def skip_ws(buf, pos):
+            return _JSON_WHITESPACE.match(buf, pos).end()
+
+        def fill(buf, pos):
+            # 이미 처리한 앞부분은 버리고 다음 청크를 덧붙임
+            chunk = f.read(chunk_size)
+            return buf[pos:] + chunk, 0, not chunk
+
+        # 여는 중괄호 찾기
+        while True:
+            pos = skip_ws(buf, pos)
+            if pos < len(buf) or eof:
+                break
+            buf, pos, eof = fill(buf, pos)
+        if pos >= len(buf) or buf[pos] != '{':
+            raise ValueError("최상위 JSON 객체가 아닙니다")
+        pos += 1
+
+        first = True
+        while True:
+            # 다음 토큰(키, 쉼표, 닫는 중괄호) 앞까지 공백 건너뛰기
+            pos = skip_ws(buf, pos)
+            while pos >= len(buf) and not eof:
+                buf, pos, eof = fill(buf, pos)
+                pos = skip_ws(buf, pos)
+            if pos >= len(buf):
+                raise ValueError("JSON 객체가 닫히지 않았습니다")
+
+            ch = buf[pos]
+            if ch == '}':
+                return
+            if not first:
+                if ch != ',':
+                    raise ValueError(f"JSON 구문 오류: 위치 {pos}에 ',' 필요")
+                pos += 1
+            first = False
+
+            # 키 + ':' + 값 을 한 번에 디코딩하되, 버퍼 경계에 걸리면 더 읽고 재시도
+            while True:
+                try:
+                    p = skip_ws(buf, pos)
+                    if p >= len(buf) or buf[p] != '"':
+                        raise json.JSONDecodeError("키 문자열 필요", buf, p)
+                    key, p = scanstring(buf, p + 1)
+                    p = skip_ws(buf, p)
+                    if p >= len(buf) or buf[p] != ':':
+                        raise json.JSONDecodeError("':' 필요", buf, p)
+                    p = skip_ws(buf, p + 1)
+                    value, p = decoder.raw_decode(buf, p)
+                    # 숫자처럼 경계에서 잘렸을 수 있는 값은 뒤따르는 구분자가 보일 때까지 확정하지 않음
+                    end = skip_ws(buf, p)
+                    if not eof and (end >= len(buf) or buf[end] not in ',}'):
+                        raise json.JSONDecodeError("버퍼 경계", buf, p)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    buf, pos, eof = fill(buf, pos)
+                    continue
+                break
+
+            pos = p
+            yield key, value
+
+
+class CompactJsonIndex:
+    """키 → 값 조회용 압축 인덱스 (en.json 처럼 조회만 하는 파일용)
+
+    값 문자열마다 파이썬 객체를 유지하는 대신 하나의 UTF-8 바이트 덩어리에 이어 붙이고
+    키별로 오프셋만 저장합니다. 값은 조회할 때만 문자열로 복원됩니다.
+    """
+
+    def __init__(self, items=()):
+        self._index = {}
+        self._offsets = array('Q', [0])
+        self._blob = bytearray()
+        self._others = {}  # 문자열이 아닌 값 (로케일 파일에서는 거의 없음)
+        for key, value in items:
+            self.add(key, value)
+
+    @classmethod
+    def from_file(cls, json_path):
+        return cls(iter_json_items(json_path))
+
+    def add(self, key, value):
+        if key in self._index:
+            # 중복 키는 json.load 와 동일하게 마지막 값을 사용
+            self._others[key] = value
+            return
+        self._index[key] = len(self._offsets) - 1
+        if isinstance(value, str):
+            self._blob += value.encode('utf-8')
+        else:
+            self._others[key] = value
+        self._offsets.append(len(self._blob))
+
+    def get(self, key, default=None):
+        i = self._index.get(key)
+        if i is None:
+            return default
+        if key in self._others:
+            return self._others[key]
+        return self._blob[self._offsets[i]:self._offsets[i + 1]].decode('utf-8')
+
+    def __getitem__(self, key):
+        if key not in self._index:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def keys(self):
+        return self._index.keys()
+
+    def items(self):
+        for key in self._index:
+            yield key, self.get(key)
+
+
+def load_json_index(json_path):
+    """JSON 파일을 스트리밍으로 읽어 압축 인덱스로 로드"""
+    try:
+        return CompactJsonIndex.from_file(json_path)
+    except Exception as e:
+        print(f"JSON 파일 로드 오류: {e}")
+        return None
+
+
+# 이스케이프 규칙 (원래 문자 → 이스케이프 표기)
+# 각 표기는 백슬래시로 시작하는 두 글자이고 서로 겹치지 않으므로, 한 번의 스캔으로 이스케이프한 결과를
+# 왼쪽부터 한 번의 스캔으로 복원하면 항상 원래 문자열이 됩니다. (unescape(escape(x)) == x)
+# 따라서 escape 결과로 나올 수 있는 정규 형태의 문자열 y 에 대해서도 escape(unescape(y)) == y 가 성립합니다.
+_ESCAPE_TABLE = {'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r'}
+_UNESCAPE_TABLE = {'\\': '\\', '"': '"', 'n': '\n', 'r': '\r', 't': '\t'}
+
+# 번역 입력문: JSON 이스케이프 + 탭은 공백으로 (TSV 구조 깨짐 방지)
+_TRANSLATION_INPUT_TABLE = dict(_ESCAPE_TABLE, **{'\t': ' '})
+# 일반 TSV 필드: 탭은 공백으로, 실제 개행문자는 \n 으로,
+# 불러올 때 이스케이프로 오인될 백슬래시만 \\ 로 (그 외 백슬래시는 보기 좋게 그대로 둠)
+
+_ESCAPE_RE = re.compile(r'[\\"\n\r]')
+_UNESCAPE_RE = re.compile(r'\\([\\"nrt])')
+_TRANSLATION_INPUT_RE = re.compile(r'[\\"\n\r\t]')
+# 뒤 글자와 합쳐 이스케이프로 읽힐 백슬래시 (split 으로 잘라 두 개로 이어 붙임 - 치환 콜백 없이 C 수준에서 처리)
+_TSV_BACKSLASH_RE = re.compile(r'\\(?=[\\"nrt\n\r])')
+# escape_special_chars 결과로만 나올 수 있는 정규 형태 (왕복 변환이 보장되는 입력)
+_CANONICAL_ESCAPED_RE = re.compile(r'(?:[^\\"\n\r]|\\[\\"nr])*')
+
+
+def _escape_match(match, _table=_ESCAPE_TABLE):
+    return _table[match.group()]
+
+
+def _unescape_match(match, _table=_UNESCAPE_TABLE):
+    return _table[match.group(1)]
+
+
+def _translation_input_match(match, _table=_TRANSLATION_INPUT_TABLE):
+    return _table[match.group()]
+
+
 def escape_special_chars(text):
-    """특수문자를 JSON에 안전하게 저장할 수 있도록 이스케이프 처리 (중복 방지)"""
+    """특수문자를 JSON에 안전하게 저장할 수 있도록 이스케이프 처리 (한 번의 스캔)"""
     if not isinstance(text, str):
         return text
     
-    # 이미 이스케이프된 문자들은 건드리지 않도록 순서 조정
-    # 백슬래시를 먼저 처리하되, 이미 이스케이프된 것은 제외
-    
-    # 1. 이미 이스케이프되지 않은 백슬래시만 처리
-    # \\n, \\r, \\t, \\", \\\\ 등을 제외한 단독 백슬래시만 이스케이프
-    text = re.sub(r'\\(?![\\nrt"])', r'\\\\', text)
-    
-    # 2. 이미 이스케이프되지 않은 따옴표만 처리
-    text = re.sub(r'(?<!\\)"', r'\\"', text)
-    
-    # 3. 이미 이스케이프되지 않은 개행문자만 처리
-    text = re.sub(r'(?<!\\)\n', r'\\n', text)
-    
-    # 4. 이미 이스케이프되지 않은 캐리지 리턴만 처리
-    text = re.sub(r'(?<!\\)\r', r'\\r', text)
-    
-    # 5. 이미 이스케이프되지 않은 탭만 처리 (번역 입력문에서는 공백으로 변환되므로 여기서는 제외)
-    # text = re.sub(r'(?<!\\)\t', r'\\t', text)
-    
-    return text
+    # 백슬래시, 따옴표, 개행, 캐리지 리턴을 한 번에 치환
+    # 탭은 번역 입력문에서 공백으로 변환되므로 여기서는 건드리지 않음
+    return _ESCAPE_RE.sub(_escape_match, text)
 
 
 def unescape_special_chars(text):
@@ -55,29 +227,59 @@ def unescape_special_chars(text):
     if not isinstance(text, str):
         return text
     
-    # 이스케이프된 문자들을 원래대로 복원
-    text = text.replace('\\"', '"')     # 따옴표
-    text = text.replace('\\n', '\n')    # 줄바꿈
-    text = text.replace('\\r', '\r')    # 캐리지 리턴
-    text = text.replace('\\t', '\t')    # 탭
-    text = text.replace('\\\\', '\\')  # 백슬래시 (마지막에 처리)
+    if '\\' not in text:
+        return text
+    
+    # 이스케이프된 백슬래시(\\\\)가 없으면 각 이스케이프가 서로 겹칠 수 없으므로
+    # C 수준의 str.replace 가 정규식 콜백보다 빠름
+    if '\\\\' not in text:
+        return text.replace('\\n', '\n').replace('\\"', '"').replace('\\r', '\r').replace('\\t', '\t')
     
+    # 왼쪽부터 두 글자 단위로 복원하므로 \\\\n 은 '\\' + 'n' 으로 올바르게 복원됨
+    # 알 수 없는 이스케이프(예: \x)는 그대로 둠
+    return _UNESCAPE_RE.sub(_unescape_match, text)
+
+
+def is_canonical_escaped(text):
+    """escape_special_chars 결과로 나올 수 있는 정규 형태인지 확인 (escape(unescape(x)) == x 보장)"""
+    return _CANONICAL_ESCAPED_RE.fullmatch(text) is not None
+
+
+def clean_plain_tsv_field(text):
+    """불러올 때 이스케이프를 복원하지 않는 칸(카테고리, 번역 상태, 비고, 영문 아이템 ID)용 필드 정리
+
+    백슬래시는 그대로 두고 탭은 공백으로, 실제 개행문자는 \\n 으로만 바꿉니다.
+    (이 칸들에 clean_tsv_field 를 쓰면 다시 불러온 뒤 동기화할 때마다 백슬래시가 두 배로 늘어남)
+    """
+    if not isinstance(text, str):
+        return str(text) if text is not None else ''
+    if '\t' in text or '\n' in text or '\r' in text:
+        return text.replace('\t', ' ').replace('\n', '\\n').replace('\r', '\\r')
     return text
 
 
 def clean_tsv_field(text):
-    """TSV 파일에 안전하게 저장할 수 있도록 필드 정리 (구글 스프레드시트 친화적)"""
+    """TSV 파일에 안전하게 저장할 수 있도록 필드 정리 (구글 스프레드시트 친화적)
+
+    불러올 때 unescape_special_chars 로 복원하는 칸(한글 원문, 번역문, 영문 원문)에만 사용합니다.
+    그 밖의 칸은 clean_plain_tsv_field 를 사용하세요.
+    """
     if not isinstance(text, str):
         return str(text) if text is not None else ''
     
-    # TSV에서 문제가 될 수 있는 문자들 처리
-    # 탭 문자는 공백으로 대체 (TSV 구조 깨짐 방지)
-    text = text.replace('\t', ' ')
-    
-    # 실제 개행문자는 \n으로 이스케이프 (TSV 구조 깨짐 방지)
-    text = text.replace('\n', '\\n')
-    text = text.replace('\r', '\\r')
+    # 다시 불러올 때 이스케이프로 읽힐 백슬래시(예: 원문의 \n 두 글자)는 \\ 로 보존
+    # 백슬래시가 이어져 있지 않으면 각 이스케이프가 서로 겹칠 수 없으므로 C 수준의 str.replace 로 처리
+    # (정규식 치환 콜백은 필드마다 파이썬 함수를 호출해 이전 구현보다 몇 배 느렸음)
+    if '\\' in text:
+        if '\\\\' in text:
+            text = '\\\\'.join(_TSV_BACKSLASH_RE.split(text))
+        else:
+            text = (text.replace('\\n', '\\\\n').replace('\\"', '\\\\"').replace('\\r', '\\\\r')
+                    .replace('\\t', '\\\\t').replace('\\\n', '\\\\\n').replace('\\\r', '\\\\\r'))
     
+    # 탭 문자는 공백으로 대체하고 실제 개행문자는 \n으로 이스케이프 (TSV 구조 깨짐 방지)
+    if '\t' in text or '\n' in text or '\r' in text:
+        return text.replace('\t', ' ').replace('\n', '\\n').replace('\r', '\\r')
     return text
 
 
@@ -86,13 +288,8 @@ def prepare_translation_input(text):
     if not isinstance(text, str):
         return str(text) if text is not None else ''
     
-    # 1. JSON 이스케이프 처리 (JSON 호환성을 위해 따옴표는 \\"로 유지)
-    text = escape_special_chars(text)
-    
-    # 2. TSV 안전 처리 (탭 문자만 공백으로 변환)
-    text = text.replace('\t', ' ')
-    
-    return text
+    # JSON 이스케이프(따옴표는 \\"로 유지)와 TSV 안전 처리(탭 → 공백)를 한 번의 스캔으로 처리
+    return _TRANSLATION_INPUT_RE.sub(_translation_input_match, text)
 
 
 def generate_translation_formula():
@@ -107,72 +304,484 @@ def should_use_formula(trans_data):
     return True
 
 
-def load_tsv_file(tsv_path):
-    """TSV 파일을 로드하고 번역 데이터를 딕셔너리로 변환"""
+# 번역문 컬럼 작성 방식 (--formula)
+#   indirect : 행마다 INDIRECT 자동입력 함수 (기존 방식, 시트를 편집할 때마다 전체 열을 다시 계산)
+#   array    : 헤더의 번역문 칸에 ARRAYFORMULA 하나만 두고 데이터 행의 번역문 칸은 비움
+#   static   : 자동입력 함수의 결과값을 미리 계산해 기록 (시트에서 번역 입력문을 고치면 다음 동기화 때 반영)
+FORMULA_MODES = ('indirect', 'array', 'static')
+DEFAULT_FORMULA_MODE = 'indirect'
+
+# 번역문 컬럼 (0부터 센 열 번호) 과 헤더 제목
+TRANSLATION_COLUMN = 3
+TRANSLATION_TITLE = '번역문'
+_ARRAY_FORMULA_TITLE_RE = re.compile(r'^=\{"((?:[^"]|"")*)";')
+
+
+def generate_array_formula(first_row, title=TRANSLATION_TITLE):
+    """헤더의 번역문 칸에 넣을 배열 수식 - 제목을 그대로 보여주고 first_row 행부터 끝까지 한 번에 계산"""
+    inputs = f'E{first_row}:E'
+    ids = f'A{first_row}:A'
+    title = title.replace('"', '""')
+    return (f'={{"{title}"; ARRAYFORMULA(IF({inputs}<>"", CHAR(34) & {inputs} & CHAR(34) & ",", '
+            f'IF({ids}<>"", CHAR(34) & CHAR(34) & ",", "")))}}')
+
+
+def static_translation_value(translation_input_cell):
+    """자동입력 함수가 계산할 값을 미리 계산 (번역 입력문 칸 값을 따옴표로 감싸고 쉼표 추가)"""
+    return f'"{translation_input_cell}",'
+
+
+def translation_field(translation_input_cell, formula_mode=DEFAULT_FORMULA_MODE):
+    """번역문 컬럼에 기록할 값"""
+    if formula_mode == 'array':
+        return ''
+    if formula_mode == 'static':
+        return static_translation_value(translation_input_cell)
+    return generate_translation_formula()
+
+
+def prepare_header_rows(header_rows, formula_mode=DEFAULT_FORMULA_MODE):
+    """번역문 작성 방식에 맞게 헤더 행 복사본 생성 (array 면 번역문 제목 칸에 배열 수식, 아니면 제목)
+
+    헤더 행을 찾지 못한 TSV 에서는 array 방식을 쓸 수 없으므로 (헤더 행, 실제 방식) 을 반환합니다.
+    """
+    if not header_rows or not is_tsv_header_row(header_rows[-1]):
+        if formula_mode == 'array':
+            print("'원문 ID' 헤더 행이 없어 배열 수식을 넣을 수 없습니다. 행마다 자동입력 함수를 사용합니다.")
+            formula_mode = 'indirect'
+        return header_rows, formula_mode
+    
+    header_rows = [list(row) for row in header_rows]
+    header = header_rows[-1]
+    if len(header) <= TRANSLATION_COLUMN:
+        header.extend([''] * (TRANSLATION_COLUMN + 1 - len(header)))
+    cell = header[TRANSLATION_COLUMN]
+    match = _ARRAY_FORMULA_TITLE_RE.match(cell)
+    title = match.group(1).replace('""', '"') if match else (cell or TRANSLATION_TITLE)
+    if formula_mode == 'array':
+        header[TRANSLATION_COLUMN] = generate_array_formula(len(header_rows) + 1, title)
+    else:
+        header[TRANSLATION_COLUMN] = title
+    return header_rows, formula_mode
+
+
+# TSV 데이터 컬럼 (원문 ID 다음 컬럼부터 순서대로)
+TSV_FIELDS = (
+    '한글_원문', '번역문_ID', '번역문', '번역_입력문', '카테고리',
+    '번역_상태', '비고', '영문_원문', '영문_아이템_ID',
+)
+
+class TranslationRow:
+    """TSV 한 행의 번역 데이터
+
+    행마다 9개 키의 딕셔너리를 만드는 대신 __slots__ 레코드로 보관해 메모리를 줄입니다.
+    기존 코드와의 호환을 위해 trans_data['번역문'], trans_data.get('비고', '') 형태의 접근도 지원합니다.
+    """
+    __slots__ = TSV_FIELDS
+
+    def __init__(self, 한글_원문='', 번역문_ID='', 번역문='', 번역_입력문='', 카테고리='',
+                 번역_상태='', 비고='', 영문_원문='', 영문_아이템_ID=''):
+        self.한글_원문 = 한글_원문
+        self.번역문_ID = 번역문_ID
+        self.번역문 = 번역문
+        self.번역_입력문 = 번역_입력문
+        self.카테고리 = 카테고리
+        self.번역_상태 = 번역_상태
+        self.비고 = 비고
+        self.영문_원문 = 영문_원문
+        self.영문_아이템_ID = 영문_아이템_ID
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __setitem__(self, name, value):
+        if name not in TSV_FIELDS:
+            raise KeyError(name)
+        setattr(self, name, value)
+
+    def __contains__(self, name):
+        return name in TSV_FIELDS
+
+    def __eq__(self, other):
+        if not isinstance(other, TranslationRow):
+            return NotImplemented
+        return self.values() == other.values()
+
+    def __repr__(self):
+        return f"TranslationRow{self.values()!r}"
+
+    def get(self, name, default=None):
+        return getattr(self, name, default) if name in TSV_FIELDS else default
+
+    def keys(self):
+        return TSV_FIELDS
+
+    def values(self):
+        return tuple(getattr(self, name) for name in TSV_FIELDS)
+
+    def items(self):
+        return zip(TSV_FIELDS, self.values())
+
+
+def parse_item_id(raw_id):
+    """TSV의 ID 형태: "MOD_HANDGUARD": -> MOD_HANDGUARD로 변환"""
+    raw_id = raw_id.strip()
+    # 앞뒤 따옴표 제거하고 끝의 콜론 제거
+    if raw_id.startswith('"') and raw_id.endswith('":'):
+        return raw_id[1:-2]  # 앞의 " 와 뒤의 ": 제거
+    elif raw_id.startswith('"') and raw_id.endswith('"'):
+        return raw_id[1:-1]  # 앞뒤 " 제거
+    elif raw_id.endswith(':'):
+        return raw_id[:-1]   # 뒤의 : 제거
+    return raw_id
+
+
+def parse_tsv_row(row):
+    """TSV 데이터 행 하나를 (아이템 ID, TranslationRow) 로 변환 (데이터 행이 아니면 None)"""
+    if len(row) < 5 or not row[0].strip():  # 빈 행 건너뛰기
+        return None
+    item_id = parse_item_id(row[0])
+    if not item_id:
+        return None
+    if len(row) < 10:
+        row = row + [''] * (10 - len(row))
+    unescape = unescape_special_chars
+    return item_id, TranslationRow(
+        unescape(row[1]), row[2], unescape(row[3]), unescape(row[4]), row[5],
+        row[6], row[7], unescape(row[8]), row[9]
+    )
+
+
+def is_tsv_header_row(row):
+    """원문 ID 헤더 행인지 확인"""
+    return len(row) > 0 and '원문 ID' in str(row[0])
+
+
+def detect_tsv_quoting(f, max_lines=1000):
+    """TSV 파일의 따옴표 규칙 판별 후 파일 위치를 처음으로 되돌림
+
+    create_updated_tsv 가 쓴 파일은 "키": 형태의 ID 칸이 csv 규칙에 따라 다시 따옴표로 감싸져
+    따옴표 세 개로 시작하고, 구글 스프레드시트에서 내보낸 TSV 는 "키": 그대로 저장됩니다.
+    """
+    quoting = csv.QUOTE_NONE
+    for i, line in enumerate(f):
+        if line.startswith('"'):
+            if line.startswith('"""'):
+                quoting = csv.QUOTE_MINIMAL
+            break
+        if i >= max_lines:
+            break
+    f.seek(0)
+    return quoting
+
+
+# 여러 TSV 로 나눠 쓴 시트의 샤드 목록 파일 확장자 (translation_sync_shard 참고)
+SHARD_MANIFEST_SUFFIX = '.shards'
+
+
+def is_shard_manifest(tsv_path):
+    """TSV 대신 샤드 목록 파일을 가리키는 경로인지"""
+    return tsv_path.endswith(SHARD_MANIFEST_SUFFIX)
+
+
+def iter_tsv_data_rows(tsv_path, header_rows=None):
+    """TSV 파일의 헤더 아래 행들을 칸 목록 그대로 순서대로 내보냄
+
+    '원문 ID' 헤더 행을 만나기 전까지의 행만 잠시 보관하며, 헤더를 찾으면 그 이후 행은
+    전체 시트를 메모리에 올리지 않고 바로 내보냅니다. header_rows 리스트를 넘기면
+    헤더 행들(헤더 포함 그 위의 행)이 채워집니다. 헤더가 없는 파일은 모든 행을 데이터로 취급합니다.
+    샤드 목록 파일이면 샤드들의 행을 목록 순서대로 이어서 내보냅니다.
+    """
+    if is_shard_manifest(tsv_path):
+        import translation_sync_shard as sync_shard
+        yield from sync_shard.iter_shard_data_rows(tsv_path, header_rows)
+        return
+    with open(tsv_path, 'r', encoding='utf-8') as f:
+        if detect_tsv_quoting(f) == csv.QUOTE_MINIMAL:
+            # 이 도구가 직접 쓴 파일 (csv 따옴표 규칙으로 감싼 필드)
+            reader = csv.reader(f, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
+        else:
+            # 구글 스프레드시트에서 내보낸 파일 (따옴표 규칙 없음)
+            reader = csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE, quotechar=None)
+        
+        # 헤더 찾기 (원문 ID가 있는 행)
+        pending = []
+        for row in reader:
+            pending.append(row)
+            if is_tsv_header_row(row):
+                if header_rows is not None:
+                    header_rows.extend(pending)
+                pending = None
+                break
+        
+        # 헤더가 없으면 지금까지 읽은 모든 행이 데이터
+        if pending is not None:
+            reader = pending
+        
+        yield from reader
+
+
+def iter_tsv_rows(tsv_path, header_rows=None):
+    """TSV 파일을 한 행씩 읽어 (아이템 ID, TranslationRow) 를 순서대로 내보냄 (빈 행은 건너뜀)"""
+    for row in iter_tsv_data_rows(tsv_path, header_rows):
+        parsed = parse_tsv_row(row)
+        if parsed is not None:
+            yield parsed
+
+
+# 진행 상황을 받을 함수 목록 - 단계마다 hook(단계 이름, 처리한 행 수, 전체 행 수 또는 None) 로 호출
+# 행 단위 단계에서는 PROGRESS_INTERVAL 행마다 호출하며, 호출은 동기화를 실행하는 스레드에서 일어납니다.
+progress_hooks = []
+PROGRESS_INTERVAL = 2000
+
+
+def report_progress(stage, done, total=None):
+    """등록된 진행 상황 함수 호출"""
+    for hook in progress_hooks:
+        hook(stage, done, total)
+
+
+def load_tsv_file(tsv_path, use_snapshot=True):
+    """TSV 파일을 로드하고 번역 데이터를 {아이템 ID: TranslationRow} 딕셔너리로 변환
+
+    마지막 동기화가 쓴 그대로인 TSV 는 다시 파싱하지 않고 파싱 결과 스냅샷을 읽습니다.
+    샤드 목록 파일이면 샤드들을 목록 순서대로 읽어 한 시트처럼 합칩니다.
+    """
     translations = {}
+    header_rows = []
+    
+    if is_shard_manifest(tsv_path):
+        import translation_sync_shard as sync_shard
+        try:
+            return sync_shard.load_shard_set(tsv_path)
+        except Exception as e:
+            print(f"TSV 샤드 로드 오류: {e}")
+            return {}, []
+    
+    if use_snapshot:
+        import translation_sync_snapshot as sync_snapshot
+        snapshot = sync_snapshot.load_snapshot(tsv_path)
+        if snapshot is not None:
+            report_progress('load_tsv', len(snapshot[0]), len(snapshot[0]))
+            return snapshot
     
     try:
-        with open(tsv_path, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE, quotechar=None)
-            rows = list(reader)
-            
-            # 헤더 찾기 (원문 ID가 있는 행)
-            data_start_row = 0
-            for i, row in enumerate(rows):
-                if len(row) > 0 and '원문 ID' in str(row[0]):
-                    data_start_row = i + 1
-                    break
-            
-            # 데이터 행들 처리
-            for row in rows[data_start_row:]:
-                if len(row) >= 5 and row[0].strip():  # 빈 행 건너뛰기
-                    # TSV의 ID 형태: "MOD_HANDGUARD": -> MOD_HANDGUARD로 변환
-                    raw_id = row[0].strip()
-                    # 앞뒤 따옴표 제거하고 끝의 콜론 제거
-                    if raw_id.startswith('"') and raw_id.endswith('":'):
-                        item_id = raw_id[1:-2]  # 앞의 " 와 뒤의 ": 제거
-                    elif raw_id.startswith('"') and raw_id.endswith('"'):
-                        item_id = raw_id[1:-1]  # 앞뒤 " 제거
-                    elif raw_id.endswith(':'):
-                        item_id = raw_id[:-1]   # 뒤의 : 제거
-                    else:
-                        item_id = raw_id
-                        
-                    if item_id:
-                        translations[item_id] = {
-                            '한글_원문': unescape_special_chars(row[1]) if len(row) > 1 else '',
-                            '번역문_ID': row[2] if len(row) > 2 else '',
-                            '번역문': unescape_special_chars(row[3]) if len(row) > 3 else '',
-                            '번역_입력문': unescape_special_chars(row[4]) if len(row) > 4 else '',
-                            '카테고리': row[5] if len(row) > 5 else '',
-                            '번역_상태': row[6] if len(row) > 6 else '',
-                            '비고': row[7] if len(row) > 7 else '',
-                            '영문_원문': unescape_special_chars(row[8]) if len(row) > 8 else '',
-                            '영문_아이템_ID': row[9] if len(row) > 9 else ''
-                        }
+        report_progress('load_tsv', 0)
+        for item_id, trans_data in iter_tsv_rows(tsv_path, header_rows):
+            translations[item_id] = trans_data
+            if progress_hooks and len(translations) % PROGRESS_INTERVAL == 0:
+                report_progress('load_tsv', len(translations))
+        report_progress('load_tsv', len(translations), len(translations))
         
-        return translations, rows[:data_start_row]  # 헤더도 함께 반환
+        return translations, header_rows  # 헤더도 함께 반환
         
     except Exception as e:
         print(f"TSV 파일 로드 오류: {e}")
         return {}, []
 
 
-def create_updated_tsv(json_data, en_json_data, existing_translations, header_rows, output_path):
-    """새로운 순서로 TSV 파일 생성"""
+def build_tsv_row(key, value, en_value, trans_data=None, suggestion=None, formula_mode=DEFAULT_FORMULA_MODE,
+                  category=None):
+    """TSV 에 기록할 한 행 생성 (trans_data 가 None 이면 새 항목)
+
+    새 항목에 번역 메모리 제안(suggestion)을 넘기면 번역 입력문을 제안된 번역으로 채우고 비고에 출처를 남깁니다.
+    새 항목에 카테고리 추정(category)을 넘기면 카테고리를 채우고 비고에 신뢰도를 남깁니다.
+    formula_mode 는 번역문 컬럼 작성 방식입니다 (FORMULA_MODES).
+    """
+    if trans_data is not None:
+        # 기존 번역이 있는 경우
+        translation_input = prepare_translation_input(trans_data['번역_입력문'])
+        # 번역문 처리: 함수 사용 여부 결정
+        if formula_mode != 'indirect' or should_use_formula(trans_data):
+            translation_value = translation_field(translation_input, formula_mode)
+        else:
+            translation_value = clean_tsv_field(trans_data['번역문'])
+        
+        return [
+            f'"{key}":',
+            clean_tsv_field(trans_data['한글_원문']),
+            f'"{key}":',
+            translation_value,
+            translation_input,
+            clean_plain_tsv_field(trans_data['카테고리']),
+            clean_plain_tsv_field(trans_data['번역_상태']),
+            clean_plain_tsv_field(trans_data['비고']),
+            clean_tsv_field(en_value),  # en.json 값을 영문 원문으로
+            clean_plain_tsv_field(key)  # 키를 영문 아이템 ID로
+        ]
     
-    # 백업 파일 생성
-    backup_path = output_path.replace('.tsv', f'_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.tsv')
-    if os.path.exists(output_path):
+    # 새로운 항목인 경우 - 자동입력 함수 사용
+    note = f'새로 추가됨 ({datetime.now().strftime("%Y-%m-%d")})'
+    translation_input = value
+    if suggestion is not None:
+        # 제안된 번역도 검토 전이므로 번역 상태는 미번역으로 둠
+        translation_input = suggestion.target
+        note += f' / {clean_plain_tsv_field(suggestion.note())}'
+    if category is not None:
+        note += f' / {clean_plain_tsv_field(category.note())}'
+    translation_input = prepare_translation_input(translation_input)  # 번역 입력문 (JSON 이스케이프 적용)
+    return [
+        f'"{key}":',
+        clean_tsv_field(value),  # JSON의 값을 한글 원문으로
+        f'"{key}":',
+        translation_field(translation_input, formula_mode),  # 자동입력 함수 (또는 배열 수식/계산된 값)
+        translation_input,
+        clean_plain_tsv_field(category.category) if category is not None else '',  # 카테고리
+        '미번역',  # 번역 상태
+        note,  # 비고에 날짜 포함
+        clean_tsv_field(en_value),  # en.json 값을 영문 원문으로
+        clean_plain_tsv_field(key)  # 키를 영문 아이템 ID로
+    ]
+
+
+# 번역을 마치지 않은 것으로 보는 번역 상태 (새 항목의 번역 입력문은 kr.json 값 그대로)
+UNTRANSLATED_STATUSES = ('', '미번역')
+# 키 이름만 바뀐 항목이 이전 번역을 이어받았거나 기존 항목의 원문이 바뀌었을 때의 번역 상태
+REVIEW_STATUS = '검토 필요'
+
+
+def source_text_digest(*texts):
+    """공백을 정리한 원문들의 해시 (키 변경 감지용)"""
+    h = hashlib.blake2b(digest_size=16)
+    for text in texts:
+        h.update(' '.join(str(text or '').split()).encode('utf-8'))
+        h.update(b'\0')
+    return h.digest()
+
+
+def find_renamed_keys(json_data, en_json_data, existing_translations):
+    """새 키 중 원문이 같은 삭제될 행이 있는 키 찾기 → {새 키: (이전 키, 일치 방식)}
+
+    삭제될 행을 (한글 원문, 영문 원문) 해시와 영문 원문 해시로 색인한 뒤 새 키마다 한 번씩 조회하는
+    해시 조인이므로 키 수에 비례하는 시간만 걸립니다. 번역을 마치지 않은 행은 이어받지 않습니다.
+    """
+    by_source = {}
+    by_en = {}
+    for key, trans_data in existing_translations.items():
+        if key in json_data or trans_data['번역_상태'].strip() in UNTRANSLATED_STATUSES:
+            continue
+        en_value = trans_data['영문_원문']
+        by_source.setdefault(source_text_digest(trans_data['한글_원문'], en_value), key)
+        if en_value.strip():
+            by_en.setdefault(source_text_digest(en_value), key)
+    
+    renamed = {}
+    if not by_source:
+        return renamed
+    for key, value in json_data.items():
+        if key in existing_translations:
+            continue
+        en_value = en_json_data.get(key, '') if en_json_data else ''
+        old_key = by_source.get(source_text_digest(value, en_value))
+        if old_key is not None:
+            renamed[key] = (old_key, '원문 일치')
+        elif en_value.strip():
+            old_key = by_en.get(source_text_digest(en_value))
+            if old_key is not None:
+                renamed[key] = (old_key, '영문 원문 일치')
+    return renamed
+
+
+def carry_over_rows(renamed, json_data, existing_translations):
+    """find_renamed_keys 결과로 새 키에 쓸 행 생성 (번역 상태는 검토 필요, 비고에 이전 키 표시)"""
+    today = datetime.now().strftime("%Y-%m-%d")
+    rows = {}
+    for key, (old_key, reason) in renamed.items():
+        old = existing_translations[old_key]
+        rows[key] = TranslationRow(
+            json_data[key], f'"{key}":', old['번역문'], old['번역_입력문'], old['카테고리'],
+            REVIEW_STATUS, f'키 변경: {old_key} 의 번역 이어받음 ({reason}, {today})',
+            old['영문_원문'], key
+        )
+    return rows
+
+
+def iter_updated_rows(json_items, en_json_data, existing_translations, new_entries, updated_entries,
+                      suggest=None, carried=None, review=None, formula_mode=DEFAULT_FORMULA_MODE, classify=None,
+                      reused=None):
+    """(키, kr 값) 순서대로 기록할 TSV 행을 만들어 (키, kr 값, 행) 을 내보냄
+
+    기존 번역이 있는 키는 updated_entries 에, 없는 키는 new_entries 에 차례로 추가합니다.
+    reused 에 있는 키는 행을 만들지 않고 그 줄(문자열)을 그대로 내보냅니다.
+    (suggest, carried, review, formula_mode, classify, reused 는 create_updated_tsv 참고)
+    """
+    for key, value in json_items:
+        line = reused.get(key) if reused else None
+        if line is not None:
+            updated_entries.append(key)
+            yield key, value, line
+            continue
+        # en.json에서 동일한 키로 영문 데이터 찾기
+        en_value = en_json_data.get(key, '') if en_json_data else ''
+        
+        trans_data = existing_translations.get(key)
+        reviewed = review(key, value, en_value, trans_data) if review is not None else None
+        if trans_data is not None:
+            updated_entries.append(key)
+            trans_data = reviewed or trans_data
+        else:
+            new_entries.append(key)
+            trans_data = carried.get(key) if carried else None
+        suggestion = None
+        category = None
+        if trans_data is None:
+            if suggest is not None:
+                suggestion = suggest(key, value, en_value)
+            if classify is not None:
+                category = classify(key)
+        yield key, value, build_tsv_row(key, value, en_value, trans_data, suggestion, formula_mode, category)
+
+
+def backup_existing_tsv(output_path, backup_keep=None):
+    """TSV 를 다시 쓰기 전에 기존 파일 백업 (create_updated_tsv 참고)"""
+    if not os.path.exists(output_path):
+        return
+    if backup_keep == 0:
+        backup_path = output_path.replace('.tsv', f'_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.tsv')
         os.rename(output_path, backup_path)
         print(f"기존 파일을 백업했습니다: {backup_path}")
+    else:
+        import translation_sync_backup as sync_backup
+        store_root, timestamp = sync_backup.backup_before_write(
+            output_path, backup_keep or sync_backup.DEFAULT_KEEP)
+        print(f"기존 파일을 백업 저장소에 보관했습니다: {store_root} ({timestamp})")
+
+
+def create_updated_tsv(json_data, en_json_data, existing_translations, header_rows, output_path,
+                       row_callback=None, backup_keep=None, suggest=None, carried=None, review=None,
+                       formula_mode=DEFAULT_FORMULA_MODE, write_snapshot=False, classify=None, reused=None):
+    """새로운 순서로 TSV 파일 생성
+
+    json_data 는 딕셔너리 또는 iter_json_items() 처럼 (키, 값) 쌍을 순서대로 내보내는
+    이터러블 모두 가능합니다. row_callback 을 넘기면 행을 쓸 때마다
+    row_callback(키, kr 값, 다시 불러왔을 때의 TranslationRow) 로 호출됩니다.
+    기존 파일은 백업 저장소에 최근 backup_keep 개(기본 30개)까지 보관하며,
+    backup_keep=0 이면 예전처럼 *_backup_날짜.tsv 로 이름을 바꿔 통째로 보관합니다.
+    carried 에 {새 키: TranslationRow} 를 넘기면 해당 새 항목은 그 행의 번역을 이어받고(carry_over_rows),
+    나머지 새 항목은 suggest 를 넘긴 경우 suggest(키, kr 값, en 값) 로 번역 메모리 제안을 받아 채웁니다.
+    review 를 넘기면 모든 키에 대해 review(키, kr 값, en 값, 기존 행 또는 None) 를 호출하고,
+    TranslationRow 를 돌려받은 기존 항목은 그 행으로 기록합니다 (원문 변경 표시).
+    formula_mode 는 번역문 컬럼 작성 방식이며, array 면 헤더의 번역문 칸에 배열 수식을 넣습니다.
+    write_snapshot 이면 다음 로드 때 다시 파싱하지 않도록 기록한 행의 파싱 결과 스냅샷을 함께 저장합니다
+    (모든 행의 값을 메모리에 모아 두므로 기본은 끔).
+    classify 를 넘기면 새 항목마다 classify(키) 로 카테고리 추정(또는 None)을 받아 카테고리를 채웁니다.
+    reused 에 {키: 지난번에 쓴 TSV 줄} 을 넘기면 그 키는 행을 다시 만들지 않고 줄을 그대로 복사하며
+    (--incremental), row_callback 에는 TranslationRow 대신 None 을 넘깁니다 (스냅샷은 만들지 않음).
+    임시 파일에 다 쓴 뒤에 기존 파일을 백업하고 교체하므로, 쓰는 중 오류가 나면 기존 파일은 그대로 남습니다.
+    json_data 가 이터러블(스트리밍)이면 읽기 오류를 출력만 하지 않고 그대로 다시 발생시킵니다.
+    """
     
+    tmp_path = output_path + '.tmp'
     new_entries = []
     updated_entries = []
     deleted_entries = []
     
     try:
-        with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        header_rows, formula_mode = prepare_header_rows(header_rows, formula_mode)
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
             writer = csv.writer(f, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
             
             # 헤더 행들 작성
@@ -180,64 +789,61 @@ def create_updated_tsv(json_data, en_json_data, existing_translations, header_ro
                 writer.writerow(header_row)
             
             # JSON의 키 순서대로 데이터 작성
-            for key, value in json_data.items():
-                # en.json에서 동일한 키로 영문 데이터 찾기
-                en_value = en_json_data.get(key, '') if en_json_data else ''
-                
-                if key in existing_translations:
-                    # 기존 번역이 있는 경우
-                    trans_data = existing_translations[key]
-                    
-                    # 번역문 처리: 함수 사용 여부 결정
-                    if should_use_formula(trans_data):
-                        translation_field = generate_translation_formula()
-                    else:
-                        translation_field = clean_tsv_field(trans_data['번역문'])
-                    
-                    row = [
-                        f'"{key}":',
-                        clean_tsv_field(trans_data['한글_원문']),
-                        f'"{key}":',
-                        translation_field,
-                        prepare_translation_input(trans_data['번역_입력문']),
-                        clean_tsv_field(trans_data['카테고리']),
-                        clean_tsv_field(trans_data['번역_상태']),
-                        clean_tsv_field(trans_data['비고']),
-                        clean_tsv_field(en_value),  # en.json 값을 영문 원문으로
-                        clean_tsv_field(key)        # 키를 영문 아이템 ID로
-                    ]
-                    updated_entries.append(key)
+            json_items = json_data.items() if isinstance(json_data, dict) else json_data
+            seen_keys = set()
+            total = len(json_data) if hasattr(json_data, '__len__') else None
+            snapshot = None
+            if write_snapshot and not reused:
+                import translation_sync_snapshot as sync_snapshot
+                snapshot = sync_snapshot.SnapshotWriter()
+            report_progress('write_tsv', 0, total)
+            rows = iter_updated_rows(json_items, en_json_data, existing_translations, new_entries, updated_entries,
+                                     suggest, carried, review, formula_mode, classify, reused)
+            for key, value, row in rows:
+                seen_keys.add(key)
+                if isinstance(row, str):
+                    f.write(row)  # 지난번에 쓴 줄 그대로
+                    if row_callback is not None:
+                        row_callback(key, value, None)
                 else:
-                    # 새로운 항목인 경우 - 자동입력 함수 사용
-                    clean_value = clean_tsv_field(value)
-                    row = [
-                        f'"{key}":',
-                        clean_value,  # JSON의 값을 한글 원문으로
-                        f'"{key}":',
-                        generate_translation_formula(),  # 자동입력 함수
-                        prepare_translation_input(value),  # 번역 입력문 (JSON 이스케이프 적용)
-                        '',  # 카테고리
-                        '미번역',  # 번역 상태
-                        f'새로 추가됨 ({datetime.now().strftime("%Y-%m-%d")})',  # 비고에 날짜 포함
-                        clean_tsv_field(en_value),  # en.json 값을 영문 원문으로
-                        clean_tsv_field(key)        # 키를 영문 아이템 ID로
-                    ]
-                    new_entries.append(key)
-                
-                writer.writerow(row)
+                    writer.writerow(row)
+                    if row_callback is not None:
+                        row_callback(key, value, parse_tsv_row(row)[1])
+                    if snapshot is not None:
+                        snapshot.add_row(row)
+                if progress_hooks and len(seen_keys) % PROGRESS_INTERVAL == 0:
+                    report_progress('write_tsv', len(seen_keys), total)
+            report_progress('write_tsv', len(seen_keys), len(seen_keys))
+        
+        # 백업 생성 후 교체
+        backup_existing_tsv(output_path, backup_keep)
+        os.replace(tmp_path, output_path)
+        
+        if snapshot is not None:
+            try:
+                snapshot.save(output_path, header_rows)
+            except Exception as e:
+                print(f"TSV 스냅샷 저장 오류 (다음 실행 때 TSV 를 다시 파싱합니다): {e}")
         
         # 삭제된 항목들 찾기
-        deleted_entries = list(set(existing_translations.keys()) - set(json_data.keys()))
+        deleted_entries = list(set(existing_translations.keys()) - seen_keys)
         
         return new_entries, updated_entries, deleted_entries
         
     except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
         print(f"TSV 파일 생성 오류: {e}")
+        if not isinstance(json_data, dict):
+            raise
         return [], [], []
 
 
-def save_deleted_items_to_file(deleted_entries, existing_translations, output_path):
-    """삭제된 항목들을 텍스트 파일로 저장"""
+def save_deleted_items_to_file(deleted_entries, existing_translations, output_path, report=True):
+    """삭제된 항목들을 텍스트 파일로 저장 (저장했으면 True)
+
+    report=False 면 저장 완료 메시지를 출력하지 않습니다 (임시 파일에 쓰고 다른 곳에 보관하는 경우).
+    """
     try:
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(f"삭제된 번역 항목들 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
@@ -256,66 +862,17 @@ def save_deleted_items_to_file(deleted_entries, existing_translations, output_pa
                 f.write(f"   영문 원문: {trans_data.get('영문_원문', '')}\n")
                 f.write("-" * 40 + "\n\n")
         
-        print(f"삭제된 항목들이 성공적으로 저장되었습니다: {output_path}")
+        if report:
+            print(f"삭제된 항목들이 성공적으로 저장되었습니다: {output_path}")
+        return True
         
     except Exception as e:
         print(f"삭제된 항목 파일 저장 오류: {e}")
+        return False
 
 
-def main():
-    # Windows 콘솔 인코딩 설정
-    if sys.platform == 'win32':
-        import locale
-        try:
-            # Windows에서 UTF-8 출력을 위한 설정
-            sys.stdout.reconfigure(encoding='utf-8')
-            sys.stderr.reconfigure(encoding='utf-8')
-        except:
-            pass
-    
-    if len(sys.argv) != 4:
-        print("사용법: python translation_sync.py <새로운_kr.json_경로> <새로운_en.json_경로> <기존_TSV_파일_경로>")
-        print("예시: python translation_sync.py kr.json en.json \"SPT 타르코프 한글화 프로젝트 - 메인 번역 작업.tsv\"")
-        sys.exit(1)
-    
-    json_path = sys.argv[1]
-    en_json_path = sys.argv[2]
-    tsv_path = sys.argv[3]
-    
-    # 파일 존재 확인
-    if not os.path.exists(json_path):
-        print(f"kr.json 파일을 찾을 수 없습니다: {json_path}")
-        sys.exit(1)
-    
-    if not os.path.exists(en_json_path):
-        print(f"en.json 파일을 찾을 수 없습니다: {en_json_path}")
-        sys.exit(1)
-    
-    if not os.path.exists(tsv_path):
-        print(f"TSV 파일을 찾을 수 없습니다: {tsv_path}")
-        sys.exit(1)
-    
-    print("번역 동기화를 시작합니다...")
-    
-    # 파일 로드
-    print("1. kr.json 파일 로드 중...")
-    json_data = load_json_file(json_path)
-    if json_data is None:
-        sys.exit(1)
-    
-    print("2. en.json 파일 로드 중...")
-    en_json_data = load_json_file(en_json_path)
-    if en_json_data is None:
-        sys.exit(1)
-    
-    print("3. TSV 파일 로드 중...")
-    existing_translations, header_rows = load_tsv_file(tsv_path)
-    
-    print(f"   - 기존 번역 항목 수: {len(existing_translations)}")
-    print(f"   - 새 kr.json 항목 수: {len(json_data)}")
-    print(f"   - 새 en.json 항목 수: {len(en_json_data)}")
-    
-    # ID 매칭 확인을 위한 디버깅 (처음 5개만 출력)
+def print_key_match_report(json_data, en_json_data, existing_translations):
+    """ID 매칭 확인을 위한 디버깅 정보 출력 (처음 5개만 출력)"""
     print("\n[ ID 매칭 확인 ]")
     json_keys = list(json_data.keys())[:5]
     en_json_keys = list(en_json_data.keys())[:5]
@@ -338,16 +895,522 @@ def main():
     en_matches = set(json_data.keys()) & set(en_json_data.keys())
     print(f"kr.json-TSV 매칭되는 키 수: {len(matches)}")
     print(f"kr.json-en.json 매칭되는 키 수: {len(en_matches)}")
+
+
+def parse_cli_args(argv):
+    """명령행 인자를 위치 인자 목록과 --옵션 딕셔너리로 분리 (--name 은 True, --name=value 는 문자열)"""
+    args = []
+    options = {}
+    for arg in argv:
+        if arg.startswith('--') and len(arg) > 2:
+            name, sep, value = arg[2:].partition('=')
+            options[name.replace('-', '_')] = value if sep else True
+        else:
+            args.append(arg)
+    return args, options
+
+
+# 단계별 성능 측정 결과를 받을 함수 목록 (--profile 사용 시 단계가 끝날 때마다 hook(측정값 딕셔너리) 호출)
+# GUI 처럼 main() 을 직접 부르는 쪽에서 함수를 추가해 측정값을 화면에 표시할 수 있습니다.
+profile_hooks = []
+
+
+class SyncError(Exception):
+    """동기화를 진행할 수 없을 때 (입력 파일 없음, 읽기 실패, 잘못된 옵션)"""
+
+
+class SyncResult:
+    """sync() 결과 - 항목 수와 키 목록, 만들어진 파일 경로"""
+
+    def __init__(self, tsv_path):
+        self.tsv_path = tsv_path
+        self.new_entries = []       # 새로 추가된 키
+        self.updated_entries = []   # 기존 번역을 유지한 키
+        self.deleted_entries = []   # 새 kr.json 에서 사라진 키
+        self.suggested_entries = [] # 새 항목 중 번역 메모리 제안으로 번역 입력문을 채운 키
+        self.renamed_entries = {}   # 이전 키의 번역을 이어받은 새 키 {새 키: 이전 키}
+        self.drifted_entries = []   # 원문(kr/en)이 바뀌어 검토 필요로 표시한 기존 키
+        self.validation_issues = [] # 자리표시자/태그 검증 문제 [(키, 종류, 설명)]
+        self.validation_report = None  # 검증 보고서 파일
+        self.category_report = None # 새 항목 카테고리 자동 지정 통계 (CategoryClassifier.coverage_report)
+        self.push_report = None     # 시트 전송 결과 (translation_sync_push.push_tsv)
+        self.skipped = False        # 증분 모드에서 바뀐 것이 없어 TSV 를 다시 쓰지 않은 경우
+        self.delta_path = None      # 변경분 모드에서 만든 파일
+        self.manifest_path = None   # 증분 모드 매니페스트
+        self.deleted_backup = None  # 삭제 항목 보고서의 백업 시각
+        self.deleted_file = None    # 삭제 항목 보고서 파일 (--keep-backups=0)
+        self.metrics = None         # --profile 측정 결과
+
+    @property
+    def total(self):
+        return len(self.new_entries) + len(self.updated_entries)
+
+    def counts(self):
+        return {
+            'total': self.total,
+            'new': len(self.new_entries),
+            'updated': len(self.updated_entries),
+            'deleted': len(self.deleted_entries),
+        }
+
+    def __repr__(self):
+        return f"SyncResult({self.tsv_path!r}, skipped={self.skipped}, {self.counts()})"
+
+
+class ParsedInputCache:
+    """파싱한 입력 파일 캐시
+
+    (종류, 절대 경로) 별로 파싱 결과를 보관하고, 파일의 수정 시각과 크기가 그대로면 다시 읽지 않습니다.
+    GUI 나 감시 모드처럼 한 프로세스에서 여러 번 동기화할 때 sync(cache=...) 로 넘겨 사용합니다.
+    캐시된 값은 호출하는 쪽과 공유되므로 수정하지 마세요.
+    """
+
+    # 동기화가 쓴 TSV 의 행을 모아 put('tsv', ...) 로 넘길지 (다시 읽지 않을 캐시면 False)
+    keeps_written_tsv = True
+
+    def __init__(self):
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def signature(path):
+        if is_shard_manifest(path):
+            import translation_sync_shard as sync_shard
+            return sync_shard.shard_set_signature(path)
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def get(self, kind, path, loader):
+        key = (kind, os.path.abspath(path))
+        signature = self.signature(path)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = loader(path)
+        if value is not None:
+            self._entries[key] = (signature, value)
+        return value
+
+    def put(self, kind, path, value):
+        """방금 쓴 파일의 파싱 결과를 현재 파일 정보로 저장"""
+        self._entries[(kind, os.path.abspath(path))] = (self.signature(path), value)
+
+    def clear(self):
+        self._entries.clear()
+
+
+def load_cached(cache, kind, path, loader):
+    """캐시가 있으면 캐시를 거쳐, 없으면 바로 로드"""
+    if cache is None:
+        return loader(path)
+    return cache.get(kind, path, loader)
+
+
+def sync(json_path, en_json_path, tsv_path, options=None, progress=None, cache=None):
+    """kr.json 순서에 맞게 TSV 동기화 후 SyncResult 반환
+
+    options 는 명령행 옵션과 같은 이름의 딕셔너리입니다.
+    (streaming, incremental, delta, profile, cprofile, keep_backups, memory, memory_min_score, no_carry_over,
+     no_drift_check, formula, concurrent_load, sequential_load, no_validate, shard, no_categorize,
+     category_min_confidence, snapshot, push, spreadsheet, sheet_tab, push_endpoint, push_token_file, push_workers)
+    progress 를 넘기면 progress(단계 이름, 처리한 행 수, 전체 행 수 또는 None) 로 진행 상황을 받습니다.
+    cache 에 ParsedInputCache 를 넘기면 바뀌지 않은 입력 파일은 다시 파싱하지 않습니다.
+    진행할 수 없으면 SyncError 를 발생시킵니다.
+    """
+    if progress is not None:
+        progress_hooks.append(progress)
+    try:
+        return _sync(json_path, en_json_path, tsv_path, options, cache)
+    finally:
+        if progress is not None and progress in progress_hooks:
+            progress_hooks.remove(progress)
+
+
+def _sync(json_path, en_json_path, tsv_path, options, cache):
+    options = options or {}
+    streaming = bool(options.get('streaming'))
+    incremental = bool(options.get('incremental'))
+    delta_format = options.get('delta')
+    if delta_format is True:
+        delta_format = 'jsonl'
+    if delta_format and delta_format not in ('jsonl', 'tsv'):
+        raise SyncError(f"알 수 없는 변경분 형식입니다: {delta_format} (jsonl 또는 tsv)")
+    formula_mode = options.get('formula', DEFAULT_FORMULA_MODE)
+    if formula_mode not in FORMULA_MODES:
+        raise SyncError(f"알 수 없는 번역문 작성 방식입니다: {formula_mode} ({' / '.join(FORMULA_MODES)})")
+    backup_keep = options.get('keep_backups')
+    backup_keep = int(backup_keep) if backup_keep not in (None, True) else None
+    if incremental and streaming:
+        print("--incremental 은 전체 키를 비교해야 하므로 --streaming 없이 진행합니다.")
+        streaming = False
     
-    # TSV 업데이트
-    print("4. TSV 파일 업데이트 중...")
-    new_entries, updated_entries, deleted_entries = create_updated_tsv(
-        json_data, en_json_data, existing_translations, header_rows, tsv_path
-    )
+    # 샤드 출력: --shard 를 주거나 입력이 샤드 목록 파일이면 여러 TSV 로 나눠 씀 (방식은 목록 파일에 적힌 것)
+    shard_spec = None
+    reshard = False
+    if options.get('shard') or (is_shard_manifest(tsv_path) and os.path.exists(tsv_path)):
+        import translation_sync_shard as sync_shard
+        try:
+            shard_spec = sync_shard.resolve_shard_spec(options.get('shard'), tsv_path)
+        except ValueError as e:
+            raise SyncError(str(e))
+        # 나누는 방식이 바뀌면 입력이 그대로여도 다시 써야 함
+        reshard = not is_shard_manifest(tsv_path) or shard_spec != sync_shard.resolve_shard_spec(None, tsv_path)
+        if delta_format:
+            raise SyncError("--delta 는 샤드 출력과 함께 쓸 수 없습니다 (변경분은 TSV 하나를 기준으로 만듦)")
+        if streaming:
+            print("샤드 출력은 행을 샤드별로 모아 쓰므로 --streaming 없이 진행합니다.")
+            streaming = False
+    
+    # 시트 전송: 설정 오류는 오래 걸리는 동기화를 시작하기 전에 알림
+    push_config = None
+    if options.get('push'):
+        import translation_sync_push as sync_push
+        if delta_format:
+            raise SyncError("--push 는 --delta 와 함께 쓸 수 없습니다 (변경분 모드는 TSV 를 다시 쓰지 않음)")
+        try:
+            push_config = sync_push.PushConfig.from_options(options)
+        except (OSError, ValueError) as e:
+            raise SyncError(f"시트 전송 설정 오류: {e}")
+    
+    # 파일 존재 확인
+    if not os.path.exists(json_path):
+        raise SyncError(f"kr.json 파일을 찾을 수 없습니다: {json_path}")
+    
+    if not os.path.exists(en_json_path):
+        raise SyncError(f"en.json 파일을 찾을 수 없습니다: {en_json_path}")
+    
+    if not os.path.exists(tsv_path):
+        raise SyncError(f"TSV 파일을 찾을 수 없습니다: {tsv_path}")
+    
+    result = SyncResult(tsv_path)
+    
+    # 증분 모드: 세 입력 파일이 마지막 동기화 이후 그대로면 파일을 읽지 않고 종료
+    if incremental:
+        import translation_sync_manifest as sync_manifest
+        manifest_path = sync_manifest.manifest_path_for(tsv_path)
+        manifest_header = sync_manifest.load_manifest_header(manifest_path)
+        if not reshard and sync_manifest.inputs_unchanged(manifest_header, json_path, en_json_path, tsv_path,
+                                                          formula_mode):
+            print("입력 파일이 마지막 동기화 이후 바뀌지 않았습니다. 동기화를 건너뜁니다.")
+            print(f"매니페스트: {manifest_path} ({manifest_header['created']})")
+            result.skipped = True
+            result.manifest_path = manifest_path
+            return result
+    
+    # 성능 측정 (--profile 이 없으면 측정하지 않음)
+    import translation_sync_profile as sync_profile
+    profile_option = options.get('profile') or options.get('cprofile')
+    metrics_path = None
+    cprofile_path = None
+    if profile_option:
+        metrics_path = options['profile'] if isinstance(options.get('profile'), str) \
+            else sync_profile.metrics_path_for(tsv_path)
+        if options.get('cprofile'):
+            cprofile_path = options['cprofile'] if isinstance(options['cprofile'], str) \
+                else sync_profile.metrics_path_for(tsv_path, 'prof')
+    profiler = sync_profile.StageProfiler(bool(profile_option), profile_hooks, cprofile_path)
+    
+    print("번역 동기화를 시작합니다...")
+    
+    # 파일 로드 (--concurrent-load 면 세 파일을 동시에 읽음)
+    # 로컬 디스크에서 빨라진다는 측정이 아직 없어 기본은 차례로 읽음 (CPU 1개에서는 오히려 느림)
+    concurrent_load = bool(options.get('concurrent_load')) and not streaming and not options.get('sequential_load')
+    if streaming:
+        # 스트리밍 모드: kr.json 은 TSV 를 쓰면서 순서대로 읽고, en.json 은 압축 인덱스로 보관
+        print("1. kr.json 스트리밍 준비 (쓰기 단계에서 순서대로 읽음)")
+        json_data = iter_json_items(json_path)
+        
+        print("2. en.json 파일 인덱싱 중...")
+        report_progress('load_en', 0)
+        with profiler.stage('load_en') as stage:
+            en_json_data = load_cached(cache, 'en_index', en_json_path, load_json_index)
+            if en_json_data is None:
+                raise SyncError(f"en.json 파일을 읽을 수 없습니다: {en_json_path}")
+            stage.rows = len(en_json_data)
+        report_progress('load_en', len(en_json_data), len(en_json_data))
+    elif not concurrent_load:
+        print("1. kr.json 파일 로드 중...")
+        report_progress('load_kr', 0)
+        with profiler.stage('load_kr') as stage:
+            json_data = load_cached(cache, 'kr', json_path, load_json_file)
+            if json_data is None:
+                raise SyncError(f"kr.json 파일을 읽을 수 없습니다: {json_path}")
+            stage.rows = len(json_data)
+        report_progress('load_kr', len(json_data), len(json_data))
+    
+        print("2. en.json 파일 로드 중...")
+        report_progress('load_en', 0)
+        with profiler.stage('load_en') as stage:
+            en_json_data = load_cached(cache, 'en', en_json_path, load_json_file)
+            if en_json_data is None:
+                raise SyncError(f"en.json 파일을 읽을 수 없습니다: {en_json_path}")
+            stage.rows = len(en_json_data)
+        report_progress('load_en', len(en_json_data), len(en_json_data))
+    else:
+        # 스레드로 파일 읽기를 겹치고, CPU 가 여럿이면 JSON 디코딩은 프로세스 풀에서
+        import translation_sync_loader as sync_loader
+        print("1~3. kr.json, en.json, TSV 파일 동시 로드 중...")
+        with profiler.stage('load_inputs') as stage:
+            json_data, en_json_data, (existing_translations, header_rows) = sync_loader.load_inputs(
+                json_path, en_json_path, tsv_path, cache
+            )
+            if json_data is None:
+                raise SyncError(f"kr.json 파일을 읽을 수 없습니다: {json_path}")
+            if en_json_data is None:
+                raise SyncError(f"en.json 파일을 읽을 수 없습니다: {en_json_path}")
+            stage.rows = len(json_data) + len(en_json_data) + len(existing_translations)
+        report_progress('load_kr', len(json_data), len(json_data))
+        report_progress('load_en', len(en_json_data), len(en_json_data))
+    
+    # 증분 모드: TSV 가 마지막 동기화가 쓴 그대로면 줄 단위로만 읽고, 값이 바뀐 키와 제거된 키의 행만 파싱
+    # (나머지 키는 지난번 줄을 그대로 복사 - 번역 메모리/스냅샷/캐시처럼 모든 행이 필요한 옵션이면 전체를 읽음)
+    manifest = None
+    diff = None
+    previous_sheet = None
+    reused = None
+    if (incremental and not concurrent_load and shard_spec is None and not delta_format
+            and not options.get('memory') and not options.get('snapshot')
+            and (cache is None or not cache.keeps_written_tsv)
+            and sync_manifest.tsv_unchanged(manifest_header, tsv_path)
+            and manifest_header.get('formula', DEFAULT_FORMULA_MODE) == formula_mode):
+        manifest = sync_manifest.load_manifest(manifest_path)
+        if manifest is not None:
+            previous_sheet = sync_manifest.load_previous_sheet(tsv_path, manifest)
+    if previous_sheet is not None:
+        diff = sync_manifest.compute_sync_diff(manifest, json_data, en_json_data)
+        print("3. TSV 파일이 마지막 동기화 그대로라 바뀐 키의 행만 읽는 중...")
+        with profiler.stage('load_tsv') as stage:
+            existing_translations = previous_sheet.parse_rows(diff.rebuilt_keys() + diff.removed)
+            header_rows = previous_sheet.header_rows
+            stage.rows = len(existing_translations)
+        reused = {key: line for key, line in previous_sheet.lines.items()
+                  if key in json_data and key not in existing_translations}
+    elif not concurrent_load:
+        print("3. TSV 파일 로드 중...")
+        with profiler.stage('load_tsv') as stage:
+            existing_translations, header_rows = load_cached(cache, 'tsv', tsv_path, load_tsv_file)
+            stage.rows = len(existing_translations)
+    
+    print(f"   - 기존 번역 항목 수: {len(previous_sheet or existing_translations)}")
+    if reused is not None:
+        print(f"   - 그대로 복사할 행: {len(reused)}개, 다시 만들 행: {len(diff.rebuilt_keys())}개")
+    if not streaming:
+        print(f"   - 새 kr.json 항목 수: {len(json_data)}")
+    print(f"   - 새 en.json 항목 수: {len(en_json_data)}")
+    
+    # 자리표시자/태그 검증: 번역을 마친 행의 영문 원문과 번역 입력문 비교
+    # (바뀐 키의 행만 읽었으면 그 행만 검증 - 나머지 행은 지난 동기화 이후 그대로)
+    if not options.get('no_validate'):
+        import translation_sync_validate as sync_validate
+        validated = existing_translations
+        if previous_sheet is not None:
+            validated = {key: existing_translations[key] for key in diff.rebuilt_keys() if key in existing_translations}
+            print(f"   - 검증: 바뀐 키의 행 {len(validated)}개만 검증합니다")
+        with profiler.stage('validate') as stage:
+            result.validation_issues = sync_validate.validate_translations(validated)
+            stage.rows = len(validated)
+        report_path = sync_validate.report_path_for(tsv_path)
+        if result.validation_issues:
+            sync_validate.save_validation_report(result.validation_issues, validated, report_path)
+            result.validation_report = report_path
+        elif os.path.exists(report_path) and previous_sheet is None:
+            os.remove(report_path)  # 지난 실행의 보고서가 남아 있으면 이미 고친 문제로 오해할 수 있음
+    
+    # 번역 메모리: 번역을 마친 행의 (영문 원문, 번역 입력문) 을 모아 두고 새 항목에 같거나 비슷한 번역을 제안
+    memory = None
+    suggest = None
+    if options.get('memory'):
+        import translation_sync_memory as sync_memory
+        min_score = options.get('memory_min_score')
+        min_score = float(min_score) if min_score not in (None, True) else sync_memory.DEFAULT_MIN_SCORE
+        with profiler.stage('memory') as stage:
+            memory = sync_memory.open_memory(tsv_path, options['memory'])
+            added, changed = memory.learn_from_translations(existing_translations, en_json_data)
+            stage.rows = len(existing_translations)
+        print(f"   - 번역 메모리: 문장 {len(memory)}개 (새 문장 {added}개, 바뀐 번역 {changed}개) {memory.path}")
+        
+        def suggest(key, value, en_value):
+            suggestion = memory.best(en_value, min_score)
+            if suggestion is not None:
+                result.suggested_entries.append(key)
+            return suggestion
+    
+    # 카테고리 자동 지정: 기존 행의 카테고리로 키 모양 분류기를 만들어 두고 새 항목의 카테고리를 채움
+    classifier = None
+    if not options.get('no_categorize'):
+        import translation_sync_category as sync_category
+        min_confidence = options.get('category_min_confidence')
+        min_confidence = float(min_confidence) if min_confidence not in (None, True) \
+            else sync_category.DEFAULT_MIN_CONFIDENCE
+        with profiler.stage('categorize') as stage:
+            if previous_sheet is None:
+                classifier = sync_category.CategoryClassifier.from_translations(existing_translations, min_confidence)
+                stage.rows = len(existing_translations)
+            elif diff.inserted:
+                # 바뀐 키의 행만 읽었으면 새 키가 있을 때만 모든 행의 카테고리 칸을 읽어 학습
+                classifier = sync_category.CategoryClassifier.from_translations(
+                    previous_sheet.category_rows(), min_confidence)
+                stage.rows = len(previous_sheet)
+        if classifier is not None and not len(classifier):
+            classifier = None  # 카테고리를 채운 기존 행이 없으면 배울 것이 없음
+    classify = classifier.classify if classifier is not None else None
+    
+    # 스트리밍 모드에서는 kr.json 키 목록을 미리 만들지 않으므로 매칭 확인을 건너뜀
+    if not streaming:
+        with profiler.stage('key_match') as stage:
+            print_key_match_report(json_data, en_json_data,
+                                   previous_sheet.lines if previous_sheet is not None else existing_translations)
+            stage.rows = len(json_data)
+    
+    # 증분 모드: 키 단위로 비교해 TSV 를 다시 쓸 필요가 있는지 판단
+    # (TSV 를 줄 단위로 읽었으면 비교는 위에서 이미 했고, 다시 쓸 때 바뀐 키의 행만 새로 만듦)
+    manifest_builder = None
+    if incremental:
+        if previous_sheet is None:
+            manifest = sync_manifest.load_manifest(manifest_path)
+            if manifest is not None:
+                tsv_order = None
+                if shard_spec is not None:
+                    tsv_order = sync_shard.expected_key_order(json_data, existing_translations, shard_spec)
+                diff = sync_manifest.compute_sync_diff(manifest, json_data, en_json_data, existing_translations,
+                                                       tsv_order)
+        if manifest is not None:
+            sync_manifest.print_sync_diff(diff)
+            if not diff.requires_rewrite and manifest.formula_mode == formula_mode and not reshard:
+                builder = sync_manifest.ManifestBuilder(en_json_data, formula_mode, manifest, diff)
+                if previous_sheet is not None:
+                    for key, value in json_data.items():
+                        builder.add_row(key, value, None)  # 모든 행이 지난번 그대로
+                else:
+                    builder.add_existing(json_data, existing_translations)
+                builder.save(manifest_path, json_path, en_json_path, tsv_path)
+                print("\n=== 동기화 완료 ===")
+                print("kr.json/en.json 내용과 키 순서가 그대로라 TSV 파일을 다시 쓰지 않았습니다.")
+                print(f"매니페스트를 갱신했습니다: {manifest_path}")
+                result.skipped = True
+                result.manifest_path = manifest_path
+                result.metrics = profiler.finish(metrics_path)
+                if memory is not None:
+                    memory.close()
+                return result
+        else:
+            print("\n이전 매니페스트가 없어 전체 동기화 후 새로 만듭니다.")
+        # 변경분 모드에서는 시트에 적용한 뒤 다시 내보낸 TSV 로 매니페스트를 만듦
+        if not delta_format:
+            manifest_builder = sync_manifest.ManifestBuilder(en_json_data, formula_mode, manifest, diff)
+    
+    # 키 이름만 바뀐 항목: 삭제될 행과 원문이 같은 새 키는 이전 번역을 이어받고 검토 필요로 표시
+    # (스트리밍 모드는 kr.json 을 쓰면서 읽으므로 삭제될 행을 미리 알 수 없어 건너뜀)
+    carried = None
+    if not streaming and not options.get('no_carry_over'):
+        if previous_sheet is not None:
+            # 읽은 행 중 제거된 키의 행과 새 키만 비교 (나머지 키는 양쪽에 그대로 있음)
+            renamed = find_renamed_keys({key: json_data[key] for key in diff.inserted}, en_json_data,
+                                        {key: existing_translations[key] for key in diff.removed
+                                         if key in existing_translations})
+        else:
+            renamed = find_renamed_keys(json_data, en_json_data, existing_translations)
+        if renamed:
+            carried = carry_over_rows(renamed, json_data, existing_translations)
+            result.renamed_entries = {key: old_key for key, (old_key, _) in renamed.items()}
+            print(f"   - 키가 바뀐 것으로 보이는 항목: {len(renamed)}개 (이전 번역을 이어받고 '{REVIEW_STATUS}' 로 표시)")
+    
+    # 원문 변경 확인: 지난번에 기록한 원문 지문과 달라진 기존 항목은 검토 필요로 표시
+    drift_checker = None
+    review = None
+    if not options.get('no_drift_check'):
+        import translation_sync_fingerprint as sync_fingerprint
+        fingerprint_path = sync_fingerprint.fingerprint_path_for(tsv_path)
+        drift_checker = sync_fingerprint.SourceDriftChecker(sync_fingerprint.load_fingerprints(fingerprint_path))
+        review = drift_checker.check
+    
+    if delta_format:
+        # 변경분 모드: 기존 TSV 는 그대로 두고 바뀐 행만 따로 저장
+        import translation_sync_delta as sync_delta
+        delta_path = result.delta_path = sync_delta.delta_path_for(tsv_path, delta_format)
+        print("4. 변경분 계산 중...")
+        report_progress('write_tsv', 0)
+        try:
+            with profiler.stage('write_tsv') as stage:
+                new_entries, updated_entries, deleted_entries = sync_delta.create_tsv_delta(
+                    json_data, en_json_data, existing_translations, header_rows, tsv_path,
+                    delta_path, delta_format, suggest=suggest, carried=carried, review=review,
+                    formula_mode=formula_mode, classify=classify
+                )
+                stage.rows = len(new_entries) + len(updated_entries)
+            report_progress('write_tsv', stage.rows, stage.rows)
+        except sync_delta.DeltaTooLargeError as e:
+            # 행을 만들기 전에 확인하므로 제안/검토/분류 통계는 아직 쌓이지 않음
+            print(f"{e} - 변경분 대신 TSV 전체를 다시 씁니다.")
+            delta_format = None
+            result.delta_path = None
+    if not delta_format:
+        # TSV 업데이트 (캐시를 쓰면 기록한 행을 그대로 모아 다음 실행 때 TSV 를 다시 읽지 않음)
+        row_callbacks = []
+        if manifest_builder is not None:
+            row_callbacks.append(manifest_builder.add_row)
+        written_rows = None
+        if cache is not None and cache.keeps_written_tsv and not streaming:
+            written_rows = {}
+            row_callbacks.append(lambda key, value, trans_data: written_rows.__setitem__(key, trans_data))
+        
+        def row_callback(key, value, trans_data):
+            for callback in row_callbacks:
+                callback(key, value, trans_data)
+        
+        print("4. TSV 파일 업데이트 중...")
+        write_snapshot = bool(options.get('snapshot'))
+        with profiler.stage('write_tsv') as stage:
+            if shard_spec is not None:
+                # 이후 매니페스트/보고서는 샤드 목록 파일 기준 (TSV 와 이름이 같아 옆에 만드는 파일도 그대로)
+                tsv_path = result.tsv_path = sync_shard.shard_manifest_path_for(tsv_path)
+                new_entries, updated_entries, deleted_entries = sync_shard.create_sharded_tsv(
+                    json_data, en_json_data, existing_translations, header_rows, tsv_path, shard_spec,
+                    row_callback=row_callback if row_callbacks else None,
+                    backup_keep=backup_keep, suggest=suggest, carried=carried, review=review,
+                    formula_mode=formula_mode, write_snapshot=write_snapshot, classify=classify
+                )
+            else:
+                try:
+                    new_entries, updated_entries, deleted_entries = create_updated_tsv(
+                        json_data, en_json_data, existing_translations, header_rows, tsv_path,
+                        row_callback=row_callback if row_callbacks else None,
+                        backup_keep=backup_keep, suggest=suggest, carried=carried, review=review,
+                        formula_mode=formula_mode, write_snapshot=write_snapshot and not streaming,
+                        classify=classify, reused=reused
+                    )
+                except Exception as e:
+                    # 스트리밍 중 kr.json 읽기 오류 (기존 TSV 는 바뀌지 않음)
+                    if memory is not None:
+                        memory.close()
+                    raise SyncError(f"kr.json 을 읽는 중 오류가 발생해 TSV 파일을 바꾸지 않았습니다: {e}") from e
+            stage.rows = len(new_entries) + len(updated_entries)
+        if written_rows and (new_entries or updated_entries):
+            cache.put('tsv', tsv_path, (written_rows, header_rows))
+    
+    # kr.json 의 키는 모두 새 항목이나 유지 항목이 되므로, 둘 다 비었으면 쓰기 중 오류가 난 것 (오류는 위에 출력됨)
+    if not streaming and json_data and not (new_entries or updated_entries):
+        if memory is not None:
+            memory.close()
+        raise SyncError("TSV 파일을 만들지 못했습니다 (위 오류 메시지 참고)")
+    
+    result.new_entries = new_entries
+    result.updated_entries = updated_entries
+    result.deleted_entries = deleted_entries
+    if drift_checker is not None:
+        result.drifted_entries = drift_checker.drifted
+        # 변경분 모드에서는 시트에 적용하기 전이므로 지문을 갱신하지 않음 (다시 만들어도 표시가 빠지지 않도록)
+        if not delta_format and (new_entries or updated_entries):
+            if reused:
+                drift_checker.keep(reused, json_data, en_json_data)
+            drift_checker.save(fingerprint_path)
     
     # 결과 보고
     print("\n=== 동기화 완료 ===")
-    print(f"총 항목 수: {len(json_data)}")
+    print(f"총 항목 수: {len(new_entries) + len(updated_entries)}")
     print(f"기존 번역 유지: {len(updated_entries)}")
     print(f"새로 추가된 항목: {len(new_entries)}")
     
@@ -357,6 +1420,32 @@ def main():
             print(f"  - {entry}")
         if len(new_entries) > 10:
             print(f"  ... 및 {len(new_entries) - 10}개 더")
+    if drift_checker is not None:
+        print(f"원문이 바뀐 번역 항목: {len(result.drifted_entries)}개" +
+              (f" (번역 상태 '{REVIEW_STATUS}', 비고에 날짜와 새 원문 일부 표시)" if result.drifted_entries else ""))
+        for key in result.drifted_entries[:10]:
+            print(f"  - {key}")
+        if len(result.drifted_entries) > 10:
+            print(f"  ... 및 {len(result.drifted_entries) - 10}개 더")
+        if drift_checker.refreshed:
+            print(f"원문이 바뀌어 한글 원문/번역 입력문을 새로 고친 미번역 항목: {len(drift_checker.refreshed)}개")
+    if result.renamed_entries:
+        print(f"\n이전 키의 번역을 이어받은 항목 ({len(result.renamed_entries)}개, 번역 상태 '{REVIEW_STATUS}'):")
+        for i, (key, old_key) in enumerate(result.renamed_entries.items()):
+            if i == 10:
+                print(f"  ... 및 {len(result.renamed_entries) - 10}개 더")
+                break
+            print(f"  - {old_key} → {key}")
+    if memory is not None:
+        memory.close()
+        print(f"번역 메모리 제안으로 번역 입력문을 채운 새 항목: {len(result.suggested_entries)}개 (비고에 출처 표시)")
+    if classifier is not None:
+        result.category_report = classifier.coverage_report()
+        sync_category.print_category_summary(result.category_report)
+    if not options.get('no_validate'):
+        sync_validate.print_validation_summary(result.validation_issues)
+        if result.validation_report:
+            print(f"검증 보고서: {result.validation_report}")
     
     # 삭제된 항목 확인 및 파일 저장
     if deleted_entries:
@@ -366,13 +1455,251 @@ def main():
         if len(deleted_entries) > 5:
             print(f"  ... 및 {len(deleted_entries) - 5}개 더")
         
-        # 삭제된 항목들을 텍스트 파일로 저장
-        deleted_file_path = tsv_path.replace('.tsv', f'_deleted_items_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt')
-        save_deleted_items_to_file(deleted_entries, existing_translations, deleted_file_path)
-        print(f"삭제된 항목들이 저장되었습니다: {deleted_file_path}")
+        # 삭제된 항목들을 백업 저장소에 보관 (--keep-backups=0 이면 예전처럼 텍스트 파일로 저장)
+        with profiler.stage('deleted_report') as stage:
+            if backup_keep == 0:
+                deleted_file_path = os.path.splitext(tsv_path)[0] + f'_deleted_items_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt'
+                save_deleted_items_to_file(deleted_entries, existing_translations, deleted_file_path)
+                print(f"삭제된 항목들이 저장되었습니다: {deleted_file_path}")
+                result.deleted_file = deleted_file_path
+            else:
+                import translation_sync_backup as sync_backup
+                timestamp = sync_backup.backup_deleted_items(
+                    tsv_path, deleted_entries, existing_translations, backup_keep or sync_backup.DEFAULT_KEEP)
+                if timestamp is not None:
+                    print(f"삭제된 항목 보고서를 백업 저장소에 보관했습니다: "
+                          f"{sync_backup.BackupStore.for_tsv(tsv_path).root} ({timestamp})")
+                    print(f"  확인: python translation_sync.py restore \"{tsv_path}\" {timestamp} --kind=deleted_items")
+                result.deleted_backup = timestamp
+            stage.rows = len(deleted_entries)
+    
+    # 다음 증분 실행을 위한 매니페스트 저장 (TSV 를 다 쓴 뒤여야 파일 정보가 맞음)
+    if manifest_builder is not None and (new_entries or updated_entries):
+        manifest_builder.save(manifest_path, json_path, en_json_path, tsv_path)
+        print(f"매니페스트를 저장했습니다: {manifest_path}")
+        result.manifest_path = manifest_path
+    
+    # 다시 쓴 TSV 를 스프레드시트로 바로 전송 (실패해도 TSV 와 매니페스트는 이미 저장됨)
+    if push_config is not None and (new_entries or updated_entries):
+        with profiler.stage('push') as stage:
+            try:
+                result.push_report = sync_push.push_tsv(tsv_path, push_config)
+            except sync_push.PushError as e:
+                raise SyncError(f"시트 전송 실패 (TSV 는 저장됨, python translation_sync.py push 로 다시 시도): {e}")
+            stage.rows = result.push_report['sent_rows']
+        sync_push.print_push_report(result.push_report)
     
-    print(f"\n업데이트된 TSV 파일: {tsv_path}")
+    if delta_format:
+        print(f"\n변경분 파일: {delta_path}")
+        print("기존 TSV 파일은 그대로입니다. 변경분의 작업을 순서대로 시트에 적용하세요.")
+    elif shard_spec is not None:
+        sync_shard.print_shard_summary(tsv_path)
+    else:
+        print(f"\n업데이트된 TSV 파일: {tsv_path}")
+    result.metrics = profiler.finish(metrics_path)
     print("번역 작업을 계속 진행하세요!")
+    return result
+
+
+def main():
+    # Windows 콘솔 인코딩 설정
+    if sys.platform == 'win32':
+        import locale
+        try:
+            # Windows에서 UTF-8 출력을 위한 설정
+            sys.stdout.reconfigure(encoding='utf-8')
+            sys.stderr.reconfigure(encoding='utf-8')
+        except:
+            pass
+    
+    args, options = parse_cli_args(sys.argv[1:])
+    
+    # 백업 저장소 명령: backups <TSV> (목록), restore <TSV> <백업_시각> (복원)
+    if args and args[0] in ('backups', 'restore'):
+        import translation_sync_backup as sync_backup
+        if args[0] == 'backups' and len(args) == 2:
+            sync_backup.print_backup_list(args[1])
+            return
+        if args[0] == 'restore' and len(args) == 3:
+            tsv_path, timestamp = args[1], args[2]
+            kind = options.get('kind', 'sheet')
+            store = sync_backup.BackupStore.for_tsv(tsv_path)
+            if timestamp not in store.list_snapshots(kind):
+                print(f"백업을 찾을 수 없습니다: {timestamp} ({kind})")
+                sync_backup.print_backup_list(tsv_path)
+                sys.exit(1)
+            default_ext = '.tsv' if kind == 'sheet' else '.txt'
+            output_path = options.get('output') or \
+                f"{os.path.splitext(tsv_path)[0]}_{kind}_restored_{timestamp}{default_ext}"
+            store.restore(timestamp, output_path, kind)
+            print(f"백업을 복원했습니다: {output_path}")
+            return
+        print("사용법: python translation_sync.py backups <TSV_파일_경로>")
+        print("       python translation_sync.py restore <TSV_파일_경로> <백업_시각> [--kind=deleted_items] [--output=경로]")
+        sys.exit(1)
+    
+    # kr.json 만들기: TSV 의 번역 입력문으로 바로 kr.json 생성 (스프레드시트 함수 컬럼 복사 불필요)
+    if args and args[0] == 'build':
+        import translation_sync_build as sync_build
+        if len(args) not in (2, 3):
+            print("사용법: python translation_sync.py build <TSV_파일_경로> [원본_kr.json] [--output=경로] [--strict]")
+            sys.exit(1)
+        tsv_path = args[1]
+        source_json_path = args[2] if len(args) == 3 else None
+        output_path = options.get('output') or sync_build.default_output_path(tsv_path)
+        try:
+            report = sync_build.build_kr_json(tsv_path, output_path, source_json_path,
+                                              strict=bool(options.get('strict')))
+        except (OSError, ValueError) as e:
+            print(f"kr.json 만들기 오류: {e}")
+            sys.exit(1)
+        sync_build.print_build_report(report)
+        if not report['written']:
+            sys.exit(1)
+        return
+    
+    # 병합: 번역자별 TSV 사본들을 kr.json 키 순서로 합침
+    if args and args[0] == 'merge':
+        import translation_sync_merge as sync_merge
+        if len(args) < 4:
+            print("사용법: python translation_sync.py merge <kr.json> <TSV_1> <TSV_2> [...] [--output=경로]"
+                  " [--policy=status|non-empty|flag]")
+            sys.exit(1)
+        json_path, tsv_paths = args[1], args[2:]
+        output_path = options.get('output') or sync_merge.default_output_path(tsv_paths[0])
+        backup_keep = options.get('keep_backups')
+        try:
+            report = sync_merge.merge_tsv_files(
+                json_path, tsv_paths, output_path,
+                policy=options.get('policy', sync_merge.DEFAULT_MERGE_POLICY),
+                backup_keep=int(backup_keep) if backup_keep not in (None, True) else None,
+                formula_mode=options.get('formula', DEFAULT_FORMULA_MODE),
+            )
+        except (OSError, ValueError) as e:
+            print(f"TSV 병합 오류: {e}")
+            sys.exit(1)
+        sync_merge.print_merge_report(report)
+        return
+    
+    # 번역 작업 목록: 같은 원문의 미번역 행을 작업 하나로 묶어 내보내고, 끝난 번역을 묶음 전체에 채움
+    if args and args[0] in ('worklist', 'apply-worklist'):
+        import translation_sync_worklist as sync_worklist
+        try:
+            if args[0] == 'worklist' and len(args) == 2:
+                output_path = options.get('output') or sync_worklist.default_output_path(args[1])
+                sync_worklist.print_export_report(sync_worklist.export_worklist(args[1], output_path))
+                return
+            if args[0] == 'apply-worklist' and len(args) == 3:
+                backup_keep = options.get('keep_backups')
+                report = sync_worklist.apply_worklist(
+                    args[1], args[2], options.get('output') or None,
+                    backup_keep=int(backup_keep) if backup_keep not in (None, True) else None,
+                )
+                sync_worklist.print_apply_report(report)
+                return
+        except (OSError, ValueError) as e:
+            print(f"작업 목록 오류: {e}")
+            sys.exit(1)
+        print("사용법: python translation_sync.py worklist <TSV_파일_경로> [--output=경로]")
+        print("       python translation_sync.py apply-worklist <TSV_파일_경로> <작업_목록.tsv> [--output=경로]")
+        sys.exit(1)
+    
+    # 시트 전송: 이미 만든 TSV(또는 샤드 목록)를 스프레드시트로 보냄 (--push 전송이 실패했을 때 다시 시도)
+    if args and args[0] == 'push':
+        import translation_sync_push as sync_push
+        if len(args) != 2 or not options.get('spreadsheet'):
+            print("사용법: python translation_sync.py push <TSV_파일_경로> --spreadsheet=<ID> [--sheet-tab=이름]"
+                  " [--push=changed|full] [--push-endpoint=URL] [--push-token-file=경로] [--push-workers=N]")
+            sys.exit(1)
+        try:
+            report = sync_push.push_from_options(args[1], options)
+        except (OSError, sync_push.PushError) as e:
+            print(f"시트 전송 오류: {e}")
+            sys.exit(1)
+        sync_push.print_push_report(report)
+        return
+    
+    # 감시 모드: 세 파일이 바뀔 때마다 증분 동기화
+    if args and args[0] == 'watch':
+        import translation_sync_watch as sync_watch
+        if len(args) != 4:
+            print("사용법: python translation_sync.py watch <kr.json> <en.json> <TSV> [--debounce=초] [--poll] [--interval=초]")
+            sys.exit(1)
+        sync_watch.watch(
+            args[1], args[2], args[3], options,
+            debounce=float(options.get('debounce', sync_watch.DEFAULT_DEBOUNCE)),
+            poll=bool(options.get('poll')),
+            interval=float(options.get('interval', sync_watch.DEFAULT_POLL_INTERVAL)),
+        )
+        return
+    
+    # 일괄 모드: 작업 목록 파일의 여러 (kr.json, en.json, TSV) 작업을 프로세스 풀에서 실행
+    if options.get('batch'):
+        import translation_sync_batch as sync_batch
+        if options['batch'] is True:
+            print("사용법: python translation_sync.py --batch=<작업_목록.json> [--workers=N] [동기화 옵션]")
+            sys.exit(1)
+        job_options = {name: value for name, value in options.items() if name not in ('batch', 'workers')}
+        summary = sync_batch.run_batch(
+            options['batch'],
+            workers=int(options['workers']) if options.get('workers') else None,
+            options=job_options,
+        )
+        if summary['failed']:
+            sys.exit(1)
+        return
+    
+    if len(args) != 3:
+        print("사용법: python translation_sync.py <새로운_kr.json_경로> <새로운_en.json_경로> <기존_TSV_파일_경로> [옵션]")
+        print("예시: python translation_sync.py kr.json en.json \"SPT 타르코프 한글화 프로젝트 - 메인 번역 작업.tsv\"")
+        print("옵션:")
+        print("  --streaming    kr.json 을 순서대로 읽으면서 바로 기록하고 en.json 은 압축 인덱스로 로드 (대용량 파일용)")
+        print("  --incremental  지난 동기화 매니페스트와 비교해 바뀐 키를 보고하고, 입력이 그대로면 바로 종료")
+        print("                 (kr.json/en.json 이 그대로면 TSV 를 다시 쓰지 않고, TSV 가 지난번 그대로면 바뀐 키의 행만 다시 만듦)")
+        print("  --delta[=tsv]  TSV 를 다시 쓰지 않고 삭제/이동/삽입/칸 갱신 작업만 변경분 파일로 저장 (기본 jsonl)")
+        print("  --profile[=경로]  단계별 시간/CPU/메모리/초당 행 수를 측정해 JSON 으로 저장")
+        print("  --cprofile[=경로] --profile 과 함께 단계 실행 구간의 cProfile 결과(.prof)도 저장")
+        print("  --keep-backups=N  백업 저장소에 남길 백업 수 (기본 30, 0 이면 예전처럼 *_backup_날짜.tsv 로 보관)")
+        print("  --memory[=경로]  번역 메모리(SQLite)에 번역을 모으고 새 항목에 같거나 비슷한 문장의 번역을 미리 채움")
+        print("  --memory-min-score=0.6  비슷한 문장으로 인정할 최소 유사도 (0~1)")
+        print("  --no-carry-over  키 이름만 바뀐 항목(원문이 같은 삭제 행)의 번역을 이어받지 않음")
+        print("  --no-drift-check 원문(kr/en)이 바뀐 기존 항목을 검토 필요로 표시하지 않음")
+        print("  --formula=indirect|array|static  번역문 컬럼 작성 방식 (기본 indirect: 행마다 INDIRECT 함수,")
+        print("                   array: 헤더에 ARRAYFORMULA 하나, static: 계산된 값을 바로 기록)")
+        print("  --concurrent-load kr.json, en.json, TSV 를 동시에 읽음 (네트워크 공유 폴더처럼 읽기가 느린 곳에서 유용)")
+        print("  --sequential-load 세 입력 파일을 하나씩 차례로 읽음 (기본, --concurrent-load 보다 우선)")
+        print("  --no-validate    번역 입력문의 자리표시자/태그/줄바꿈을 영문 원문과 비교하지 않음")
+        print("  --no-categorize  새 항목의 카테고리를 기존 행의 키 모양(ID/접두어/접미어)으로 채우지 않음")
+        print("  --category-min-confidence=0.8  카테고리를 채울 최소 신뢰도 (0~1)")
+        print("  --snapshot       TSV 를 쓸 때 파싱 결과 스냅샷도 저장해 다음 실행의 TSV 로드를 건너뜀 (쓰기 시간/메모리 증가)")
+        print("  --shard=rows:N|category|prefix:N  N행씩/카테고리별/키 앞 N글자별로 TSV 를 나눠 쓰고 <TSV 이름>.shards 목록 저장")
+        print("                   (이후에는 TSV 대신 .shards 파일을 넘기면 한 시트처럼 읽고 같은 방식으로 다시 나눔)")
+        print("  --push[=changed|full] --spreadsheet=<ID> [--sheet-tab=이름]  다시 쓴 TSV 를 Sheets API 로 바로 전송")
+        print("                   (changed: 지난 전송 이후 바뀐 행만, 토큰은 SHEETS_ACCESS_TOKEN 또는 --push-token-file)")
+        print("  --push-endpoint=URL  전송 주소 (가짜 서버 translation_sync_sheets_mock.py 로 확인할 때)")
+        print("  --push-workers=4 동시에 보낼 요청 수")
+        print("백업: python translation_sync.py backups <TSV>  /  restore <TSV> <백업_시각> [--output=경로]")
+        print("kr.json 만들기: python translation_sync.py build <TSV> [원본_kr.json] [--output=경로] [--strict]")
+        print("  번역 입력문으로 kr.json 을 바로 생성 (미번역 항목은 원문 사용)")
+        print("병합: python translation_sync.py merge <kr.json> <TSV_1> <TSV_2> [...] [--output=경로] [--policy=status|non-empty|flag]")
+        print("  번역자별 TSV 사본을 원문 ID 기준으로 합치고 번역이 다른 항목은 충돌 보고서에 기록")
+        print("작업 목록: python translation_sync.py worklist <TSV> [--output=경로]")
+        print("  원문이 같은 미번역 행을 작업 하나로 묶어 <TSV 이름>_worklist.tsv 로 저장 (나온 횟수 포함)")
+        print("  apply-worklist <TSV> <작업_목록.tsv> [--output=경로] 로 끝난 번역을 같은 원문의 미번역 행 모두에 채움")
+        print("시트 전송: python translation_sync.py push <TSV> --spreadsheet=<ID> [--sheet-tab=이름] [--push=full]")
+        print("  만들어 둔 TSV 를 시트로 전송 (--push 가 실패했을 때 다시 시도)")
+        print("감시: python translation_sync.py watch <kr.json> <en.json> <TSV> [--debounce=1.0] [--poll]")
+        print("  세 파일이 바뀔 때마다 증분 동기화 (Linux 는 inotify, 그 외는 주기 확인)")
+        print("일괄 실행: python translation_sync.py --batch=<작업_목록.json> [--workers=N]")
+        print("  작업 목록의 (kr.json, en.json, TSV) 작업들을 여러 프로세스로 나눠 실행하고 요약 파일을 저장")
+        sys.exit(1)
+    
+    json_path, en_json_path, tsv_path = args
+    try:
+        sync(json_path, en_json_path, tsv_path, options)
+    except SyncError as e:
+        print(e)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
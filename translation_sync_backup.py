@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 중복 제거 백업 저장소
+
+TSV 를 *_backup_날짜.tsv 로 통째로 복사해 두는 대신, TSV 옆의 <TSV 이름>.backups 폴더에
+행 단위로 중복을 제거해 압축 저장합니다. 디스크 사용량과 백업 시간은 시트 크기가 아니라 바뀐 행 수에 비례합니다.
+
+저장소 구조:
+  packs/<id>.pack          저장소에 처음 들어온 행들을 이어 붙여 zlib 으로 압축한 묶음
+  packs/<id>.idx           묶음 안의 행 목록 (행 해시 16바이트 + 오프셋 + 길이)
+  snapshots/<종류>/<시각>.json.gz
+                           백업 한 개 = 행 해시 순서. 직전 백업과 같은 구간은 [시작, 길이] 로만 기록
+
+백업 종류는 'sheet'(TSV 시트)와 'deleted_items'(삭제 항목 보고서) 입니다.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import struct
+import zlib
+from datetime import datetime
+
+
+STORE_SUFFIX = '.backups'
+DEFAULT_KEEP = 30
+ROW_HASH_SIZE = 16
+# 직전 백업을 기준으로 한 차분이 이 길이를 넘으면 전체 해시 목록으로 저장 (복원 시 따라갈 단계 제한)
+MAX_CHAIN_DEPTH = 16
+# 살아있는 행 비율이 이보다 낮은 묶음은 정리할 때 다시 압축
+REPACK_RATIO = 0.5
+# 백업 시각 "%Y%m%d_%H%M%S" 의 길이 (같은 초에 만들면 뒤에 _2, _3 ... 이 붙음)
+TIMESTAMP_LENGTH = 15
+
+_INDEX_ENTRY = struct.Struct('<16sII')
+
+
+def store_path_for(tsv_path):
+    """TSV 파일에 대응하는 백업 저장소 폴더 경로"""
+    return os.path.splitext(tsv_path)[0] + STORE_SUFFIX
+
+
+def split_rows(data):
+    """바이트 내용을 줄바꿈을 포함한 행 목록으로 분리 (이어 붙이면 원래 내용과 같음)"""
+    return io.BytesIO(data).readlines()
+
+
+def hash_row(row):
+    return hashlib.blake2b(row, digest_size=ROW_HASH_SIZE).digest()
+
+
+def build_recipe(hashes, base_hashes):
+    """직전 백업 해시 목록 대비 차분 [[시작, 길이] 또는 새 행 해시(hex)] 생성 (O(n))"""
+    base_index = {}
+    for i, h in enumerate(base_hashes):
+        base_index.setdefault(h, i)
+
+    recipe = []
+    i = 0
+    while i < len(hashes):
+        start = base_index.get(hashes[i])
+        if start is None:
+            recipe.append(hashes[i].hex())
+            i += 1
+            continue
+        length = 1
+        while (i + length < len(hashes) and start + length < len(base_hashes)
+               and hashes[i + length] == base_hashes[start + length]):
+            length += 1
+        recipe.append([start, length])
+        i += length
+    return recipe
+
+
+def _timestamp_order(timestamp):
+    """백업 시각 정렬 키: 같은 초에 만든 백업의 번호(_2, _10 ...)를 문자열이 아닌 숫자로 비교"""
+    stamp, seq = timestamp[:TIMESTAMP_LENGTH], timestamp[TIMESTAMP_LENGTH + 1:]
+    return stamp, int(seq) if seq.isdigit() else 1
+
+
+class BackupStore:
+    """TSV 하나에 대한 백업 저장소"""
+
+    def __init__(self, root):
+        self.root = root
+        self.pack_dir = os.path.join(root, 'packs')
+        self.snapshot_dir = os.path.join(root, 'snapshots')
+        self._index = None  # 행 해시 → (묶음 id, 오프셋, 길이)
+        self._resolved = {}
+
+    @classmethod
+    def for_tsv(cls, tsv_path):
+        return cls(store_path_for(tsv_path))
+
+    # ---- 행 묶음 ----
+
+    def _load_index(self):
+        if self._index is not None:
+            return self._index
+        index = {}
+        if os.path.isdir(self.pack_dir):
+            for name in sorted(os.listdir(self.pack_dir)):
+                if not name.endswith('.idx'):
+                    continue
+                pack_id = name[:-4]
+                with open(os.path.join(self.pack_dir, name), 'rb') as f:
+                    data = f.read()
+                for row_hash, offset, length in _INDEX_ENTRY.iter_unpack(data):
+                    index.setdefault(row_hash, (pack_id, offset, length))
+        self._index = index
+        return index
+
+    def _write_pack(self, pack_id, rows):
+        """[(해시, 행)] 를 새 묶음으로 저장 (묶음 먼저 쓰고 목록을 나중에 써야 중간에 끊겨도 안전)"""
+        os.makedirs(self.pack_dir, exist_ok=True)
+        entries = []
+        offset = 0
+        for row_hash, row in rows:
+            entries.append(_INDEX_ENTRY.pack(row_hash, offset, len(row)))
+            self._index[row_hash] = (pack_id, offset, len(row))
+            offset += len(row)
+        pack_path = os.path.join(self.pack_dir, pack_id + '.pack')
+        with open(pack_path + '.tmp', 'wb') as f:
+            f.write(zlib.compress(b''.join(row for _, row in rows), 6))
+        os.replace(pack_path + '.tmp', pack_path)
+        idx_path = os.path.join(self.pack_dir, pack_id + '.idx')
+        with open(idx_path + '.tmp', 'wb') as f:
+            f.write(b''.join(entries))
+        os.replace(idx_path + '.tmp', idx_path)
+
+    def _read_pack(self, pack_id):
+        with open(os.path.join(self.pack_dir, pack_id + '.pack'), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    # ---- 백업 목록 ----
+
+    def _kind_dir(self, kind):
+        return os.path.join(self.snapshot_dir, kind)
+
+    def list_snapshots(self, kind='sheet'):
+        """백업 시각 목록 (오래된 것부터)"""
+        kind_dir = self._kind_dir(kind)
+        if not os.path.isdir(kind_dir):
+            return []
+        return sorted((name[:-len('.json.gz')] for name in os.listdir(kind_dir) if name.endswith('.json.gz')),
+                      key=_timestamp_order)
+
+    def list_all(self):
+        """{종류: [시각, ...]}"""
+        if not os.path.isdir(self.snapshot_dir):
+            return {}
+        return {kind: self.list_snapshots(kind) for kind in sorted(os.listdir(self.snapshot_dir))}
+
+    def _snapshot_path(self, kind, timestamp):
+        return os.path.join(self._kind_dir(kind), timestamp + '.json.gz')
+
+    def read_snapshot(self, kind, timestamp):
+        with gzip.open(self._snapshot_path(kind, timestamp), 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_snapshot(self, kind, timestamp, snapshot):
+        path = self._snapshot_path(kind, timestamp)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path + '.tmp', 'wt', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+        self._resolved.pop((kind, timestamp), None)
+
+    def resolve(self, kind, timestamp):
+        """백업의 전체 행 해시 목록 (차분이면 기준 백업을 따라가며 복원)"""
+        cache_key = (kind, timestamp)
+        if cache_key in self._resolved:
+            return self._resolved[cache_key]
+        snapshot = self.read_snapshot(kind, timestamp)
+        base_hashes = self.resolve(kind, snapshot['base']) if snapshot.get('base') else []
+        hashes = []
+        for entry in snapshot['recipe']:
+            if isinstance(entry, str):
+                hashes.append(bytes.fromhex(entry))
+            else:
+                start, length = entry
+                hashes.extend(base_hashes[start:start + length])
+        self._resolved[cache_key] = hashes
+        return hashes
+
+    # ---- 백업 / 복원 ----
+
+    def _new_timestamp(self, kind):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        existing = set(self.list_snapshots(kind))
+        candidate, n = timestamp, 2
+        while candidate in existing:
+            candidate = f"{timestamp}_{n}"
+            n += 1
+        return candidate
+
+    def add_bytes(self, data, kind='sheet', source=''):
+        """내용을 백업하고 백업 시각 반환 (저장소에 없던 행만 새로 압축해 저장)"""
+        index = self._load_index()
+        rows = split_rows(data)
+        hashes = [hash_row(row) for row in rows]
+
+        new_rows = []
+        seen = set()
+        for row_hash, row in zip(hashes, rows):
+            if row_hash not in index and row_hash not in seen:
+                seen.add(row_hash)
+                new_rows.append((row_hash, row))
+
+        timestamp = self._new_timestamp(kind)
+        if new_rows:
+            self._write_pack(f"{kind}_{timestamp}", new_rows)
+
+        previous = self.list_snapshots(kind)
+        base = previous[-1] if previous else None
+        depth = 0
+        if base is not None:
+            depth = self.read_snapshot(kind, base).get('depth', 0) + 1
+            if depth > MAX_CHAIN_DEPTH:
+                base, depth = None, 0
+        recipe = build_recipe(hashes, self.resolve(kind, base) if base else [])
+
+        self._write_snapshot(kind, timestamp, {
+            'timestamp': timestamp,
+            'kind': kind,
+            'source': source,
+            'rows': len(rows),
+            'bytes': len(data),
+            'new_rows': len(new_rows),
+            'base': base,
+            'depth': depth,
+            'recipe': recipe,
+        })
+        return timestamp
+
+    def add_file(self, path, kind='sheet'):
+        with open(path, 'rb') as f:
+            data = f.read()
+        return self.add_bytes(data, kind, os.path.basename(path))
+
+    def restore_bytes(self, timestamp, kind='sheet'):
+        """백업 내용을 바이트로 복원"""
+        index = self._load_index()
+        packs = {}
+        parts = []
+        for row_hash in self.resolve(kind, timestamp):
+            pack_id, offset, length = index[row_hash]
+            if pack_id not in packs:
+                packs[pack_id] = self._read_pack(pack_id)
+            parts.append(packs[pack_id][offset:offset + length])
+        return b''.join(parts)
+
+    def restore(self, timestamp, output_path, kind='sheet'):
+        data = self.restore_bytes(timestamp, kind)
+        with open(output_path, 'wb') as f:
+            f.write(data)
+        return output_path
+
+    # ---- 보관 정책 ----
+
+    def _materialize(self, kind, timestamp):
+        """차분 백업을 전체 해시 목록 백업으로 다시 저장 (기준 백업을 지우기 전에 호출)"""
+        snapshot = self.read_snapshot(kind, timestamp)
+        if not snapshot.get('base'):
+            return
+        hashes = self.resolve(kind, timestamp)
+        snapshot.update(base=None, depth=0, recipe=[h.hex() for h in hashes])
+        self._write_snapshot(kind, timestamp, snapshot)
+
+    def prune(self, keep=DEFAULT_KEEP):
+        """종류별로 최근 keep 개만 남기고 정리한 뒤 쓰이지 않는 행 묶음 삭제 (삭제한 백업 수 반환)"""
+        removed = 0
+        for kind, timestamps in self.list_all().items():
+            expired = timestamps[:-keep] if keep > 0 else timestamps
+            if not expired:
+                continue
+            expired_set = set(expired)
+            # 남는 백업이 지워질 백업을 기준으로 삼고 있으면 먼저 전체 목록으로 바꿈
+            for timestamp in timestamps[len(expired):]:
+                if self.read_snapshot(kind, timestamp).get('base') in expired_set:
+                    self._materialize(kind, timestamp)
+            for timestamp in expired:
+                os.remove(self._snapshot_path(kind, timestamp))
+                self._resolved.pop((kind, timestamp), None)
+                removed += 1
+        if removed:
+            self.collect_garbage()
+        return removed
+
+    def collect_garbage(self):
+        """어떤 백업도 쓰지 않는 행 묶음은 삭제하고, 대부분 쓰이지 않는 묶음은 다시 압축"""
+        live = set()
+        for kind, timestamps in self.list_all().items():
+            for timestamp in timestamps:
+                live.update(self.resolve(kind, timestamp))
+
+        index = self._load_index()
+        pack_rows = {}
+        for row_hash, (pack_id, _, _) in index.items():
+            pack_rows.setdefault(pack_id, []).append(row_hash)
+
+        for pack_id, row_hashes in pack_rows.items():
+            live_hashes = [h for h in row_hashes if h in live]
+            if len(live_hashes) >= len(row_hashes) * REPACK_RATIO:
+                continue
+            if live_hashes:
+                data = self._read_pack(pack_id)
+                rows = []
+                for row_hash in live_hashes:
+                    _, offset, length = index[row_hash]
+                    rows.append((row_hash, data[offset:offset + length]))
+                self._write_pack(pack_id + '_r', rows)
+            for row_hash in row_hashes:
+                if index.get(row_hash, (None,))[0] == pack_id:
+                    del index[row_hash]
+            for ext in ('.idx', '.pack'):
+                os.remove(os.path.join(self.pack_dir, pack_id + ext))
+
+    def disk_usage(self):
+        total = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            total += sum(os.path.getsize(os.path.join(dirpath, name)) for name in filenames)
+        return total
+
+
+def backup_before_write(tsv_path, keep=DEFAULT_KEEP):
+    """TSV 를 덮어쓰기 전에 저장소에 백업하고 (저장소 경로, 백업 시각) 반환"""
+    store = BackupStore.for_tsv(tsv_path)
+    timestamp = store.add_file(tsv_path, 'sheet')
+    store.prune(keep)
+    return store.root, timestamp
+
+
+def backup_deleted_items(tsv_path, deleted_entries, existing_translations, keep=DEFAULT_KEEP):
+    """삭제 항목 보고서를 파일 대신 저장소에 보관하고 백업 시각 반환 (보고서를 쓰지 못했으면 None)
+
+    보고서는 저장소 안의 임시 파일에 썼다가 저장소에 넣은 뒤 지우므로 저장 메시지는 호출하는 쪽에서 출력합니다.
+    """
+    from translation_sync import save_deleted_items_to_file
+
+    store = BackupStore.for_tsv(tsv_path)
+    os.makedirs(store.root, exist_ok=True)
+    tmp_path = os.path.join(store.root, 'deleted_items.tmp')
+    try:
+        if not save_deleted_items_to_file(deleted_entries, existing_translations, tmp_path, report=False):
+            return None
+        timestamp = store.add_file(tmp_path, 'deleted_items')
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    store.prune(keep)
+    return timestamp
+
+
+def print_backup_list(tsv_path):
+    """저장소의 백업 목록 출력"""
+    store = BackupStore.for_tsv(tsv_path)
+    all_snapshots = store.list_all()
+    if not any(all_snapshots.values()):
+        print(f"백업이 없습니다: {store.root}")
+        return
+    print(f"백업 저장소: {store.root} ({store.disk_usage() / 2**20:.2f} MB)")
+    for kind, timestamps in all_snapshots.items():
+        print(f"\n[{kind}]")
+        for timestamp in timestamps:
+            snapshot = store.read_snapshot(kind, timestamp)
+            print(f"  {timestamp}  {snapshot['rows']:>8,}행  새 행 {snapshot['new_rows']:>7,}  "
+                  f"{snapshot['bytes'] / 2**20:8.2f} MB")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 여러 로케일 일괄 동기화
+
+작업 목록 파일에 적힌 (로케일 json, 기준 en.json, TSV) 작업들을 프로세스 풀에서 나눠 실행합니다.
+작업마다 translation_sync.sync() 를 명령행 옵션(과 작업별 "options")으로 실행하므로 단일 동기화와 결과가 같습니다.
+여러 작업이 같이 쓰는 기준 en.json 은 부모 프로세스에서 한 번만 압축 인덱스로 읽어 작업 프로세스에 넘깁니다.
+
+작업 목록 파일 예시 (상대 경로는 작업 목록 파일 위치 기준):
+  {
+    "en": "en.json",
+    "jobs": [
+      {"kr": "3.9/kr.json", "tsv": "3.9/메인 번역 작업.tsv"},
+      {"kr": "3.10/kr.json", "en": "3.10/en.json", "tsv": "3.10/메인 번역 작업.tsv",
+       "options": {"formula": "static", "keep_backups": "5"}}
+    ]
+  }
+"""
+
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import translation_sync as ts
+
+
+# 작업 프로세스마다 한 번 받아두는 기준 en.json 인덱스 {절대 경로: CompactJsonIndex}
+_reference_cache = {}
+# 부모 프로세스가 인덱싱할 때의 기준 en.json 파일 정보 (그 뒤 파일이 바뀌면 작업에서 다시 읽음)
+_reference_signatures = {}
+
+
+def load_batch_jobs(batch_path):
+    """작업 목록 파일을 읽어 [{'kr', 'en', 'tsv'}] 목록으로 변환 (경로는 절대 경로로)"""
+    with open(batch_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        data = {'jobs': data}
+
+    base_dir = os.path.dirname(os.path.abspath(batch_path))
+    default_en = data.get('en')
+    jobs = []
+    for i, entry in enumerate(data.get('jobs', []), 1):
+        en_path = entry.get('en', default_en)
+        if not entry.get('kr') or not entry.get('tsv') or not en_path:
+            raise ValueError(f"{i}번째 작업에 kr / en / tsv 경로가 모두 있어야 합니다: {entry}")
+        options = entry.get('options', {})
+        if not isinstance(options, dict):
+            raise ValueError(f"{i}번째 작업의 options 는 {{옵션 이름: 값}} 객체여야 합니다: {options}")
+        jobs.append({
+            'kr': os.path.join(base_dir, entry['kr']),
+            'en': os.path.join(base_dir, en_path),
+            'tsv': os.path.join(base_dir, entry['tsv']),
+            # 명령행 옵션과 같은 이름 (--keep-backups → keep_backups)
+            'options': {name.replace('-', '_'): value for name, value in options.items()},
+        })
+    return jobs
+
+
+def load_reference_files(jobs):
+    """작업들이 공유하는 기준 en.json 을 경로별로 한 번씩만 인덱싱"""
+    references = {}
+    for job in jobs:
+        en_path = job['en']
+        if en_path not in references:
+            if not os.path.exists(en_path):
+                raise ValueError(f"en.json 파일을 찾을 수 없습니다: {en_path}")
+            _reference_signatures[en_path] = ts.ParsedInputCache.signature(en_path)
+            index = ts.load_json_index(en_path)
+            if index is None:
+                raise ValueError(f"en.json 파일을 읽을 수 없습니다: {en_path}")
+            references[en_path] = index
+    return references
+
+
+def _init_worker(references, signatures):
+    _reference_cache.update(references)
+    _reference_signatures.update(signatures)
+
+
+class ReferenceCache(ts.ParsedInputCache):
+    """sync() 가 기준 en.json 을 읽을 때 미리 받아둔 압축 인덱스를 돌려주는 캐시
+
+    그 밖의 파일은 캐시하지 않고 매번 읽습니다 (작업마다 다른 파일이라 보관해도 다시 쓰이지 않음).
+    """
+
+    REFERENCE_KINDS = ('en', 'en_index')
+    keeps_written_tsv = False
+
+    def get(self, kind, path, loader):
+        if kind in self.REFERENCE_KINDS:
+            index = _reference_cache.get(path)
+            if index is not None and self.signature(path) == _reference_signatures.get(path):
+                self.hits += 1
+                return index
+        self.misses += 1
+        return loader(path)
+
+
+def run_sync_job(job, options=None):
+    """작업 하나를 sync() 로 실행 - 출력은 모아서 결과에 담아 반환 (프로세스끼리 출력이 섞이지 않도록)"""
+    started = time.perf_counter()
+    result = {
+        'kr': job['kr'], 'en': job['en'], 'tsv': job['tsv'],
+        'success': False, 'new': 0, 'updated': 0, 'deleted': 0,
+    }
+    job_options = dict(options or {}, **job.get('options', {}))
+    # 작업들이 이미 프로세스마다 나뉘어 실행되므로 작업 안에서 다시 프로세스 풀을 만들지 않음
+    job_options.pop('concurrent_load', None)
+    job_options['sequential_load'] = True
+    log = io.StringIO()
+    try:
+        with redirect_stdout(log):
+            sync_result = ts.sync(job['kr'], job['en'], job['tsv'], job_options, cache=ReferenceCache())
+        result.update(success=True, skipped=sync_result.skipped, new=len(sync_result.new_entries),
+                      updated=len(sync_result.updated_entries), deleted=len(sync_result.deleted_entries))
+        for name in ('delta_path', 'deleted_backup', 'deleted_file', 'manifest_path', 'validation_report'):
+            if getattr(sync_result, name):
+                result[name] = getattr(sync_result, name)
+        if sync_result.drifted_entries:
+            result['drifted'] = len(sync_result.drifted_entries)
+        if sync_result.validation_issues:
+            result['validation_issues'] = len(sync_result.validation_issues)
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    result['log'] = log.getvalue()
+    return result
+
+
+def run_batch(batch_path, workers=None, options=None):
+    """작업 목록 전체를 프로세스 풀에서 실행하고 통합 요약 파일을 저장 (요약 딕셔너리 반환)
+
+    options 는 모든 작업에 넘길 sync() 옵션이며, 작업별 "options" 가 같은 이름의 값을 덮어씁니다.
+    """
+    started = time.perf_counter()
+    jobs = load_batch_jobs(batch_path)
+    print(f"작업 {len(jobs)}개를 불러왔습니다.")
+
+    print("기준 en.json 인덱싱 중...")
+    references = load_reference_files(jobs)
+    print(f"   - 기준 파일 {len(references)}개 (작업 {len(jobs)}개가 공유)")
+
+    workers = workers or min(len(jobs), os.cpu_count() or 1) or 1
+    print(f"프로세스 {workers}개로 동기화를 시작합니다...")
+
+    results = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(references, dict(_reference_signatures))) as executor:
+        futures = {executor.submit(run_sync_job, job, options): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            i = futures[future]
+            result = future.result()
+            results[i] = result
+            status = ("변경 없음" if result.get('skipped') else "완료") if result['success'] \
+                else f"실패 ({result.get('error')})"
+            print(f"  [{i + 1}/{len(jobs)}] {os.path.basename(result['tsv'])}: {status}, {result['seconds']}초")
+
+    summary = {
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'batch': os.path.abspath(batch_path),
+        'workers': workers,
+        'seconds': round(time.perf_counter() - started, 3),
+        'succeeded': sum(1 for r in results if r['success']),
+        'failed': sum(1 for r in results if not r['success']),
+        'jobs': results,
+    }
+    summary_path = os.path.splitext(batch_path)[0] + f'_summary_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print("\n=== 일괄 동기화 완료 ===")
+    print(f"성공: {summary['succeeded']}, 실패: {summary['failed']}, 소요 시간: {summary['seconds']}초")
+    for r in results:
+        if not r['success']:
+            print(f"  - {os.path.basename(r['tsv'])}: 실패 ({r.get('error')})")
+            continue
+        print(f"  - {os.path.basename(r['tsv'])}: 새 항목 {r['new']}, 유지 {r['updated']}, 삭제 {r['deleted']}"
+              + (f", 검토 필요 {r['drifted']}" if r.get('drifted') else ""))
+    print(f"요약 파일: {summary_path}")
+    summary['path'] = summary_path
+    return summary
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - TSV → kr.json 만들기
+
+구글 스프레드시트의 자동입력 함수 컬럼을 복사하지 않고, TSV 를 한 행씩 읽어 바로 kr.json 을 만듭니다.
+- 번역 입력문 칸은 시트와 같은 규칙(\\n, \\", \\\\ 등)으로 이스케이프를 풀고 JSON 규칙으로 다시 기록하므로
+  칸에 따옴표가 그대로 들어 있어도 올바른 JSON 이 됩니다.
+- 알 수 없는 이스케이프(예: \\x, 끝에 남은 \\)가 있는 칸은 키와 함께 보고합니다.
+- 번역 입력문이 비어 있거나 번역 상태가 미번역인 항목은 원문(한글 원문 또는 원본 kr.json 값)을 씁니다.
+- 원본 kr.json 을 함께 주면 그 키 순서대로 쓰고, TSV 에 없는 키는 원문으로 채웁니다.
+"""
+
+import os
+import re
+from json.encoder import encode_basestring
+
+from translation_sync import iter_tsv_data_rows, load_json_file, parse_item_id, unescape_special_chars
+
+
+# 번역 입력문이 있어도 원문을 쓰는 번역 상태 (번역 메모리 제안처럼 검토 전인 값이 들어 있을 수 있음)
+FALLBACK_STATUSES = ('미번역',)
+
+_VALID_ESCAPE_RE = re.compile(r'\\[\\"nrt]')
+_ESCAPE_RE = re.compile(r'\\.?', re.S)
+
+
+def find_invalid_escape(cell):
+    """번역 입력문 칸에서 알 수 없는 이스케이프를 찾아 반환 (없으면 None)"""
+    if '\\' not in cell or '\\' not in _VALID_ESCAPE_RE.sub('', cell):
+        return None
+    for match in _ESCAPE_RE.finditer(cell):
+        if not _VALID_ESCAPE_RE.fullmatch(match.group()):
+            return match.group()
+    return None
+
+
+def iter_sheet_translations(tsv_path, report):
+    """TSV 에서 (키, 번역 또는 None, 한글 원문 칸) 을 순서대로 내보냄 (중복 키는 처음 것만)
+
+    번역이 None 이면 원문을 써야 하는 항목이며, 한글 원문 칸은 이스케이프를 풀기 전 값입니다.
+    """
+    seen = set()
+    duplicates = report['duplicates']
+    invalid = report['invalid']
+    unescape = unescape_special_chars
+    fallback = translated = 0
+    for row in iter_tsv_data_rows(tsv_path):
+        if len(row) < 5:
+            continue
+        key = row[0]
+        if key[:1] == '"' and key[-2:] == '":':
+            key = key[1:-2]  # 대부분의 행 ("키": 형태) 은 parse_item_id 를 거치지 않음
+        else:
+            key = parse_item_id(key)
+        if not key:
+            continue
+        if key in seen:
+            duplicates.append(key)
+            continue
+        seen.add(key)
+
+        cell = row[4]
+        if not cell.strip() or (len(row) > 6 and row[6].strip() in FALLBACK_STATUSES):
+            fallback += 1
+            yield key, None, row[1]
+            continue
+        if '\\' in cell:
+            escape = find_invalid_escape(cell)
+            if escape is not None:
+                invalid.append((key, escape))
+        translated += 1
+        yield key, unescape(cell), row[1]
+    report['fallback'] = fallback
+    report['translated'] = translated
+
+
+def _ordered_by_source(tsv_path, source, report):
+    """원본 kr.json 키 순서대로 (키, 쓸 문자열) 을 내보냄"""
+    translations = {key: text for key, text, _ in iter_sheet_translations(tsv_path, report)}
+    report['extra'] = len(translations.keys() - source.keys())
+    missing = 0
+    for key, value in source.items():
+        if key not in translations:
+            missing += 1
+            yield key, value
+            continue
+        text = translations[key]
+        yield key, value if text is None else text
+    report['missing'] = missing
+
+
+def build_kr_json(tsv_path, output_path, source_json_path=None, strict=False):
+    """TSV 로 kr.json 만들기 - 결과 요약 딕셔너리 반환
+
+    source_json_path(원본 kr.json)를 주면 그 키 순서와 값을 기준으로 하고, 아니면 TSV 행 순서와 한글 원문을 씁니다.
+    strict 이면 알 수 없는 이스케이프가 있을 때 파일을 쓰지 않습니다.
+    """
+    report = {
+        'output': output_path, 'total': 0, 'translated': 0, 'fallback': 0, 'missing': 0, 'extra': 0,
+        'invalid': [], 'duplicates': [], 'written': False,
+    }
+    if source_json_path:
+        source = load_json_file(source_json_path)
+        if source is None:
+            raise ValueError(f"원본 kr.json 파일을 읽을 수 없습니다: {source_json_path}")
+        entries = _ordered_by_source(tsv_path, source, report)
+    else:
+        entries = ((key, text if text is not None else unescape_special_chars(source_cell))
+                   for key, text, source_cell in iter_sheet_translations(tsv_path, report))
+
+    tmp_path = output_path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+            # 한 행씩 JSON 문자열로 바꿔 모았다가 한꺼번에 기록 (ensure_ascii=False 와 같은 C 구현 사용)
+            lines = [f'{encode_basestring(key)}: {encode_basestring(text)}' for key, text in entries]
+            report['total'] = len(lines)
+            f.write('{\n  ' + ',\n  '.join(lines) + '\n}\n' if lines else '{}\n')
+        if strict and report['invalid']:
+            os.remove(tmp_path)
+            return report
+        os.replace(tmp_path, output_path)
+        report['written'] = True
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return report
+
+
+def print_build_report(report, limit=10):
+    print("\n=== kr.json 만들기 완료 ===" if report['written'] else "\n=== kr.json 을 만들지 않았습니다 ===")
+    print(f"총 항목 수: {report['total']}")
+    print(f"번역 입력문 사용: {report['translated']}")
+    print(f"원문 사용 (미번역/빈 번역): {report['fallback'] + report['missing']}")
+    if report['missing']:
+        print(f"  - TSV 에 없어 원본 kr.json 값을 쓴 키: {report['missing']}개")
+    if report['extra']:
+        print(f"원본 kr.json 에 없어 제외한 TSV 키: {report['extra']}개")
+    if report['duplicates']:
+        print(f"\n주의: TSV 에 중복된 키 {len(report['duplicates'])}개 (처음 행만 사용)")
+        for key in report['duplicates'][:limit]:
+            print(f"  - {key}")
+    if report['invalid']:
+        print(f"\n주의: 알 수 없는 이스케이프가 있는 번역 입력문 {len(report['invalid'])}개 (글자 그대로 기록됨)")
+        for key, escape in report['invalid'][:limit]:
+            print(f"  - {key}: {escape}")
+        if len(report['invalid']) > limit:
+            print(f"  ... 및 {len(report['invalid']) - limit}개 더")
+    if report['written']:
+        print(f"\nkr.json 파일: {report['output']}")
+
+
+def default_output_path(tsv_path):
+    """TSV 와 같은 폴더의 <TSV 이름>_kr.json"""
+    return os.path.splitext(tsv_path)[0] + '_kr.json'
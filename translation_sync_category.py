@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 새 항목 카테고리 자동 지정
+
+타르코프 키는 "<24자리 hex ID> Name/ShortName/Description", 퀘스트/상인 ID 뒤의 필드 이름,
+"Interface/..." 같은 경로형 접두어처럼 모양이 정해져 있어, 기존 TSV 에서 카테고리를 채운 행만으로도
+새 키의 카테고리를 대부분 맞힐 수 있습니다.
+
+동기화 시작 때 한 번 기존 행으로 다음 세 가지를 만들고, TSV 를 쓰는 동안 새 키마다 조회합니다.
+- ID 색인: hex ID → 카테고리 (같은 아이템/퀘스트의 다른 필드가 새로 생긴 경우)
+- 접두어 트라이: 키를 토큰(공백, /, ., _, : 로 구분)으로 나눈 앞쪽부터의 경로
+- 접미어 트라이: 뒤쪽부터의 경로 (hex ID 는 <id>, 숫자는 <n> 으로 바꿔 같은 모양끼리 모음)
+트라이는 다 만든 뒤 노드마다 (가장 많은 카테고리, 그 비율, 행 수) 만 남기고 행 수가 적은 노드는 잘라내므로,
+키 하나를 분류하는 데는 토큰 수만큼의 딕셔너리 조회만 듭니다.
+
+신뢰도는 그 노드(또는 ID)에 속한 기존 행 중 가장 많은 카테고리의 비율이며,
+최소 신뢰도와 최소 행 수를 넘는 것 중 신뢰도가 가장 높은(같으면 더 깊은) 결과를 씁니다.
+"""
+
+import re
+from collections import Counter
+
+
+DEFAULT_MIN_CONFIDENCE = 0.8
+# 트라이 노드를 믿기 위한 최소 기존 행 수 (ID 색인은 같은 아이템이므로 1행이어도 사용)
+MIN_SUPPORT = 3
+
+_TOKEN_RE = re.compile(r'[^\s/._:]+')
+# 구분 문자 사이의 토큰 전체가 hex ID / 숫자인 경우만 (토큰별 확인 없이 치환 두 번으로 모양을 만듦)
+_HEX_ID_RE = re.compile(r'(?<![^\s/._:])[0-9a-fA-F]{24}(?![^\s/._:])')
+_NUMBER_RE = re.compile(r'(?<![^\s/._:])[0-9]+(?![^\s/._:])')
+# 대부분의 키 ("<hex ID> 필드 이름") 는 정규식 한 번으로 토큰을 얻음
+_ITEM_KEY_RE = re.compile(r'([0-9a-fA-F]{24}) ([^\s/._:]+)\Z')
+ID_TOKEN = '<id>'
+NUMBER_TOKEN = '<n>'
+
+
+def key_tokens(key):
+    """키 → 모양 토큰 튜플과 첫 hex ID (없으면 None)"""
+    match = _ITEM_KEY_RE.match(key)
+    if match is not None:
+        field = match.group(2)
+        if len(field) != 24 and not field.isdigit():
+            return (ID_TOKEN, field), match.group(1).lower()
+    item_id = None
+    match = _HEX_ID_RE.search(key)
+    if match is not None:
+        item_id = match.group().lower()
+        key = _HEX_ID_RE.sub(ID_TOKEN, key)
+    key = _NUMBER_RE.sub(NUMBER_TOKEN, key)
+    return tuple(_TOKEN_RE.findall(key)), item_id
+
+
+class CategoryGuess:
+    """카테고리 추정 하나"""
+
+    __slots__ = ('category', 'confidence', 'support', 'source')
+
+    def __init__(self, category, confidence, support, source):
+        self.category = category
+        self.confidence = confidence
+        self.support = support  # 근거가 된 기존 행 수 (ID 색인이면 None)
+        self.source = source    # 'id', 'prefix', 'suffix'
+
+    def note(self):
+        """TSV 비고에 덧붙일 설명"""
+        return f'카테고리 자동 지정 {self.confidence:.0%}'
+
+    def __repr__(self):
+        return f"CategoryGuess({self.category!r}, {self.confidence:.3f}, {self.support}, {self.source!r})"
+
+
+def _insert(root, tokens, category, count):
+    node = root
+    for token in tokens:
+        child = node[0].get(token)
+        if child is None:
+            child = node[0][token] = ({}, Counter())
+        child[1][category] += count
+        node = child
+
+
+def _compile(node, min_support):
+    """({토큰: 자식}, Counter) 트라이 → ({토큰: 자식}, 카테고리, 신뢰도, 행 수) - 행 수가 적은 가지는 버림"""
+    children = {}
+    for token, child in node[0].items():
+        if sum(child[1].values()) >= min_support:
+            children[token] = _compile(child, min_support)
+    counts = node[1]
+    total = sum(counts.values())
+    if not total:
+        return children, None, 0.0, 0
+    category, count = counts.most_common(1)[0]
+    return children, category, count / total, total
+
+
+class CategoryClassifier:
+    """기존 TSV 의 카테고리로 만든 ID 색인 + 접두어/접미어 트라이"""
+
+    def __init__(self, min_confidence=DEFAULT_MIN_CONFIDENCE, min_support=MIN_SUPPORT):
+        self.min_confidence = min_confidence
+        self.min_support = min_support
+        self.trained = 0        # 학습에 쓴 행 수 (카테고리가 있는 행)
+        self.categories = Counter()
+        self._ids = {}
+        self._prefix = ({}, None, 0.0, 0)
+        self._suffix = ({}, None, 0.0, 0)
+        # 분류 통계 (coverage_report 참고)
+        self.attempted = 0
+        self.assigned = Counter()   # 출처별 지정 수
+        self.confidence_sum = 0.0
+        self.low_confidence = 0     # 후보는 있었지만 최소 신뢰도에 못 미친 키 수
+
+    @classmethod
+    def from_translations(cls, existing_translations, min_confidence=DEFAULT_MIN_CONFIDENCE,
+                          min_support=MIN_SUPPORT):
+        """{키: TranslationRow} 로 분류기 만들기"""
+        classifier = cls(min_confidence, min_support)
+        # 키 모양은 수백 가지뿐이므로 (모양, 카테고리) 별로 센 뒤 모양마다 한 번씩 트라이에 넣음
+        shapes = Counter()
+        id_categories = {}  # ID → 카테고리 (한 ID 의 행들은 대부분 같은 카테고리)
+        mixed = set()       # 카테고리가 여러 개인 ID - 나중에 다시 셈
+        for key, trans_data in existing_translations.items():
+            category = trans_data['카테고리'].strip()
+            if not category:
+                continue
+            tokens, item_id = key_tokens(key)
+            shapes[(tokens, category)] += 1
+            if item_id is not None and id_categories.setdefault(item_id, category) != category:
+                mixed.add(item_id)
+        prefix = ({}, Counter())
+        suffix = ({}, Counter())
+        for (tokens, category), count in shapes.items():
+            _insert(prefix, tokens, category, count)
+            _insert(suffix, tokens[::-1], category, count)
+            classifier.categories[category] += count
+        classifier.trained = sum(classifier.categories.values())
+        classifier._ids = {item_id: (category, 1.0) for item_id, category in id_categories.items()}
+        if mixed:
+            counts = {item_id: Counter() for item_id in mixed}
+            for key, trans_data in existing_translations.items():
+                category = trans_data['카테고리'].strip()
+                if category:
+                    item_id = key_tokens(key)[1]
+                    if item_id in counts:
+                        counts[item_id][category] += 1
+            for item_id, item_counts in counts.items():
+                category, count = item_counts.most_common(1)[0]
+                classifier._ids[item_id] = (category, count / sum(item_counts.values()))
+        classifier._prefix = _compile(prefix, min_support)
+        classifier._suffix = _compile(suffix, min_support)
+        return classifier
+
+    def __len__(self):
+        return self.trained
+
+    @staticmethod
+    def _walk(root, tokens):
+        """트라이를 따라 내려가며 (깊이, 노드) 를 내보냄 (루트 제외)"""
+        node = root
+        for depth, token in enumerate(tokens, 1):
+            node = node[0].get(token)
+            if node is None:
+                return
+            yield depth, node
+
+    def guess(self, key):
+        """키의 카테고리 추정 (CategoryGuess) - 최소 신뢰도를 넘는 후보가 없으면 None"""
+        tokens, item_id = key_tokens(key)
+        best = None
+        best_rank = None
+        candidates = False
+        if item_id is not None:
+            entry = self._ids.get(item_id)
+            if entry is not None:
+                candidates = True
+                if entry[1] >= self.min_confidence:
+                    # 같은 아이템의 다른 필드가 가장 직접적인 근거이므로 깊이를 가장 크게 둠
+                    best = CategoryGuess(entry[0], entry[1], None, 'id')
+                    best_rank = (entry[1], len(tokens) + 1)
+        for source, root, path in (('prefix', self._prefix, tokens), ('suffix', self._suffix, tokens[::-1])):
+            for depth, (_, category, confidence, support) in self._walk(root, path):
+                candidates = True
+                if confidence < self.min_confidence:
+                    continue
+                rank = (confidence, depth)
+                if best_rank is None or rank > best_rank:
+                    best = CategoryGuess(category, confidence, support, source)
+                    best_rank = rank
+        if best is None and candidates:
+            self.low_confidence += 1
+        return best
+
+    def classify(self, key):
+        """iter_updated_rows 의 classify 함수 - 새 키마다 호출되며 통계를 모음"""
+        self.attempted += 1
+        guess = self.guess(key)
+        if guess is not None:
+            self.assigned[guess.source] += 1
+            self.confidence_sum += guess.confidence
+        return guess
+
+    def coverage_report(self):
+        """분류 통계 딕셔너리 (범위 = 카테고리를 지정한 새 키 비율, 신뢰도 = 지정한 키의 평균 신뢰도)"""
+        assigned = sum(self.assigned.values())
+        return {
+            'trained': self.trained,
+            'categories': len(self.categories),
+            'attempted': self.attempted,
+            'assigned': assigned,
+            'coverage': assigned / self.attempted if self.attempted else 0.0,
+            'mean_confidence': self.confidence_sum / assigned if assigned else 0.0,
+            'by_source': dict(self.assigned),
+            'low_confidence': self.low_confidence,
+        }
+
+
+def print_category_summary(report):
+    if not report['attempted']:
+        return
+    sources = ', '.join(f"{name} {count}" for name, count in
+                        (('ID', report['by_source'].get('id', 0)),
+                         ('접두어', report['by_source'].get('prefix', 0)),
+                         ('접미어', report['by_source'].get('suffix', 0))) if count)
+    print(f"카테고리 자동 지정: 새 항목 {report['attempted']}개 중 {report['assigned']}개 "
+          f"(범위 {report['coverage']:.0%}, 평균 신뢰도 {report['mean_confidence']:.0%}"
+          + (f", {sources}" if sources else "") + ")")
+    if report['low_confidence']:
+        print(f"  - 신뢰도가 낮아 비워 둔 항목: {report['low_confidence']}개")
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 변경분(델타) 출력
+
+TSV 전체를 다시 쓰는 대신, 기존 시트를 새 kr.json 순서로 바꾸는 데 필요한 작업만
+순서대로 기록합니다. 구글 스프레드시트에는 바뀐 행만 붙여넣거나 적용하면 됩니다.
+
+작업은 기록된 순서대로 적용해야 하며, 행 번호는 그 작업 직전 시트 기준(1부터, 헤더 포함)입니다.
+  1. delete : 제거된 키의 행 삭제 (아래쪽 행부터)
+  2. move   : 순서가 바뀐 키의 from 행을 잘라낸 뒤, 잘라낸 상태 기준 row 위치에 삽입
+  3. insert : 새 키의 행을 row 위치에 삽입 (cells 에 행 전체)
+  4. update : 기존 행의 바뀐 칸만 갱신 (cells 에 {열 문자: 값})
+
+기존 TSV 에 빈 행이 섞여 있으면 행 번호가 어긋나므로, 빈 행이 없는 시트에서 내보낸 TSV 를 사용하세요.
+
+삭제/이동/삽입 행이 새 시트 행 수의 MAX_STRUCTURAL_RATIO 를 넘으면 작업을 하나씩 적용하는 것이
+가져오기보다 느리므로 DeltaTooLargeError 를 발생시키고, 동기화는 TSV 전체를 다시 씁니다.
+"""
+
+import csv
+import json
+import os
+from datetime import datetime
+
+from translation_sync import DEFAULT_FORMULA_MODE, build_tsv_row, clean_plain_tsv_field, iter_updated_rows, load_tsv_file
+from translation_sync_manifest import find_moved_keys
+
+
+DELTA_VERSION = 1
+DELTA_FORMATS = ('jsonl', 'tsv')
+# 행 구조를 바꾸는 작업(삭제/이동/삽입)이 새 행 수의 이 비율을 넘으면 변경분 대신 전체 TSV
+MAX_STRUCTURAL_RATIO = 0.25
+
+# 시트 열 문자 (원문 ID ~ 영문 아이템 ID)
+COLUMN_LETTERS = 'ABCDEFGHIJ'
+
+# TSV 형식 델타의 앞쪽 컬럼 (뒤에 시트의 10개 컬럼이 이어짐)
+DELTA_TSV_HEADER = ['작업', '행', '원래 행', '키', '변경 열']
+
+
+class DeltaTooLargeError(ValueError):
+    """변경분이 너무 커서 TSV 전체를 다시 쓰는 편이 나은 경우"""
+
+
+def delta_path_for(tsv_path, delta_format='jsonl'):
+    """TSV 파일에 대응하는 델타 파일 경로"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{os.path.splitext(tsv_path)[0]}_delta_{timestamp}.{delta_format}"
+
+
+def existing_row_cells(key, trans_data, formula_mode=DEFAULT_FORMULA_MODE):
+    """기존 TSV 행을 다시 기록했을 때의 칸 값 (영문 원문/영문 아이템 ID 도 기존 값 그대로)
+
+    번역문 칸은 시트가 이미 formula_mode 방식으로 되어 있다고 보고 만듭니다.
+    """
+    row = build_tsv_row(key, None, trans_data['영문_원문'], trans_data, formula_mode=formula_mode)
+    row[2] = trans_data['번역문_ID']
+    row[9] = clean_plain_tsv_field(trans_data['영문_아이템_ID'])
+    return row
+
+
+def changed_cells(old_row, new_row):
+    """두 행에서 값이 다른 칸 {열 문자: 새 값}"""
+    return {COLUMN_LETTERS[i]: new for i, (old, new) in enumerate(zip(old_row, new_row)) if old != new}
+
+
+class SheetDelta:
+    """기존 시트 → 새 시트 변경 작업 목록"""
+
+    def __init__(self, header_count):
+        self.header_count = header_count
+        self.operations = []
+
+    def sheet_row(self, index):
+        """데이터 행 인덱스(0부터) → 시트 행 번호(1부터, 헤더 포함)"""
+        return self.header_count + index + 1
+
+    def add(self, op, key, index, **fields):
+        entry = {'op': op, 'row': self.sheet_row(index), 'key': key}
+        entry.update(fields)
+        self.operations.append(entry)
+
+    def count(self, op):
+        return sum(1 for entry in self.operations if entry['op'] == op)
+
+
+class _PositionTree:
+    """자리(slot)마다 0/1 을 두고 앞쪽 합(= 현재 시트에서 그 자리 앞의 행 수)을 O(log n) 에 구하는 펜윅 트리"""
+
+    def __init__(self, size):
+        self.tree = [0] * (size + 1)
+
+    def add(self, slot, amount):
+        tree = self.tree
+        slot += 1
+        while slot < len(tree):
+            tree[slot] += amount
+            slot += slot & -slot
+
+    def before(self, slot):
+        """slot 보다 앞에 있는 행 수"""
+        tree = self.tree
+        total = 0
+        while slot > 0:
+            total += tree[slot]
+            slot -= slot & -slot
+        return total
+
+
+def plan_moves(sheet, common_keys, moved):
+    """이동 작업 [(키, 옮기기 전 위치, 옮긴 뒤 위치)] (위치는 삭제를 마친 시트 기준 0부터)
+
+    이동할 키는 최종 순서상 바로 앞 키 바로 뒤로 옮기므로, 제자리 키(LIS) 하나 뒤에는
+    최종 순서에서 그 키와 다음 제자리 키 사이에 있는 이동 키들이 차례로 붙습니다.
+    그래서 모든 행의 자리 순서를 미리 정할 수 있고 (제자리 키 j 의 원래 자리, 그 뒤에 붙을 이동 키들의 자리, ...),
+    시트에 있는 자리만 1 로 둔 펜윅 트리로 각 이동 시점의 행 번호를 구합니다. O(n log n)
+    """
+    old_index = {key: i for i, key in enumerate(sheet)}
+    # 맨 앞(제자리 키보다 앞)에 붙는 이동 키들이 -1 번 앞에 오도록 자리 0 을 비워 둠
+    runs = {-1: []}
+    anchor = -1
+    for key in common_keys:
+        if key in moved:
+            runs.setdefault(anchor, []).append(key)
+        else:
+            anchor = old_index[key]
+    slot_of = {}        # 원래 행의 자리
+    target_slot = {}    # 이동 키가 들어갈 자리
+    slot = 0
+    for key in runs[-1]:
+        target_slot[key] = slot
+        slot += 1
+    for index, key in enumerate(sheet):
+        slot_of[key] = slot
+        slot += 1
+        for moved_key in runs.get(index, ()):
+            target_slot[moved_key] = slot
+            slot += 1
+
+    tree = _PositionTree(slot)
+    for key in sheet:
+        tree.add(slot_of[key], 1)
+    moves = []
+    for key in common_keys:
+        if key not in moved:
+            continue
+        from_slot = slot_of[key]
+        from_index = tree.before(from_slot)
+        tree.add(from_slot, -1)
+        to_index = tree.before(target_slot[key])
+        tree.add(target_slot[key], 1)
+        moves.append((key, from_index, to_index))
+    return moves
+
+
+def compute_sheet_delta(json_data, en_json_data, existing_translations, header_count, suggest=None,
+                        carried=None, review=None, formula_mode=DEFAULT_FORMULA_MODE, classify=None,
+                        max_structural_ratio=MAX_STRUCTURAL_RATIO):
+    """기존 시트를 새 kr.json 순서의 시트로 바꾸는 작업 목록과 (새 항목, 기존 항목, 삭제 항목) 계산
+
+    json_data 가 딕셔너리면 행을 만들기 전에 키만으로 삭제/이동/삽입 수를 세어,
+    새 행 수의 max_structural_ratio 를 넘으면 DeltaTooLargeError 를 발생시킵니다 (스트리밍 입력은 확인하지 않음).
+    """
+    delta = SheetDelta(header_count)
+    old_keys = list(existing_translations.keys())
+    json_items = json_data.items() if isinstance(json_data, dict) else json_data
+
+    moved = None
+    if isinstance(json_data, dict) and max_structural_ratio is not None:
+        new_key_set = json_data.keys()
+        sheet = [key for key in old_keys if key in new_key_set]
+        common_keys = [key for key in json_data if key in existing_translations]
+        moved = set(find_moved_keys(sheet, common_keys))
+        structural = (len(old_keys) - len(sheet)) + len(moved) + (len(json_data) - len(common_keys))
+        if structural > max_structural_ratio * max(len(json_data), 1):
+            raise DeltaTooLargeError(
+                f"삭제/이동/삽입할 행이 {structural}개로 전체 {len(json_data)}행의 "
+                f"{max_structural_ratio:.0%} 를 넘습니다"
+            )
+
+    new_keys = []
+    new_rows = {}
+    new_entries = []
+    updated_entries = []
+    rows = iter_updated_rows(json_items, en_json_data, existing_translations, new_entries, updated_entries,
+                             suggest, carried, review, formula_mode, classify)
+    for key, value, row in rows:
+        new_rows[key] = row
+        new_keys.append(key)
+
+    # 1. 삭제 (아래쪽 행부터 지워야 위쪽 행 번호가 그대로 유지됨)
+    new_key_set = set(new_keys)
+    sheet = []
+    deleted = []
+    for index, key in enumerate(old_keys):
+        if key in new_key_set:
+            sheet.append(key)
+        else:
+            deleted.append((index, key))
+    for index, key in reversed(deleted):
+        delta.add('delete', key, index)
+    deleted_entries = [key for _, key in deleted]
+
+    # 2. 이동: 상대 순서가 유지된 가장 긴 키 열은 그대로 두고, 나머지 키만 앞 키 바로 뒤로 옮김
+    #    각 키를 최종 순서상 바로 앞 키 뒤에 붙이므로 모든 이동이 끝나면 최종 순서와 같아짐
+    common_keys = [key for key in new_keys if key in existing_translations]
+    if moved is None:
+        moved = set(find_moved_keys(sheet, common_keys))
+    for key, from_index, to_index in plan_moves(sheet, common_keys, moved):
+        if from_index != to_index:
+            delta.add('move', key, to_index, **{'from': delta.sheet_row(from_index)})
+
+    # 3. 삽입: 위에서부터 최종 위치에 넣으면 앞쪽 행은 이미 최종 상태
+    for index, key in enumerate(new_keys):
+        if key not in existing_translations:
+            delta.add('insert', key, index, cells=new_rows[key])
+
+    # 4. 칸 갱신 (최종 시트 기준 행 번호)
+    for index, key in enumerate(new_keys):
+        trans_data = existing_translations.get(key)
+        if trans_data is None:
+            continue
+        cells = changed_cells(existing_row_cells(key, trans_data, formula_mode), new_rows[key])
+        if cells:
+            delta.add('update', key, index, cells=cells)
+
+    return delta, new_entries, updated_entries, deleted_entries
+
+
+def write_delta_jsonl(delta, output_path, source_path):
+    """델타를 JSONL 로 저장 (첫 줄은 헤더, 이후 한 줄에 작업 하나)"""
+    header = {
+        'version': DELTA_VERSION,
+        'source': os.path.basename(source_path),
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'header_rows': delta.header_count,
+        'operations': len(delta.operations),
+    }
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(header, ensure_ascii=False) + '\n')
+        for entry in delta.operations:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def write_delta_tsv(delta, output_path):
+    """델타를 TSV 로 저장 (작업/행/원래 행/키/변경 열 + 시트 10개 컬럼)"""
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(DELTA_TSV_HEADER + list(COLUMN_LETTERS))
+        for entry in delta.operations:
+            cells = [''] * len(COLUMN_LETTERS)
+            changed = ''
+            if entry['op'] == 'insert':
+                cells = list(entry['cells'])
+                changed = COLUMN_LETTERS
+            elif entry['op'] == 'update':
+                for letter, value in entry['cells'].items():
+                    cells[COLUMN_LETTERS.index(letter)] = value
+                changed = ','.join(entry['cells'])
+            writer.writerow([entry['op'], entry['row'], entry.get('from', ''), entry['key'], changed] + cells)
+
+
+def create_tsv_delta(json_data, en_json_data, existing_translations, header_rows, tsv_path,
+                     output_path, delta_format='jsonl', suggest=None, carried=None, review=None,
+                     formula_mode=DEFAULT_FORMULA_MODE, classify=None):
+    """TSV 를 다시 쓰지 않고 변경분만 델타 파일로 저장
+
+    create_updated_tsv 와 같은 (새 항목, 기존 항목, 삭제 항목) 목록을 반환합니다.
+    """
+    try:
+        delta, new_entries, updated_entries, deleted_entries = compute_sheet_delta(
+            json_data, en_json_data, existing_translations, len(header_rows), suggest, carried, review, formula_mode,
+            classify
+        )
+        if delta_format == 'tsv':
+            write_delta_tsv(delta, output_path)
+        else:
+            write_delta_jsonl(delta, output_path, tsv_path)
+
+        print(f"변경분을 저장했습니다: {output_path}")
+        print(f"  - 삭제 {delta.count('delete')}행, 이동 {delta.count('move')}행, "
+              f"삽입 {delta.count('insert')}행, 칸 갱신 {delta.count('update')}행")
+        return new_entries, updated_entries, deleted_entries
+
+    except DeltaTooLargeError:
+        raise
+    except Exception as e:
+        print(f"변경분 파일 생성 오류: {e}")
+        return [], [], []
+
+
+def apply_delta_jsonl(tsv_path, delta_path, output_path):
+    """JSONL 델타를 로컬 TSV 에 적용 (스프레드시트에 적용하기 전 확인용)"""
+    translations, header_rows = load_tsv_file(tsv_path)
+    sheet = header_rows + [existing_row_cells(key, trans_data) for key, trans_data in translations.items()]
+
+    with open(delta_path, 'r', encoding='utf-8') as f:
+        f.readline()  # 헤더
+        for line in f:
+            entry = json.loads(line)
+            index = entry['row'] - 1
+            op = entry['op']
+            if op == 'delete':
+                del sheet[index]
+            elif op == 'move':
+                row = sheet.pop(entry['from'] - 1)
+                sheet.insert(index, row)
+            elif op == 'insert':
+                sheet.insert(index, list(entry['cells']))
+            elif op == 'update':
+                row = sheet[index]
+                for letter, value in entry['cells'].items():
+                    row[COLUMN_LETTERS.index(letter)] = value
+
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
+        writer.writerows(sheet)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 원문 변경 감지
+
+TSV 를 쓸 때마다 키별로 kr/en 원문의 8바이트 지문을 TSV 옆 파일에 저장해두고,
+다음 동기화 때 키마다 한 번의 딕셔너리 조회로 원문이 바뀌었는지 확인합니다.
+원문이 바뀐 기존 항목 중 번역된 행은 번역 상태를 검토 필요로 바꾸고 비고에 날짜와 새 원문 첫 줄 일부를 남기며,
+아직 미번역인 행은 표시하지 않고 한글 원문/번역 입력문을 새 원문으로 바꿉니다.
+
+지문 파일이 없거나 키가 없으면(처음 실행, 새로 생긴 키) TSV 행의 한글 원문/영문 원문으로 지문을 만들어 비교합니다.
+지문 파일에 새 원문이 이미 기록되어 있으면, 시트에서 원문 칸만 다르게 보이는 경우(직접 편집, 내보내기 차이)로 보고 표시하지 않습니다.
+"""
+
+import base64
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from translation_sync import REVIEW_STATUS, UNTRANSLATED_STATUSES, TranslationRow, clean_tsv_field
+
+
+FINGERPRINT_VERSION = 1
+FINGERPRINT_SUFFIX = '.source_fingerprints.json'
+DIGEST_SIZE = 8
+# 비고에 남기는 원문 변경 표시 (이미 있으면 다시 붙이지 않음)
+DRIFT_NOTE_PREFIX = '원문 변경 ('
+EXCERPT_LENGTH = 30
+
+
+def fingerprint_path_for(tsv_path):
+    """TSV 파일에 대응하는 원문 지문 파일 경로"""
+    return os.path.splitext(tsv_path)[0] + FINGERPRINT_SUFFIX
+
+
+def source_fingerprint(kr_value, en_value):
+    """kr/en 원문의 8바이트 지문 (TSV 칸에 기록되는 형태 기준이라 TSV 를 다시 읽어도 같은 값)"""
+    h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    h.update(clean_tsv_field(kr_value).strip().encode('utf-8'))
+    h.update(b'\0')
+    h.update(clean_tsv_field(en_value).strip().encode('utf-8'))
+    return h.digest()
+
+
+def source_excerpt(text, length=EXCERPT_LENGTH):
+    """원문의 첫 줄을 공백 정리 후 length 글자까지 (비고에 여러 줄 설명 전체가 들어가지 않도록)"""
+    text = str(text or '')
+    first_line = text.split('\n', 1)[0]
+    excerpt = ' '.join(first_line.split())
+    if len(excerpt) > length or first_line != text:
+        excerpt = excerpt[:length].rstrip() + '…'
+    return excerpt
+
+
+def load_fingerprints(path):
+    """지문 파일 로드 → {키: 지문} (없거나 읽을 수 없으면 빈 딕셔너리)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != FINGERPRINT_VERSION:
+            return {}
+        keys = data['keys']
+        raw = base64.b64decode(data['digests'])
+    except (OSError, ValueError, KeyError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"원문 지문 파일 로드 오류 (TSV 의 원문과 비교합니다): {e}")
+        return {}
+    return {key: raw[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE] for i, key in enumerate(keys)}
+
+
+def save_fingerprints(path, fingerprints):
+    """{키: 지문} 저장"""
+    data = {
+        'version': FINGERPRINT_VERSION,
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'count': len(fingerprints),
+        'keys': list(fingerprints),
+        'digests': base64.b64encode(b''.join(fingerprints.values())).decode('ascii'),
+    }
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class SourceDriftChecker:
+    """create_updated_tsv 의 review 로 넘겨 행마다 원문 변경을 확인
+
+    check() 는 원문이 바뀐 기존 항목이면 기록할 TranslationRow (번역된 행은 검토 필요로 표시,
+    미번역 행은 원문만 새로 고침) 를, 아니면 None 을 반환하고,
+    모든 키의 새 지문을 모아 두었다가 save() 로 저장합니다.
+    """
+
+    def __init__(self, previous):
+        self.previous = previous
+        self.fingerprints = {}
+        self.drifted = []       # 검토 필요로 표시한 키 (번역된 행)
+        self.refreshed = []     # 원문만 새로 고친 미번역 키
+        self.today = datetime.now().strftime("%Y-%m-%d")
+
+    def check(self, key, value, en_value, trans_data):
+        fingerprint = source_fingerprint(value, en_value)
+        self.fingerprints[key] = fingerprint
+        if trans_data is None or self.previous.get(key) == fingerprint:
+            return None
+        if source_fingerprint(trans_data['한글_원문'], trans_data['영문_원문']) == fingerprint:
+            return None
+        if trans_data['번역_상태'].strip() in UNTRANSLATED_STATUSES:
+            # 번역 전인 행은 검토할 번역이 없으므로 새 항목처럼 번역 입력문도 새 원문으로
+            # (이전 원문이 남으면 build 가 그대로 내보내고, 작업 목록/번역 메모리 제안도 이전 원문 기준이 됨)
+            self.refreshed.append(key)
+            return TranslationRow(
+                value, trans_data['번역문_ID'], trans_data['번역문'], value,
+                trans_data['카테고리'], trans_data['번역_상태'], trans_data['비고'], en_value,
+                trans_data['영문_아이템_ID']
+            )
+
+        note = trans_data['비고']
+        if DRIFT_NOTE_PREFIX not in note:
+            # 이전 원문은 시트의 수정 기록에 있으므로 새 원문의 첫 줄 일부만 남김
+            changes = []
+            if clean_tsv_field(trans_data['한글_원문']).strip() != clean_tsv_field(value).strip():
+                changes.append(f"한글 → {source_excerpt(value)}")
+            if clean_tsv_field(trans_data['영문_원문']).strip() != clean_tsv_field(en_value).strip():
+                changes.append(f"영문 → {source_excerpt(en_value)}")
+            marker = f"{DRIFT_NOTE_PREFIX}{self.today}) " + ' / '.join(changes)
+            note = f"{marker} | {note}" if note else marker
+        self.drifted.append(key)
+        return TranslationRow(
+            value, trans_data['번역문_ID'], trans_data['번역문'], trans_data['번역_입력문'],
+            trans_data['카테고리'], REVIEW_STATUS, note, en_value, trans_data['영문_아이템_ID']
+        )
+
+    def keep(self, keys, json_data, en_json_data):
+        """행을 다시 만들지 않고 복사한 키의 지문도 저장되도록 추가 (원문이 그대로이므로 이전 지문 사용)"""
+        for key in keys:
+            fingerprint = self.previous.get(key)
+            if fingerprint is None:
+                en_value = en_json_data.get(key, '') if en_json_data else ''
+                fingerprint = source_fingerprint(json_data[key], en_value)
+            self.fingerprints[key] = fingerprint
+
+    def save(self, path):
+        save_fingerprints(path, self.fingerprints)
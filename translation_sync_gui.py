@@ -6,12 +6,48 @@
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
+import io
 import os
-import sys
+import queue
 import threading
+import time
 import subprocess
+from contextlib import redirect_stdout, redirect_stderr
 from datetime import datetime
 
+import translation_sync
+from translation_sync_profile import STAGE_LABELS
+
+
+# 작업 스레드 이벤트 큐를 확인하는 간격(ms)과 한 번에 처리할 최대 이벤트 수
+QUEUE_POLL_MS = 100
+QUEUE_BATCH_SIZE = 1000
+
+
+class QueueWriter(io.TextIOBase):
+    """print 출력을 줄 단위로 이벤트 큐에 넣는 스트림 (작업 스레드에서 사용)"""
+    
+    def __init__(self, events, prefix=""):
+        self.events = events
+        self.prefix = prefix
+        self.buffer = ""
+        
+    def writable(self):
+        return True
+        
+    def write(self, text):
+        self.buffer += text
+        *lines, self.buffer = self.buffer.split('\n')
+        for line in lines:
+            if line.strip():
+                self.events.put(('log', self.prefix + line, datetime.now().strftime('%H:%M:%S')))
+        return len(text)
+        
+    def flush(self):
+        if self.buffer.strip():
+            self.events.put(('log', self.prefix + self.buffer, datetime.now().strftime('%H:%M:%S')))
+        self.buffer = ""
+
 
 class TranslationSyncGUI:
     def __init__(self, root):
@@ -23,6 +59,15 @@ class TranslationSyncGUI:
         self.json_path = tk.StringVar()
         self.en_json_path = tk.StringVar()
         self.tsv_path = tk.StringVar()
+        self.profile_enabled = tk.BooleanVar(value=False)
+        
+        # 작업 스레드 → 화면 이벤트 큐
+        self.events = queue.Queue()
+        self.running = False
+        self.stage_started = {}
+        
+        # 창을 닫을 때까지 유지하는 입력 파일 파싱 캐시
+        self.input_cache = translation_sync.ParsedInputCache()
         
         self.create_widgets()
         
@@ -52,11 +97,12 @@ class TranslationSyncGUI:
         ttk.Button(main_frame, text="찾기", command=self.select_tsv_file).grid(row=3, column=2, pady=5)
         
         # 실행 버튼
-        run_button = ttk.Button(main_frame, text="동기화 실행", command=self.run_sync)
-        run_button.grid(row=4, column=0, columnspan=3, pady=20)
+        self.run_button = ttk.Button(main_frame, text="동기화 실행", command=self.run_sync)
+        self.run_button.grid(row=4, column=0, columnspan=2, pady=20)
+        ttk.Checkbutton(main_frame, text="단계별 성능 측정", variable=self.profile_enabled).grid(row=4, column=2, pady=20)
         
         # 진행 상태 표시
-        self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
+        self.progress = ttk.Progressbar(main_frame, mode='determinate', maximum=100)
         self.progress.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
         
         # 상태 레이블
@@ -124,13 +170,15 @@ class TranslationSyncGUI:
             self.tsv_path.set(filename)
             
     def log_message(self, message):
-        """로그 영역에 메시지 추가"""
+        """로그 영역에 메시지 추가 (메인 스레드에서만 호출)"""
         self.log_text.insert(tk.END, f"[{datetime.now().strftime('%H:%M:%S')}] {message}\n")
         self.log_text.see(tk.END)
-        self.root.update()
         
     def run_sync(self):
         """동기화 실행"""
+        if self.running:
+            return
+        
         json_file = self.json_path.get()
         en_json_file = self.en_json_path.get()
         tsv_file = self.tsv_path.get()
@@ -151,97 +199,140 @@ class TranslationSyncGUI:
             messagebox.showerror("오류", f"TSV 파일을 찾을 수 없습니다: {tsv_file}")
             return
         
-        # 별도 스레드에서 실행
-        thread = threading.Thread(target=self._run_sync_thread, args=(json_file, en_json_file, tsv_file))
+        self.running = True
+        self.run_button.config(state=tk.DISABLED)
+        self.status_label.config(text="동기화 실행 중...")
+        self.progress.config(mode='indeterminate', value=0)
+        self.progress.start()
+        self.stage_started = {}
+        self.log_text.delete(1.0, tk.END)
+        
+        self.log_message("동기화를 시작합니다...")
+        self.log_message(f"kr.json 파일: {os.path.basename(json_file)}")
+        self.log_message(f"en.json 파일: {os.path.basename(en_json_file)}")
+        self.log_message(f"TSV 파일: {os.path.basename(tsv_file)}")
+        
+        # 별도 스레드에서 실행하고, 결과는 큐로 받아 메인 스레드에서 주기적으로 표시
+        thread = threading.Thread(target=self._run_sync_thread,
+                                  args=(json_file, en_json_file, tsv_file, self.profile_enabled.get()))
         thread.daemon = True
         thread.start()
+        self.root.after(QUEUE_POLL_MS, self._drain_events)
         
-    def _run_sync_thread(self, json_file, en_json_file, tsv_file):
-        """동기화를 별도 스레드에서 실행"""
-        try:
-            self.status_label.config(text="동기화 실행 중...")
-            self.progress.start()
-            self.log_text.delete(1.0, tk.END)
+    def _drain_events(self):
+        """작업 스레드가 큐에 넣은 이벤트를 한 번에 모아서 화면에 반영 (메인 스레드)"""
+        lines = []
+        progress = None
+        done = None
+        for _ in range(QUEUE_BATCH_SIZE):
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            kind = event[0]
+            if kind == 'log':
+                lines.append(f"[{event[2]}] {event[1]}\n")
+            elif kind == 'progress':
+                progress = event[1:]
+                self.stage_started.setdefault(event[1], event[4])
+            elif kind == 'profile':
+                metrics = event[1]
+                self.status_label.config(text=f"{metrics['label']} 완료 ({metrics['seconds']:.2f}초)")
+            elif kind == 'done':
+                done = event[1:]
+                break
+        
+        if lines:
+            self.log_text.insert(tk.END, ''.join(lines))
+            self.log_text.see(tk.END)
+        if progress is not None:
+            self._show_progress(*progress)
+        
+        if done is not None:
+            self._finish_sync(*done)
+        else:
+            self.root.after(QUEUE_POLL_MS, self._drain_events)
             
-            self.log_message("동기화를 시작합니다...")
-            self.log_message(f"kr.json 파일: {os.path.basename(json_file)}")
-            self.log_message(f"en.json 파일: {os.path.basename(en_json_file)}")
-            self.log_message(f"TSV 파일: {os.path.basename(tsv_file)}")
+    def _show_progress(self, stage, rows, total, timestamp):
+        """진행 막대와 상태 표시줄 갱신 (전체 행 수를 알면 초당 행 수와 남은 시간도 표시)"""
+        label = STAGE_LABELS.get(stage, stage)
+        elapsed = timestamp - self.stage_started.get(stage, timestamp)
+        rate = rows / elapsed if elapsed > 0 else 0
+        
+        if total:
+            if str(self.progress.cget('mode')) != 'determinate':
+                self.progress.stop()
+                self.progress.config(mode='determinate')
+            self.progress.config(value=min(rows / total, 1.0) * 100)
+            text = f"{label}: {rows:,} / {total:,}행"
+            if rate and rows < total:
+                text += f" · 초당 {rate:,.0f}행 · 남은 시간 약 {(total - rows) / rate:.0f}초"
+        else:
+            if str(self.progress.cget('mode')) != 'indeterminate':
+                self.progress.config(mode='indeterminate')
+                self.progress.start()
+            text = f"{label}: {rows:,}행"
+            if rate:
+                text += f" · 초당 {rate:,.0f}행"
+        self.status_label.config(text=text)
+        
+    def _finish_sync(self, result_success, result_output):
+        """동기화 종료 처리 (메인 스레드)"""
+        self.running = False
+        self.run_button.config(state=tk.NORMAL)
+        self.progress.stop()
+        self.progress.config(mode='determinate', value=100 if result_success else 0)
+        
+        if result_success:
+            self.status_label.config(text="동기화가 성공적으로 완료되었습니다!")
+            self.log_message("=== 동기화 완료 ===")
+            self.log_message(result_output)
+            messagebox.showinfo("완료", "동기화가 성공적으로 완료되었습니다!")
+        else:
+            self.status_label.config(text="동기화 중 오류가 발생했습니다.")
+            self.log_message("=== 오류 발생 ===")
+            self.log_message(result_output)
+            messagebox.showerror("오류", f"동기화 중 오류가 발생했습니다:\n{result_output}")
+        
+    def _run_sync_thread(self, json_file, en_json_file, tsv_file, profile=False):
+        """동기화를 별도 스레드에서 실행 (화면은 건드리지 않고 이벤트만 큐에 넣음)"""
+        events = self.events
+        
+        def on_progress(stage, rows, total):
+            events.put(('progress', stage, rows, total, time.perf_counter()))
             
-            # Python 스크립트를 직접 호출하는 대신 임포트해서 실행
-            try:
-                # 스크립트 디렉토리를 sys.path에 추가
-                script_dir = os.path.dirname(__file__)
-                if script_dir not in sys.path:
-                    sys.path.insert(0, script_dir)
-                
-                # print 출력을 GUI 로그로 리다이렉트
-                import io
-                from contextlib import redirect_stdout, redirect_stderr
-                
-                # 출력 캡처용 StringIO 객체 생성
-                stdout_capture = io.StringIO()
-                stderr_capture = io.StringIO()
-                
-                # 직접 함수 호출로 변경
-                import translation_sync
-                
-                # sys.argv 임시 설정
-                old_argv = sys.argv
-                sys.argv = ['translation_sync.py', json_file, en_json_file, tsv_file]
-                
-                # stdout/stderr를 캡처하면서 메인 함수 실행
-                with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                    translation_sync.main()
-                
-                # 캡처된 출력을 GUI 로그에 표시
-                captured_output = stdout_capture.getvalue()
-                if captured_output:
-                    for line in captured_output.split('\n'):
-                        if line.strip():
-                            self.log_message(line)
-                
-                captured_errors = stderr_capture.getvalue()
-                if captured_errors:
-                    for line in captured_errors.split('\n'):
-                        if line.strip():
-                            self.log_message(f"ERROR: {line}")
-                
-                # sys.argv 복원
-                sys.argv = old_argv
-                
-                # 성공으로 처리
-                result_success = True
-                result_output = "동기화가 성공적으로 완료되었습니다."
-                
-            except SystemExit as e:
-                # 정상 종료인 경우
-                result_success = (e.code == 0 or e.code is None)
-                result_output = "동기화가 완료되었습니다."
-                sys.argv = old_argv
-            except Exception as e:
-                result_success = False
-                result_output = f"오류 발생: {str(e)}"
-                sys.argv = old_argv
+        def on_profile(metrics):
+            events.put(('profile', metrics))
+        
+        if profile:
+            translation_sync.profile_hooks.append(on_profile)
+        try:
+            options = {'profile': True} if profile else {}
             
-            self.progress.stop()
+            # print 출력을 한 줄씩 바로 로그 큐로 보내면서 동기화 실행
+            # 같은 창에서 다시 실행하면 바뀌지 않은 입력 파일은 캐시된 파싱 결과를 재사용
+            with redirect_stdout(QueueWriter(events)), redirect_stderr(QueueWriter(events, "ERROR: ")):
+                result = translation_sync.sync(json_file, en_json_file, tsv_file, options,
+                                               progress=on_progress, cache=self.input_cache)
             
-            if result_success:
-                self.status_label.config(text="동기화가 성공적으로 완료되었습니다!")
-                self.log_message("=== 동기화 완료 ===")
-                self.log_message(result_output)
-                messagebox.showinfo("완료", "동기화가 성공적으로 완료되었습니다!")
+            result_success = True
+            if result.skipped:
+                result_output = "입력 파일이 바뀌지 않아 TSV 를 다시 쓰지 않았습니다."
             else:
-                self.status_label.config(text="동기화 중 오류가 발생했습니다.")
-                self.log_message("=== 오류 발생 ===")
-                self.log_message(result_output)
-                messagebox.showerror("오류", f"동기화 중 오류가 발생했습니다:\n{result_output}")
-                
+                result_output = (f"총 {result.total}개 항목 (새 항목 {len(result.new_entries)}개, "
+                                 f"삭제 {len(result.deleted_entries)}개)")
+            
+        except translation_sync.SyncError as e:
+            result_success = False
+            result_output = str(e)
         except Exception as e:
-            self.progress.stop()
-            self.status_label.config(text="오류가 발생했습니다.")
-            self.log_message(f"예외 발생: {str(e)}")
-            messagebox.showerror("오류", f"예외가 발생했습니다:\n{str(e)}")
+            result_success = False
+            result_output = f"오류 발생: {str(e)}"
+        finally:
+            if on_profile in translation_sync.profile_hooks:
+                translation_sync.profile_hooks.remove(on_profile)
+        
+        events.put(('done', result_success, result_output))
 
 
 def main():
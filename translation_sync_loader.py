@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 입력 파일 동시 로드
+
+kr.json, en.json, TSV 는 서로 의존하지 않으므로 파일마다 스레드 하나씩 두고 동시에 읽습니다.
+동기화는 --concurrent-load 를 줄 때만 이 로더를 씁니다 (여러 코어의 로컬 디스크에서 빨라진다는 측정이 아직 없음).
+- 파일 읽기는 GIL 을 놓고 기다리므로 네트워크 공유 폴더처럼 느린 디스크에서도 세 파일의 읽기가 겹침
+- CPU 가 2개 이상이면 JSON 디코딩은 프로세스 풀에서 하고, 그동안 이 프로세스는 TSV 를 파싱
+- TSV 파싱은 프로세스 풀로 넘기지 않음 (TranslationRow 10만 개를 pickle 로 돌려받는 비용이 파싱 비용과 비슷함)
+- ParsedInputCache 를 넘기면 바뀌지 않은 파일은 읽지 않음
+
+세 결과를 모두 받은 뒤에 반환하므로, 이후 키 비교 단계는 순서대로 읽었을 때와 같은 데이터를 받습니다.
+"""
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from translation_sync import load_cached, load_tsv_file
+
+
+# 이보다 작은 JSON 은 프로세스에 넘기는 비용이 디코딩보다 커서 스레드에서 바로 디코딩
+PROCESS_MIN_BYTES = 1 << 20
+
+
+def decode_json_bytes(data):
+    """JSON 바이트 디코딩 (프로세스 풀 작업 함수 - 키 순서 유지)"""
+    return json.loads(data)
+
+
+def use_process_pool():
+    """JSON 디코딩에 프로세스 풀을 쓸지 (CPU 가 하나뿐이거나 이미 작업 프로세스 안이면 쓰지 않음)"""
+    return (os.cpu_count() or 1) > 1 and multiprocessing.current_process().name == 'MainProcess'
+
+
+class ConcurrentInputLoader:
+    """세 입력 파일을 동시에 읽는 로더 (with 문으로 쓰면 프로세스 풀을 정리함)"""
+
+    def __init__(self, cache=None, processes=None):
+        self.cache = cache
+        self.processes = use_process_pool() if processes is None else processes
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _decode(self, data):
+        if not self.processes or len(data) < PROCESS_MIN_BYTES:
+            return decode_json_bytes(data)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=2)
+        return self._pool.submit(decode_json_bytes, data).result()
+
+    def load_json(self, json_path):
+        """load_json_file 과 같은 결과 (오류면 메시지를 출력하고 None)"""
+        try:
+            with open(json_path, 'rb') as f:
+                data = f.read()
+            return self._decode(data)
+        except Exception as e:
+            print(f"JSON 파일 로드 오류: {e}")
+            return None
+
+    def load(self, json_path, en_json_path, tsv_path):
+        """(kr.json 데이터, en.json 데이터, (TSV 번역 데이터, 헤더 행)) 반환 - 세 파일을 모두 읽은 뒤 반환"""
+        cache = self.cache
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix='load') as threads:
+            kr = threads.submit(load_cached, cache, 'kr', json_path, self.load_json)
+            en = threads.submit(load_cached, cache, 'en', en_json_path, self.load_json)
+            tsv = threads.submit(load_cached, cache, 'tsv', tsv_path, load_tsv_file)
+            return kr.result(), en.result(), tsv.result()
+
+
+def load_inputs(json_path, en_json_path, tsv_path, cache=None, processes=None):
+    """세 입력 파일을 동시에 읽어 (kr.json 데이터, en.json 데이터, (TSV 번역 데이터, 헤더 행)) 반환"""
+    with ConcurrentInputLoader(cache, processes) as loader:
+        return loader.load(json_path, en_json_path, tsv_path)
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 증분 동기화 매니페스트
+
+마지막 동기화 시점의 입력 파일 정보와 키별 해시(kr 값, en 값, TSV 행)를 TSV 옆에 저장해두고,
+다음 실행 때 비교하여 바뀐 키를 찾아냅니다.
+
+매니페스트로 아끼는 작업
+  - 세 입력 파일의 크기/수정 시각이 그대로면 파일을 읽지 않고 종료
+  - kr.json/en.json 의 내용과 키 순서가 그대로면 (TSV 만 고쳤으면) TSV 를 다시 쓰지 않음
+  - TSV 가 마지막 동기화 이후 그대로면 (PreviousSheet) TSV 를 파싱하지 않고, 값이 바뀌지 않은 키는
+    지난번에 쓴 줄을 그대로 복사하며 새로 생긴/값이 바뀐/제거된 키의 행만 파싱해 다시 만듦
+    (원문 변경 확인과 검증도 그 행만, 카테고리 분류기는 새 키가 있을 때만 카테고리 칸을 읽어 만듦)
+TSV 를 고쳤으면 행 해시로 편집된 행을 보고하고 TSV 전체를 다시 읽고 씁니다.
+시트에 바뀐 행만 반영하려면 --delta 를 사용하세요.
+
+매니페스트 파일은 두 줄로 된 JSON 입니다.
+  1번째 줄: 헤더 (버전, 생성 시각, 입력 파일 크기/수정 시각) - 변경 없음 판단은 이 줄만 읽음
+  2번째 줄: 본문 (키 순서와 키별 8바이트 해시를 base64 로 이어 붙인 값)
+"""
+
+import base64
+import csv
+import hashlib
+import json
+import os
+from bisect import bisect_left
+from datetime import datetime
+
+from translation_sync import DEFAULT_FORMULA_MODE, is_shard_manifest, is_tsv_header_row, parse_tsv_row
+
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = '.sync_manifest.json'
+DIGEST_SIZE = 8
+
+# 행 해시에 포함하는 컬럼 (번역문/영문 원문/영문 아이템 ID 는 매번 다시 생성되므로 제외)
+ROW_HASH_FIELDS = ('한글_원문', '번역문_ID', '번역_입력문', '카테고리', '번역_상태', '비고')
+
+
+def manifest_path_for(tsv_path):
+    """TSV 파일에 대응하는 매니페스트 경로"""
+    return os.path.splitext(tsv_path)[0] + MANIFEST_SUFFIX
+
+
+def file_signature(path):
+    """변경 여부 판단용 파일 정보 (크기, 수정 시각) - 샤드 목록 파일이면 샤드들의 정보도 포함"""
+    st = os.stat(path)
+    signature = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+    if is_shard_manifest(path):
+        import translation_sync_shard as sync_shard
+        signature['shards'] = sync_shard.shard_set_signature(path)[1:]
+    return signature
+
+
+def digest_text(text):
+    """문자열의 8바이트 해시"""
+    if not isinstance(text, str):
+        text = json.dumps(text, ensure_ascii=False, sort_keys=True)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=DIGEST_SIZE).digest()
+
+
+def digest_row(trans_data):
+    """TSV 행(TranslationRow)의 사용자 편집 컬럼 해시"""
+    return digest_text('\x1f'.join(trans_data.get(name, '') for name in ROW_HASH_FIELDS))
+
+
+def _pack(digests):
+    return base64.b64encode(b''.join(digests)).decode('ascii')
+
+
+def _unpack(blob, count):
+    raw = base64.b64decode(blob)
+    return [raw[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE] for i in range(count)]
+
+
+class SyncManifest:
+    """마지막 동기화 결과 (키 순서와 키별 해시)"""
+
+    def __init__(self, header, keys, kr_digests, en_digests, row_digests):
+        self.header = header
+        self.keys = keys
+        self.kr = dict(zip(keys, kr_digests))
+        self.en = dict(zip(keys, en_digests))
+        self.row = dict(zip(keys, row_digests))
+        self.formula_mode = header.get('formula', DEFAULT_FORMULA_MODE)
+
+
+def load_manifest_header(manifest_path):
+    """매니페스트의 헤더(첫 줄)만 읽음 - 없거나 읽을 수 없으면 None"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    if header.get('version') != MANIFEST_VERSION:
+        return None
+    return header
+
+
+def load_manifest(manifest_path):
+    """매니페스트 전체 로드 - 없거나 읽을 수 없으면 None"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            body = json.loads(f.readline())
+        if header.get('version') != MANIFEST_VERSION:
+            return None
+        keys = body['keys']
+        return SyncManifest(
+            header, keys,
+            _unpack(body['kr'], len(keys)),
+            _unpack(body['en'], len(keys)),
+            _unpack(body['row'], len(keys)),
+        )
+    except (OSError, ValueError, KeyError) as e:
+        print(f"매니페스트 로드 오류 (전체 동기화로 진행): {e}")
+        return None
+
+
+def tsv_unchanged(header, tsv_path):
+    """TSV 가 매니페스트를 저장한 뒤(마지막 동기화가 쓴 뒤) 바뀌지 않았는지"""
+    if not header:
+        return False
+    try:
+        signature = file_signature(tsv_path)
+    except OSError:
+        return False
+    return header.get('files', {}).get('tsv', {}).get('signature') == signature
+
+
+def inputs_unchanged(header, json_path, en_json_path, tsv_path, formula_mode=DEFAULT_FORMULA_MODE):
+    """세 입력 파일과 번역문 작성 방식이 매니페스트 기록 이후 바뀌지 않았는지 확인 (파일 내용은 읽지 않음)"""
+    if not header or header.get('formula', DEFAULT_FORMULA_MODE) != formula_mode:
+        return False
+    try:
+        current = {
+            'kr': file_signature(json_path),
+            'en': file_signature(en_json_path),
+            'tsv': file_signature(tsv_path),
+        }
+    except OSError:
+        return False
+    return all(header.get('files', {}).get(name, {}).get('signature') == sig
+               for name, sig in current.items())
+
+
+class ManifestBuilder:
+    """create_updated_tsv 의 row_callback 으로 기록된 행을 받아 매니페스트 본문을 만듦
+
+    previous 와 diff 를 넘기면 지난번 줄을 그대로 복사한 행(trans_data 가 None)은
+    이전 매니페스트의 행 해시와 비교할 때 계산한 kr/en 해시를 그대로 씁니다.
+    """
+
+    def __init__(self, en_json_data, formula_mode=DEFAULT_FORMULA_MODE, previous=None, diff=None):
+        self.en_json_data = en_json_data
+        self.formula_mode = formula_mode
+        self.previous = previous
+        self.diff = diff
+        self.keys = []
+        self.kr_digests = []
+        self.en_digests = []
+        self.row_digests = []
+
+    def add_row(self, key, value, trans_data):
+        """TSV 에 기록된 한 행 추가 (trans_data 는 다시 불러왔을 때 얻게 될 TranslationRow, 복사한 줄이면 None)"""
+        if trans_data is None:
+            self.keys.append(key)
+            self.kr_digests.append(self.diff.kr_digests[key])
+            self.en_digests.append(self.diff.en_digests[key])
+            self.row_digests.append(self.previous.row[key])
+            return
+        en_value = self.en_json_data.get(key, '') if self.en_json_data else ''
+        self.keys.append(key)
+        self.kr_digests.append(digest_text(value))
+        self.en_digests.append(digest_text(en_value))
+        self.row_digests.append(digest_row(trans_data))
+
+    def add_existing(self, json_data, existing_translations):
+        """TSV 를 다시 쓰지 않는 경우 현재 입력으로 본문 구성"""
+        for key, value in json_data.items():
+            trans_data = existing_translations.get(key)
+            en_value = self.en_json_data.get(key, '') if self.en_json_data else ''
+            self.keys.append(key)
+            self.kr_digests.append(digest_text(value))
+            self.en_digests.append(digest_text(en_value))
+            self.row_digests.append(digest_row(trans_data) if trans_data is not None else b'\0' * DIGEST_SIZE)
+
+    def save(self, manifest_path, json_path, en_json_path, tsv_path):
+        """매니페스트 저장 (TSV 를 다 쓴 뒤 호출해야 TSV 파일 정보가 맞음)"""
+        header = {
+            'version': MANIFEST_VERSION,
+            'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'count': len(self.keys),
+            'formula': self.formula_mode,
+            'files': {
+                name: {'path': os.path.abspath(path), 'signature': file_signature(path)}
+                for name, path in (('kr', json_path), ('en', en_json_path), ('tsv', tsv_path))
+            },
+        }
+        body = {
+            'keys': self.keys,
+            'kr': _pack(self.kr_digests),
+            'en': _pack(self.en_digests),
+            'row': _pack(self.row_digests),
+        }
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header, ensure_ascii=False) + '\n')
+            f.write(json.dumps(body, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, manifest_path)
+
+
+def find_moved_keys(old_keys, new_keys):
+    """두 순서 모두에 있는 키 중 상대 순서가 바뀐 키 목록 (새 순서 기준)
+
+    새 순서에서 이전 위치가 증가하는 가장 긴 부분 수열(LIS)에 속한 키는 제자리로 보고,
+    나머지를 이동한 키로 판단합니다. O(n log n)
+    """
+    old_index = {key: i for i, key in enumerate(old_keys)}
+    common = [key for key in new_keys if key in old_index]
+    positions = [old_index[key] for key in common]
+
+    tails = []       # 길이별 LIS 마지막 원소의 위치값
+    tail_ids = []    # 위 값의 common 인덱스
+    prev = [-1] * len(positions)
+    for i, pos in enumerate(positions):
+        j = bisect_left(tails, pos)
+        if j == len(tails):
+            tails.append(pos)
+            tail_ids.append(i)
+        else:
+            tails[j] = pos
+            tail_ids[j] = i
+        prev[i] = tail_ids[j - 1] if j > 0 else -1
+
+    in_place = set()
+    i = tail_ids[-1] if tail_ids else -1
+    while i != -1:
+        in_place.add(i)
+        i = prev[i]
+    return [key for i, key in enumerate(common) if i not in in_place]
+
+
+class SyncDiff:
+    """매니페스트와 현재 입력의 키 단위 차이"""
+
+    def __init__(self):
+        self.inserted = []      # kr.json 에 새로 생긴 키
+        self.removed = []       # kr.json 에서 사라진 키
+        self.moved = []         # 순서가 바뀐 키
+        self.kr_changed = []    # kr.json 값이 바뀐 키
+        self.en_changed = []    # en.json 값이 바뀐 키
+        self.row_edited = []    # TSV 에서 편집된 행
+        self.tsv_order_matches = True
+        self.kr_digests = {}    # 키별 현재 kr/en 해시 (복사한 행의 매니페스트에 다시 씀)
+        self.en_digests = {}
+
+    @property
+    def source_changed(self):
+        return bool(self.inserted or self.removed or self.moved or self.kr_changed or self.en_changed)
+
+    def rebuilt_keys(self):
+        """행을 다시 만들어야 하는 기존 키 (kr.json 또는 en.json 값이 바뀐 키, kr.json 순서)"""
+        return list(dict.fromkeys(self.kr_changed + self.en_changed))
+
+    @property
+    def requires_rewrite(self):
+        """TSV 를 다시 써야 하는지 (행 편집만 있고 순서가 맞으면 다시 쓸 필요 없음)"""
+        return self.source_changed or not self.tsv_order_matches
+
+
+def compute_sync_diff(manifest, json_data, en_json_data, existing_translations=None, tsv_order=None):
+    """매니페스트 기준으로 바뀐 키 계산 (tsv_order: 다시 썼을 때의 TSV 키 순서, 기본은 kr.json 순서)
+
+    existing_translations 를 넘기지 않으면 TSV 가 마지막 동기화 이후 그대로인 경우로 보고
+    편집된 행과 TSV 순서는 비교하지 않습니다.
+    """
+    diff = SyncDiff()
+    new_keys = list(json_data.keys())
+    old_kr = manifest.kr
+
+    for key in new_keys:
+        kr_digest = diff.kr_digests[key] = digest_text(json_data[key])
+        en_value = en_json_data.get(key, '') if en_json_data else ''
+        en_digest = diff.en_digests[key] = digest_text(en_value)
+        if key not in old_kr:
+            diff.inserted.append(key)
+            continue
+        if kr_digest != old_kr[key]:
+            diff.kr_changed.append(key)
+        if en_digest != manifest.en[key]:
+            diff.en_changed.append(key)
+        if existing_translations is not None:
+            trans_data = existing_translations.get(key)
+            if trans_data is not None and digest_row(trans_data) != manifest.row[key]:
+                diff.row_edited.append(key)
+
+    new_key_set = set(new_keys)
+    diff.removed = [key for key in manifest.keys if key not in new_key_set]
+    diff.moved = find_moved_keys(manifest.keys, new_keys)
+    if existing_translations is not None:
+        diff.tsv_order_matches = list(existing_translations.keys()) == (new_keys if tsv_order is None else tsv_order)
+    return diff
+
+
+class PreviousSheet:
+    """마지막 동기화가 쓴 뒤 바뀌지 않은 TSV - 데이터 행을 파싱하지 않고 줄 그대로 보관
+
+    동기화는 kr.json 키마다 한 줄씩 쓰고 매니페스트에 그 순서대로 키를 남기므로
+    헤더 아래 n 번째 줄이 매니페스트의 n 번째 키의 행입니다.
+    """
+
+    def __init__(self, header_rows, lines):
+        self.header_rows = header_rows
+        self.lines = lines      # {키: 줄 바꿈을 포함한 TSV 줄}
+
+    def __len__(self):
+        return len(self.lines)
+
+    def _reader(self, lines):
+        # 이 도구가 쓴 파일이므로 csv 따옴표 규칙 (load_tsv_file 의 detect_tsv_quoting 참고)
+        return csv.reader(lines, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
+
+    def parse_rows(self, keys):
+        """keys 의 행만 파싱 → {키: TranslationRow} (load_tsv_file 과 같은 값)"""
+        rows = {}
+        for row in self._reader(self.lines[key] for key in keys if key in self.lines):
+            parsed = parse_tsv_row(row)
+            if parsed is not None:
+                rows[parsed[0]] = parsed[1]
+        return rows
+
+    def category_rows(self):
+        """모든 행의 카테고리 칸만 → {키: {'카테고리': 값}} (카테고리 분류기 학습용)"""
+        return {key: {'카테고리': row[5] if len(row) > 5 else ''}
+                for key, row in zip(self.lines, self._reader(self.lines.values()))}
+
+
+def _id_cell(key):
+    """동기화가 쓴 TSV 줄의 시작 (csv 규칙으로 감싼 "키": 칸과 탭)"""
+    return '"' + f'"{key}":'.replace('"', '""') + '"\t'
+
+
+def load_previous_sheet(tsv_path, manifest):
+    """마지막 동기화가 쓴 TSV 를 줄 단위로 읽어 PreviousSheet 반환 (줄과 매니페스트 키가 맞지 않으면 None)"""
+    try:
+        # 줄 끝(\r\n)을 바꾸지 않고 \n 에서만 나눠 읽어야 그대로 다시 쓸 수 있음
+        with open(tsv_path, 'r', encoding='utf-8', newline='\n') as f:
+            header_rows = []
+            # 헤더 칸에는 여러 줄 값이 있을 수 있으므로 헤더까지는 csv 로 읽음 (f 는 읽은 줄까지만 진행)
+            for row in csv.reader(f, delimiter='\t', quoting=csv.QUOTE_MINIMAL):
+                header_rows.append(row)
+                if is_tsv_header_row(row):
+                    break
+            else:
+                return None
+            lines = {}
+            keys = iter(manifest.keys)
+            for line in f:
+                key = next(keys, None)
+                if key is None or not line.startswith(_id_cell(key)):
+                    return None
+                lines[key] = line
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        print(f"TSV 줄 단위 로드 오류 (전체를 다시 읽습니다): {e}")
+        return None
+    if len(lines) != len(manifest.keys):
+        return None
+    return PreviousSheet(header_rows, lines)
+
+
+def print_sync_diff(diff, limit=10):
+    """증분 비교 결과 출력"""
+    print("\n[ 증분 비교 결과 ]")
+    sections = (
+        ('새로 생긴 키', diff.inserted),
+        ('제거된 키', diff.removed),
+        ('순서가 바뀐 키', diff.moved),
+        ('kr.json 값이 바뀐 키', diff.kr_changed),
+        ('en.json 값이 바뀐 키', diff.en_changed),
+        ('TSV 에서 편집된 행', diff.row_edited),
+    )
+    for label, keys in sections:
+        print(f"{label}: {len(keys)}개")
+        for key in keys[:limit]:
+            print(f"  - {key}")
+        if len(keys) > limit:
+            print(f"  ... 및 {len(keys) - limit}개 더")
+    if not diff.tsv_order_matches:
+        print("TSV 행 구성이 kr.json 순서와 다릅니다.")
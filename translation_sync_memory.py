@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 번역 메모리
+
+동기화할 때마다 TSV 의 (영문 원문, 번역 입력문) 쌍을 SQLite 파일에 모아 두고,
+새로 추가된 항목의 영문 원문과 같거나 비슷한 문장의 번역을 찾아 번역 입력문에 미리 채웁니다.
+
+비슷한 문장 찾기는 MinHash LSH 로 합니다.
+- 정규화한 문장(소문자, 공백 정리)의 글자 3-gram 을 crc32 로 해시해 16개 칸에 나누고 칸마다 최솟값을 취함
+  (one permutation hashing - 해시 함수 하나로 서명 전체를 만들고, 빈 칸은 오른쪽 칸 값을 빌려 채움)
+- 서명을 2칸씩 8개 구간으로 나눠 (구간, 값) 버킷을 색인해 두면, 유사도가 높은 문장일수록
+  버킷이 하나 이상 겹칠 확률이 높음 (3-gram 자카드 유사도 0.5 에서 약 90%, 0.7 에서 99% 이상)
+- 버킷이 겹친 후보만 실제 3-gram 자카드 유사도로 다시 채점하므로 문장이 수십만 개여도 한 행에 수 ms
+"""
+
+import os
+import sqlite3
+import zlib
+from collections import Counter
+from datetime import datetime
+from hashlib import blake2b
+
+from translation_sync import UNTRANSLATED_STATUSES
+
+
+MEMORY_SUFFIX = '.translation_memory.sqlite'
+NUM_BINS = 16
+BAND_ROWS = 2
+NUM_BANDS = NUM_BINS // BAND_ROWS
+DEFAULT_MIN_SCORE = 0.6
+DEFAULT_TOP_K = 3
+MAX_CANDIDATES = 50
+# 버킷 하나에서 읽을 최대 문장 수 (템플릿처럼 비슷한 문장이 수천 개인 버킷에서도 조회 시간이 일정하도록)
+MAX_BUCKET_SCAN = 200
+
+_BIN_BITS = NUM_BINS.bit_length() - 1
+_VALUE_MASK = (1 << (32 - _BIN_BITS)) - 1
+_DENSIFY_OFFSET = 0x9E3779B1
+
+# 구간마다 버킷 하나씩, 각 버킷에서 최대 MAX_BUCKET_SCAN 개 문장 id 를 한 번의 쿼리로 읽음
+_CANDIDATE_QUERY = ' UNION ALL '.join(
+    ['SELECT * FROM (SELECT segment_id FROM buckets WHERE bucket = ? LIMIT ?)'] * NUM_BANDS)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    source_hash INTEGER NOT NULL UNIQUE,
+    target_hash INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    key TEXT NOT NULL,
+    updated TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    bucket INTEGER NOT NULL,
+    segment_id INTEGER NOT NULL,
+    PRIMARY KEY (bucket, segment_id)
+) WITHOUT ROWID;
+"""
+
+
+def memory_path_for(tsv_path):
+    """TSV 파일에 대응하는 번역 메모리 경로"""
+    return os.path.splitext(tsv_path)[0] + MEMORY_SUFFIX
+
+
+def text_hash(text):
+    """문장 식별용 64비트 해시 (SQLite INTEGER 에 맞게 부호 있는 정수)"""
+    return int.from_bytes(blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little', signed=True)
+
+
+def normalize_text(text):
+    return ' '.join(text.lower().split())
+
+
+def shingles(text):
+    """정규화한 문장의 글자 3-gram 집합 (3글자보다 짧으면 문장 자체)"""
+    text = normalize_text(text)
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def minhash_signature(grams):
+    """3-gram 집합의 one permutation MinHash 서명 (NUM_BINS 개 값, 빈 집합이면 None)"""
+    if not grams:
+        return None
+    crc32 = zlib.crc32
+    mins = [None] * NUM_BINS
+    for gram in grams:
+        h = crc32(gram.encode('utf-8'))
+        b = h & (NUM_BINS - 1)
+        v = h >> _BIN_BITS
+        if mins[b] is None or v < mins[b]:
+            mins[b] = v
+    # 짧은 문장은 빈 칸이 많으므로 오른쪽으로 가장 가까운 칸 값을 거리만큼 바꿔서 채움
+    for b in range(NUM_BINS):
+        if mins[b] is None:
+            distance = 1
+            while mins[(b + distance) % NUM_BINS] is None:
+                distance += 1
+            mins[b] = (mins[(b + distance) % NUM_BINS] + distance * _DENSIFY_OFFSET) & _VALUE_MASK
+    return mins
+
+
+def band_buckets(signature):
+    """서명을 구간별 버킷 정수로 변환 (구간 번호 3비트 + 값 2개, 충돌 없이 한 정수에 담김)"""
+    width = 32 - _BIN_BITS
+    buckets = []
+    for band in range(NUM_BANDS):
+        bucket = band
+        for v in signature[band * BAND_ROWS:(band + 1) * BAND_ROWS]:
+            bucket = (bucket << width) | v
+        buckets.append(bucket)
+    return buckets
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class Suggestion:
+    """번역 메모리 제안 하나"""
+
+    __slots__ = ('score', 'source', 'target', 'key')
+
+    def __init__(self, score, source, target, key):
+        self.score = score
+        self.source = source
+        self.target = target
+        self.key = key
+
+    @property
+    def exact(self):
+        return self.score >= 1.0
+
+    def note(self):
+        """TSV 비고에 덧붙일 설명"""
+        kind = '일치' if self.exact else f'유사 {self.score:.0%}'
+        return f'번역 메모리 {kind}: {self.key}'
+
+    def __repr__(self):
+        return f"Suggestion({self.score:.3f}, {self.key!r}, {self.target!r})"
+
+
+class TranslationMemory:
+    """(영문 원문 → 번역 입력문) 번역 메모리
+
+    같은 영문 원문은 한 번만 저장하고, 번역이 바뀌면 최신 번역으로 갱신합니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+
+    def learn(self, pairs):
+        """(키, 영문 원문, 번역) 쌍들을 저장하고 (새 문장 수, 번역이 바뀐 문장 수) 반환"""
+        # 같은 영문 원문이 여러 번 나오면 마지막 번역을 사용 (실행할 때마다 결과가 같도록)
+        latest = {}
+        for key, source, target in pairs:
+            latest[text_hash(source)] = (key, source, target)
+
+        known = dict(self.conn.execute("SELECT source_hash, target_hash FROM segments"))
+        updated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        inserts = {}
+        updates = []
+        for source_hash, (key, source, target) in latest.items():
+            target_hash = text_hash(target)
+            previous = known.get(source_hash)
+            if previous == target_hash:
+                continue
+            if previous is None:
+                inserts[source_hash] = (source_hash, target_hash, source, target, key, updated_at)
+            else:
+                updates.append((target_hash, target, key, updated_at, source_hash))
+
+        # id 를 미리 정해 두고 문장과 버킷을 한꺼번에 넣음 (버킷은 정렬해서 넣어야 B-tree 삽입이 빠름)
+        next_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM segments").fetchone()[0] + 1
+        segment_rows = []
+        bucket_rows = []
+        for segment_id, row in enumerate(inserts.values(), next_id):
+            segment_rows.append((segment_id,) + row)
+            signature = minhash_signature(shingles(row[2]))
+            if signature is not None:
+                bucket_rows.extend((bucket, segment_id) for bucket in band_buckets(signature))
+        bucket_rows.sort()
+
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE segments SET target_hash = ?, target = ?, key = ?, updated = ? WHERE source_hash = ?",
+                updates)
+            self.conn.executemany(
+                "INSERT INTO segments (id, source_hash, target_hash, source, target, key, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", segment_rows)
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO buckets (bucket, segment_id) VALUES (?, ?)", bucket_rows)
+        return len(inserts), len(updates)
+
+    def learn_from_translations(self, translations, en_json_data=None):
+        """TSV 번역 데이터에서 번역을 마친 행의 (영문 원문, 번역 입력문) 쌍을 저장"""
+        def pairs():
+            for key, trans_data in translations.items():
+                if trans_data['번역_상태'].strip() in UNTRANSLATED_STATUSES:
+                    continue
+                target = trans_data['번역_입력문']
+                source = trans_data['영문_원문'] or (en_json_data.get(key, '') if en_json_data else '')
+                if source.strip() and target.strip():
+                    yield key, source, target
+        return self.learn(pairs())
+
+    def lookup(self, source):
+        """영문 원문이 정확히 같은 문장의 제안 (없으면 None)"""
+        row = self.conn.execute(
+            "SELECT source, target, key FROM segments WHERE source_hash = ?", (text_hash(source),)
+        ).fetchone()
+        if row is None or row[0] != source:
+            return None
+        return Suggestion(1.0, *row)
+
+    def suggest(self, source, k=DEFAULT_TOP_K, min_score=DEFAULT_MIN_SCORE):
+        """영문 원문과 같거나 비슷한 문장의 제안을 유사도 순으로 최대 k개 반환"""
+        results = []
+        exact = self.lookup(source)
+        if exact is not None:
+            results.append(exact)
+            if k <= 1:
+                return results
+
+        grams = shingles(source)
+        signature = minhash_signature(grams)
+        if signature is None:
+            return results
+        # 겹치는 버킷이 많은 문장일수록 유사도가 높을 가능성이 크므로 그 순서로 후보를 고름
+        params = []
+        for bucket in band_buckets(signature):
+            params += (bucket, MAX_BUCKET_SCAN)
+        hits = Counter(segment_id for (segment_id,) in self.conn.execute(_CANDIDATE_QUERY, params))
+        candidate_ids = [segment_id for segment_id, _ in hits.most_common(MAX_CANDIDATES)]
+        if not candidate_ids:
+            return results
+        candidates = self.conn.execute(
+            f"SELECT source, target, key FROM segments WHERE id IN ({','.join('?' * len(candidate_ids))})",
+            candidate_ids)
+
+        scored = []
+        for candidate_source, target, key in candidates:
+            if exact is not None and candidate_source == source:
+                continue
+            # 대소문자/공백만 다른 문장도 완전 일치로 보이지 않도록 1 미만으로 둠
+            score = min(jaccard(grams, shingles(candidate_source)), 0.999)
+            if score >= min_score:
+                scored.append(Suggestion(score, candidate_source, target, key))
+        scored.sort(key=lambda s: s.score, reverse=True)
+        return results + scored[:k - len(results)]
+
+    def best(self, source, min_score=DEFAULT_MIN_SCORE):
+        """가장 좋은 제안 하나 (없으면 None)"""
+        suggestions = self.suggest(source, 1, min_score) if source and source.strip() else []
+        return suggestions[0] if suggestions else None
+
+
+def open_memory(tsv_path, option=True):
+    """--memory 옵션 값(True 또는 경로)으로 번역 메모리 열기"""
+    path = option if isinstance(option, str) else memory_path_for(tsv_path)
+    return TranslationMemory(path)
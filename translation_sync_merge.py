@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 번역자별 TSV 병합
+
+여러 번역자가 시트 사본에서 작업한 TSV 들을 원문 ID 기준으로 합쳐 TSV 하나로 만듭니다.
+각 TSV 를 iter_tsv_rows 로 한 행씩 읽으면서 kr.json 키 순서로 k-way 병합하므로,
+메모리에는 kr.json 키 위치와 파일마다 한 행(N개 파일이면 N행)만 올라갑니다.
+그래서 사본들은 같은 kr.json 으로 동기화한 순서 그대로여야 하며, 행을 정렬한 사본은 먼저 동기화해야 합니다.
+
+같은 키의 행이 파일마다 다르면 충돌 처리 방식(--policy)으로 한 행을 고릅니다.
+- status     번역 상태가 가장 진행된 행 (미번역 < 검토 필요 < 그 밖의 상태, 같으면 나중에 수정한 파일)
+- non-empty  명령에 적은 파일 순서로 처음 번역된 행 (번역 입력문이 있고 미번역이 아닌 행)
+- flag       번역된 행이 서로 다르면 첫 파일의 행을 쓰고 번역 상태를 검토 필요로, 비고에 충돌 표시
+번역된 행끼리 번역 입력문/번역 상태가 다른 키는 방식과 관계없이 충돌 보고서에 남깁니다.
+"""
+
+import csv
+import heapq
+import os
+from datetime import datetime
+from itertools import chain, groupby
+from operator import attrgetter
+
+from translation_sync import (
+    DEFAULT_FORMULA_MODE, REVIEW_STATUS, UNTRANSLATED_STATUSES, TranslationRow, backup_existing_tsv,
+    build_tsv_row, iter_json_items, iter_tsv_rows, prepare_header_rows,
+)
+
+
+MERGE_POLICIES = ('status', 'non-empty', 'flag')
+DEFAULT_MERGE_POLICY = 'status'
+REPORT_SUFFIX = '_merge_conflicts.txt'
+# 번역자가 시트에서 고치는 컬럼 (나머지는 동기화가 다시 채우므로 사본끼리 비교하지 않음)
+_edited_fields = attrgetter('번역_입력문', '번역_상태', '비고', '카테고리')
+
+
+class MergeOrderError(ValueError):
+    """입력 TSV 의 행 순서가 kr.json 키 순서와 달라 스트리밍 병합을 할 수 없음"""
+
+
+def default_output_path(tsv_path):
+    """첫 TSV 와 같은 폴더의 <TSV 이름>_merged.tsv"""
+    return os.path.splitext(tsv_path)[0] + '_merged.tsv'
+
+
+def report_path_for(output_path):
+    """병합 결과 TSV 에 대응하는 충돌 보고서 경로"""
+    return os.path.splitext(output_path)[0] + REPORT_SUFFIX
+
+
+def load_key_positions(json_path):
+    """kr.json 키 → 순서 (값은 보관하지 않음)"""
+    return {key: i for i, (key, _) in enumerate(iter_json_items(json_path))}
+
+
+def is_translated(trans_data):
+    """번역자가 작업한 행인지 (번역 입력문이 있고, 미번역이면 원문과 다른 번역 입력문)"""
+    text = trans_data['번역_입력문']
+    if not text.strip():
+        return False
+    return trans_data['번역_상태'].strip() not in UNTRANSLATED_STATUSES or text != trans_data['한글_원문']
+
+
+def status_rank(trans_data):
+    status = trans_data['번역_상태'].strip()
+    if status in UNTRANSLATED_STATUSES:
+        return 0
+    return 1 if status == REVIEW_STATUS else 2
+
+
+def iter_positioned_rows(tsv_path, index, positions, report, header_rows=None):
+    """TSV 한 파일의 (kr.json 위치, 파일 번호, 키, TranslationRow) 를 순서대로 내보냄
+
+    kr.json 에 없는 키와 파일 안의 중복 키는 건너뛰고 report 에 셉니다.
+    위치가 앞으로 되돌아가면 MergeOrderError 를 발생시킵니다.
+    """
+    previous = -1
+    for key, trans_data in iter_tsv_rows(tsv_path, header_rows):
+        position = positions.get(key)
+        if position is None:
+            report['unknown'][index] += 1
+            continue
+        if position == previous:
+            report['duplicates'][index] += 1
+            continue
+        if position < previous:
+            raise MergeOrderError(
+                f"{tsv_path} 의 행 순서가 kr.json 과 다릅니다 (키: {key}). 이 사본을 먼저 kr.json 으로 동기화하세요."
+            )
+        previous = position
+        yield position, index, key, trans_data
+
+
+def choose_row(candidates, policy, recency, names):
+    """같은 키의 [(파일 번호, TranslationRow)] 에서 기록할 행과 충돌 여부 반환 (파일 번호 순)"""
+    first_index, first_row = candidates[0]
+    first_fields = _edited_fields(first_row)
+    if all(_edited_fields(row) == first_fields for _, row in candidates[1:]):
+        return first_index, first_row, None  # 대부분의 행은 아무도 고치지 않아 모든 사본이 같음
+    translated = [(index, row) for index, row in candidates if is_translated(row)]
+    conflict = len({(row['번역_입력문'], row['번역_상태'].strip()) for _, row in translated}) > 1
+
+    if policy == 'status':
+        index, row = max(candidates, key=lambda item: (status_rank(item[1]), is_translated(item[1]),
+                                                        recency[item[0]]))
+    elif policy == 'non-empty' or not conflict:
+        index, row = translated[0] if translated else candidates[0]
+    else:
+        # flag: 첫 파일의 행을 그대로 두고 검토 필요로 표시
+        index, row = first_index, TranslationRow(*first_row.values())
+        row['번역_상태'] = REVIEW_STATUS
+        sources = ', '.join(names[i] for i, _ in translated)
+        row['비고'] = f"{row['비고']} / 병합 충돌: {sources}" if row['비고'] else f"병합 충돌: {sources}"
+    return index, row, translated if conflict else None
+
+
+def merge_tsv_files(json_path, tsv_paths, output_path, policy=DEFAULT_MERGE_POLICY, backup_keep=None,
+                    formula_mode=DEFAULT_FORMULA_MODE):
+    """번역자별 TSV 들을 kr.json 키 순서로 병합해 output_path 에 기록 - 결과 요약 딕셔너리 반환
+
+    헤더 행은 첫 TSV 의 것을 씁니다. 충돌이 있으면 output_path 옆에 충돌 보고서를 저장합니다.
+    순서가 kr.json 과 다른 TSV 가 있으면 MergeOrderError 를 발생시키고 output_path 는 건드리지 않습니다.
+    """
+    if policy not in MERGE_POLICIES:
+        raise ValueError(f"알 수 없는 충돌 처리 방식입니다: {policy} ({' / '.join(MERGE_POLICIES)})")
+    if len(tsv_paths) < 2:
+        raise ValueError("병합할 TSV 파일을 2개 이상 지정하세요.")
+    names = [os.path.basename(path) for path in tsv_paths]
+    # 나중에 수정한 파일일수록 큰 값 (status 방식에서 상태가 같을 때 사용)
+    mtimes = [os.stat(path).st_mtime_ns for path in tsv_paths]
+    recency = {index: rank for rank, index in enumerate(sorted(range(len(tsv_paths)), key=mtimes.__getitem__))}
+
+    positions = load_key_positions(json_path)
+    report = {
+        'output': output_path, 'inputs': list(tsv_paths), 'policy': policy, 'total': 0,
+        'taken': [0] * len(tsv_paths), 'unknown': [0] * len(tsv_paths), 'duplicates': [0] * len(tsv_paths),
+        'conflicts': [], 'report_path': None,
+    }
+    header_rows = []
+    streams = [iter_positioned_rows(path, i, positions, report, header_rows if i == 0 else None)
+               for i, path in enumerate(tsv_paths)]
+    # 첫 행을 꺼내야 헤더 행이 채워지므로 병합 결과를 한 묶음 받아 둔 뒤 헤더를 기록
+    merged = groupby(heapq.merge(*streams), key=lambda item: item[0])
+    first_group = next(merged, None)
+    header_rows, formula_mode = prepare_header_rows(header_rows, formula_mode)
+
+    tmp_path = output_path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
+            writer.writerows(header_rows)
+            groups = merged if first_group is None else chain([first_group], merged)
+            for _, group in groups:
+                candidates = []
+                for _, index, key, trans_data in group:
+                    candidates.append((index, trans_data))
+                index, trans_data, conflict = choose_row(candidates, policy, recency, names)
+                report['taken'][index] += 1
+                report['total'] += 1
+                if conflict is not None:
+                    report['conflicts'].append((key, index, conflict))
+                writer.writerow(build_tsv_row(key, None, trans_data['영문_원문'], trans_data,
+                                              formula_mode=formula_mode))
+        backup_existing_tsv(output_path, backup_keep)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    report_path = report_path_for(output_path)
+    if report['conflicts']:
+        save_conflict_report(report, report_path)
+        report['report_path'] = report_path
+    elif os.path.exists(report_path):
+        os.remove(report_path)  # 지난 병합의 보고서가 남아 있으면 이번 충돌로 오해할 수 있음
+    return report
+
+
+def save_conflict_report(report, output_path):
+    """충돌 보고서를 텍스트 파일로 저장"""
+    names = [os.path.basename(path) for path in report['inputs']]
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(f"번역 병합 충돌 보고서 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write("=" * 50 + "\n\n")
+        f.write(f"충돌 처리 방식: {report['policy']}\n")
+        f.write(f"충돌한 항목 수: {len(report['conflicts'])}\n\n")
+        for i, (key, chosen, rows) in enumerate(report['conflicts'], 1):
+            f.write(f"{i}. 아이템 ID: {key}\n")
+            for index, trans_data in rows:
+                mark = '*' if index == chosen else ' '
+                f.write(f"  {mark} [{names[index]}] 번역 상태: {trans_data['번역_상태']}\n")
+                f.write(f"      번역 입력문: {trans_data['번역_입력문']!r}\n")
+            f.write(f"   기록한 행: {names[chosen]}\n")
+            f.write("-" * 40 + "\n\n")
+
+
+def print_merge_report(report, limit=10):
+    names = [os.path.basename(path) for path in report['inputs']]
+    print("\n=== TSV 병합 완료 ===")
+    print(f"총 항목 수: {report['total']} (충돌 처리 방식: {report['policy']})")
+    for name, taken, unknown, duplicates in zip(names, report['taken'], report['unknown'], report['duplicates']):
+        line = f"  - {name}: {taken}행 사용"
+        if unknown:
+            line += f", kr.json 에 없는 키 {unknown}개 제외"
+        if duplicates:
+            line += f", 중복 키 {duplicates}개 제외"
+        print(line)
+    conflicts = report['conflicts']
+    if conflicts:
+        print(f"\n주의: 번역이 서로 다른 항목 {len(conflicts)}개")
+        for key, chosen, _ in conflicts[:limit]:
+            print(f"  - {key} → {names[chosen]}")
+        if len(conflicts) > limit:
+            print(f"  ... 및 {len(conflicts) - limit}개 더")
+        print(f"충돌 보고서: {report['report_path']}")
+    print(f"\n병합된 TSV 파일: {report['output']}")
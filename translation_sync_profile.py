@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 단계별 성능 측정
+
+--profile 옵션으로 켜면 동기화 단계(kr.json 로드, en.json 로드, TSV 로드, 키 매칭, TSV 쓰기,
+삭제 항목 보고서)마다 벽시계 시간, CPU 시간, tracemalloc 최대 메모리, 초당 처리 행 수를 기록하고
+JSON 파일로 저장합니다. 단계가 끝날 때마다 등록된 훅을 호출하므로 GUI 에서도 바로 표시할 수 있습니다.
+"""
+
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+
+# 단계 이름 → 화면에 보여줄 이름
+STAGE_LABELS = {
+    'load_kr': 'kr.json 로드',
+    'load_en': 'en.json 로드',
+    'load_tsv': 'TSV 로드',
+    'load_inputs': '입력 파일 동시 로드',
+    'validate': '자리표시자/태그 검증',
+    'memory': '번역 메모리 학습',
+    'categorize': '카테고리 분류기 생성',
+    'key_match': '키 매칭',
+    'write_tsv': 'TSV 쓰기',
+    'deleted_report': '삭제 항목 보고서',
+    'push': '시트 전송',
+}
+
+
+class StageMetrics:
+    """단계 하나의 측정값 (rows 는 단계 안에서 채움)"""
+
+    __slots__ = ('name', 'rows', 'seconds', 'cpu_seconds', 'peak_mb')
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = None
+        self.seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_mb = None
+
+    @property
+    def rows_per_sec(self):
+        if not self.rows or self.seconds <= 0:
+            return None
+        return round(self.rows / self.seconds)
+
+    def to_dict(self):
+        return {
+            'stage': self.name,
+            'label': STAGE_LABELS.get(self.name, self.name),
+            'seconds': round(self.seconds, 4),
+            'cpu_seconds': round(self.cpu_seconds, 4),
+            'peak_mb': self.peak_mb,
+            'rows': self.rows,
+            'rows_per_sec': self.rows_per_sec,
+        }
+
+
+def format_stage(metrics):
+    """측정값 한 줄 요약"""
+    text = (f"[측정] {metrics['label']}: {metrics['seconds']:.3f}초 "
+            f"(CPU {metrics['cpu_seconds']:.3f}초")
+    if metrics['peak_mb'] is not None:
+        text += f", 최대 메모리 {metrics['peak_mb']:.1f} MB"
+    if metrics['rows_per_sec']:
+        text += f", 초당 {metrics['rows_per_sec']:,}행"
+    return text + ")"
+
+
+class StageProfiler:
+    """동기화 단계별 시간/메모리 측정기
+
+    enabled 가 False 이면 stage() 는 측정 없이 빈 레코드만 넘겨주므로 기존 실행 속도에 영향이 없습니다.
+    hooks 의 각 함수는 단계가 끝날 때 hook(단계 측정값 딕셔너리) 로 호출됩니다.
+    """
+
+    def __init__(self, enabled=False, hooks=(), cprofile_path=None):
+        self.enabled = enabled
+        self.hooks = list(hooks)
+        self.stages = []
+        self.started = datetime.now()
+        self._profiler = cProfile.Profile() if enabled and cprofile_path else None
+        self.cprofile_path = cprofile_path
+        self._own_tracemalloc = False
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_tracemalloc = True
+
+    @contextmanager
+    def stage(self, name):
+        metrics = StageMetrics(name)
+        if not self.enabled:
+            yield metrics
+            return
+
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        if self._profiler is not None:
+            self._profiler.enable()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield metrics
+        finally:
+            metrics.seconds = time.perf_counter() - wall
+            metrics.cpu_seconds = time.process_time() - cpu
+            if self._profiler is not None:
+                self._profiler.disable()
+            peak = tracemalloc.get_traced_memory()[1]
+            metrics.peak_mb = round(max(peak - start_memory, 0) / 2**20, 2)
+            self.stages.append(metrics)
+            result = metrics.to_dict()
+            print(format_stage(result))
+            for hook in self.hooks:
+                hook(result)
+
+    def report(self):
+        return {
+            'created': self.started.strftime('%Y-%m-%d %H:%M:%S'),
+            'total_seconds': round(sum(m.seconds for m in self.stages), 4),
+            'stages': [m.to_dict() for m in self.stages],
+        }
+
+    def finish(self, metrics_path):
+        """측정 결과를 JSON 으로 저장하고 (cProfile 을 켰으면 함께 저장) 측정을 끝냄"""
+        if not self.enabled:
+            return None
+        if self._own_tracemalloc:
+            tracemalloc.stop()
+            self._own_tracemalloc = False
+
+        report = self.report()
+        with open(metrics_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"성능 측정 결과를 저장했습니다: {metrics_path}")
+
+        if self._profiler is not None:
+            self._profiler.dump_stats(self.cprofile_path)
+            print(f"cProfile 결과를 저장했습니다: {self.cprofile_path} (python -m pstats 로 확인)")
+        self.enabled = False
+        return report
+
+
+def metrics_path_for(tsv_path, suffix='json'):
+    """TSV 파일에 대응하는 측정 결과 경로"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{os.path.splitext(tsv_path)[0]}_profile_{timestamp}.{suffix}"
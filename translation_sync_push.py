@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 구글 스프레드시트로 바로 전송
+
+TSV 를 시트에 가져오기(import) 하는 대신 Sheets API 의 values:batchUpdate 로 행을 바로 씁니다.
+값은 USER_ENTERED 로 보내므로 함수 컬럼과 숫자/날짜 해석은 TSV 가져오기와 같습니다.
+
+- changed (기본): 지난 전송 때 행마다 저장한 해시(<TSV 이름>.push_state.json)와 비교해
+  같은 위치의 내용이 바뀐 행만 보내고, 시트가 짧아졌으면 남는 행을 지웁니다. 이전 기록이 없으면 full 과 같습니다.
+- full: 모든 행을 보내고 마지막 행 아래를 지웁니다.
+
+연속한 행은 범위 하나(ValueRange)로 묶고, 요청 본문이 MAX_REQUEST_BYTES 를 넘지 않게 나눠
+스레드 몇 개(기본 4)로 동시에 보냅니다. 스레드마다 HTTP 연결 하나를 계속 재사용하며,
+429/5xx 응답과 연결 오류는 지수 백오프(지터 포함)로 다시 시도합니다.
+모든 요청이 성공해야 전송 기록을 저장하므로, 중간에 실패하면 다음 전송 때 다시 보냅니다.
+
+인증은 OAuth 액세스 토큰(SHEETS_ACCESS_TOKEN 환경 변수 또는 --push-token-file)을 그대로 씁니다.
+(예: gcloud auth print-access-token) 오프라인 확인은 translation_sync_sheets_mock 참고.
+"""
+
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from datetime import datetime
+from urllib.parse import quote, urlsplit
+
+from translation_sync import iter_tsv_data_rows
+
+
+PUSH_MODES = ('changed', 'full')
+DEFAULT_PUSH_MODE = 'changed'
+DEFAULT_ENDPOINT = 'https://sheets.googleapis.com'
+TOKEN_ENV = 'SHEETS_ACCESS_TOKEN'
+DEFAULT_WORKERS = 4
+# 구글 권장 요청 크기 (API 한도는 이보다 크지만 큰 요청은 느리고 시간 초과가 잦음)
+MAX_REQUEST_BYTES = 2 * 1024 * 1024
+DEFAULT_TIMEOUT = 120.0
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 32.0
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+VALUE_INPUT_OPTION = 'USER_ENTERED'
+
+STATE_VERSION = 1
+STATE_SUFFIX = '.push_state.json'
+
+
+class PushError(Exception):
+    """시트 전송 실패 (설정 오류, 재시도 후에도 실패한 요청)"""
+
+
+def push_state_path_for(tsv_path):
+    """TSV 파일(또는 샤드 목록 파일)에 대응하는 전송 기록 경로"""
+    return os.path.splitext(tsv_path)[0] + STATE_SUFFIX
+
+
+def column_letter(number):
+    """1 → A, 27 → AA"""
+    letters = ''
+    while number:
+        number, rest = divmod(number - 1, 26)
+        letters = chr(ord('A') + rest) + letters
+    return letters
+
+
+def a1_range(sheet, first_row, last_row=None, width=1):
+    """시트 탭 이름과 행 번호(1부터)로 A1 표기 범위 (last_row 가 None 이면 끝까지)"""
+    prefix = f"'{sheet.replace(chr(39), chr(39) * 2)}'!" if sheet else ''
+    end = '' if last_row is None else str(last_row)
+    return f"{prefix}A{first_row}:{column_letter(width)}{end}"
+
+
+def read_sheet_rows(tsv_path):
+    """TSV(또는 샤드 목록)를 시트에 들어갈 모양 그대로 (헤더 행 + 데이터 행) 칸 목록으로 읽음"""
+    header_rows = []
+    data_rows = list(iter_tsv_data_rows(tsv_path, header_rows))
+    return header_rows + data_rows
+
+
+class PushConfig:
+    """전송 대상과 방식 (명령행 옵션 --push, --spreadsheet, --sheet-tab, --push-endpoint, --push-token-file,
+    --push-workers 에서 만듦)"""
+
+    def __init__(self, spreadsheet, sheet=None, mode=DEFAULT_PUSH_MODE, endpoint=DEFAULT_ENDPOINT, token=None,
+                 workers=DEFAULT_WORKERS, max_request_bytes=MAX_REQUEST_BYTES):
+        if mode not in PUSH_MODES:
+            raise ValueError(f"알 수 없는 전송 방식입니다: {mode} ({' / '.join(PUSH_MODES)})")
+        if not spreadsheet:
+            raise ValueError("--spreadsheet=<스프레드시트 ID> 를 지정하세요.")
+        if urlsplit(endpoint).scheme not in ('http', 'https'):
+            raise ValueError(f"전송 주소는 http:// 또는 https:// 로 시작해야 합니다: {endpoint}")
+        if not token and endpoint.rstrip('/') == DEFAULT_ENDPOINT:
+            raise ValueError(f"구글 시트로 보내려면 액세스 토큰이 필요합니다 ({TOKEN_ENV} 환경 변수 또는 --push-token-file)")
+        if workers < 1:
+            raise ValueError("--push-workers 는 1 이상이어야 합니다.")
+        self.spreadsheet = spreadsheet
+        self.sheet = sheet
+        self.mode = mode
+        self.endpoint = endpoint
+        self.token = token
+        self.workers = workers
+        self.max_request_bytes = max_request_bytes
+
+    @classmethod
+    def from_options(cls, options):
+        """명령행 옵션 딕셔너리로 설정 만들기 (잘못된 값이면 ValueError)"""
+        mode = options.get('push')
+        token = os.environ.get(TOKEN_ENV)
+        token_file = options.get('push_token_file')
+        if token_file and token_file is not True:
+            with open(token_file, 'r', encoding='utf-8') as f:
+                token = f.read().strip()
+        spreadsheet = options.get('spreadsheet')
+        sheet = options.get('sheet_tab')
+        endpoint = options.get('push_endpoint')
+        workers = options.get('push_workers')
+        return cls(
+            spreadsheet if spreadsheet is not True else None,
+            sheet=sheet if sheet is not True else None,
+            mode=mode if mode and mode is not True else DEFAULT_PUSH_MODE,
+            endpoint=endpoint if endpoint and endpoint is not True else DEFAULT_ENDPOINT,
+            token=token,
+            workers=int(workers) if workers and workers is not True else DEFAULT_WORKERS,
+        )
+
+    def target(self):
+        """전송 기록이 가리키는 시트 (주소, 스프레드시트, 탭 중 하나라도 다르면 이전 기록을 쓰지 않음)"""
+        return {'endpoint': self.endpoint.rstrip('/'), 'spreadsheet': self.spreadsheet, 'sheet': self.sheet or ''}
+
+
+def load_push_state(state_path, config):
+    """전송 기록 (행 해시 목록, 열 수) - 없거나 다른 시트의 기록이면 None"""
+    from translation_sync_manifest import _unpack
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != STATE_VERSION or state.get('target') != config.target():
+            return None
+        return _unpack(state['rows'], state['count']), state['width']
+    except (OSError, ValueError, KeyError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"전송 기록 로드 오류 (전체 전송으로 진행): {e}")
+        return None
+
+
+def save_push_state(state_path, config, digests, width):
+    from translation_sync_manifest import _pack
+    state = {
+        'version': STATE_VERSION,
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'target': config.target(),
+        'count': len(digests),
+        'width': width,
+        'rows': _pack(digests),
+    }
+    tmp_path = state_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, state_path)
+
+
+def changed_runs(digests, previous):
+    """이전 해시 목록과 위치별로 비교해 바뀐 행의 연속 구간 [(시작, 끝)] (0부터, 끝 미포함)"""
+    runs = []
+    start = None
+    for i, digest in enumerate(digests):
+        same = previous is not None and i < len(previous) and previous[i] == digest
+        if not same and start is None:
+            start = i
+        elif same and start is not None:
+            runs.append((start, i))
+            start = None
+    if start is not None:
+        runs.append((start, len(digests)))
+    return runs
+
+
+def plan_requests(rows, runs, sheet, width, max_request_bytes=MAX_REQUEST_BYTES):
+    """보낼 구간을 요청 본문 크기 한도에 맞춰 나눔 - [[ValueRange, ...], ...] (요청 하나당 목록 하나)
+
+    요청 크기는 행마다 JSON 으로 바꾼 길이를 더해 계산합니다. 행 하나가 한도보다 크면 그 행만 따로 보냅니다.
+    """
+    requests = []
+    data = []
+    size = 0
+    range_overhead = 96 + len(sheet or '') * 3  # {"range": ..., "majorDimension": "ROWS", "values": []} 와 따옴표 처리
+
+    def close_range(first, values):
+        data.append({'range': a1_range(sheet, first + 1, first + len(values), width),
+                     'majorDimension': 'ROWS', 'values': values})
+
+    for start, end in runs:
+        first = start
+        values = []
+        size += range_overhead
+        for i in range(start, end):
+            row = rows[i]
+            if len(row) < width:
+                row = row + [''] * (width - len(row))  # 이전에 더 긴 행이었으면 남은 칸도 비움
+            row_size = len(json.dumps(row, ensure_ascii=False).encode('utf-8')) + 1
+            if size + row_size > max_request_bytes and (values or data):
+                if values:
+                    close_range(first, values)
+                requests.append(data)
+                data = []
+                first = i
+                values = []
+                size = range_overhead
+            values.append(row)
+            size += row_size
+        if values:
+            close_range(first, values)
+    if data:
+        requests.append(data)
+    return requests
+
+
+class SheetsClient:
+    """Sheets API values 엔드포인트 클라이언트 - 스레드마다 연결 하나를 유지하고 재시도"""
+
+    def __init__(self, endpoint, token=None, timeout=DEFAULT_TIMEOUT, max_retries=MAX_RETRIES,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX, sleep=time.sleep):
+        parts = urlsplit(endpoint)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip('/')
+        self.token = token
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.sleep = sleep
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self.requests = 0
+        self.retries = 0
+        self.connections_opened = 0
+        self.bytes_sent = 0
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+            conn = conn_class(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+                self.connections_opened += 1
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            try:
+                delay = min(float(retry_after), self.backoff_max)
+            except ValueError:
+                delay = None
+            if delay is not None:
+                self.sleep(delay)
+                return
+        # 지수 백오프 + 전체 지터 (여러 스레드가 같은 순간에 다시 몰리지 않도록)
+        self.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+
+    def request(self, method, path, body=None):
+        """요청을 보내 응답 JSON 반환 - 재시도할 수 없는 오류나 재시도를 다 쓰면 PushError"""
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json; charset=utf-8', 'Accept': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        url = self.base_path + path
+        for attempt in range(self.max_retries + 1):
+            conn = self._connection()
+            retry_after = None
+            try:
+                conn.request(method, url, body=payload, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+                if response.will_close:
+                    self._drop_connection()
+            except (http.client.HTTPException, OSError) as e:
+                # 서버가 유휴 연결을 닫았거나 시간 초과 - 새 연결로 다시 시도
+                self._drop_connection()
+                error = f"연결 오류: {e.__class__.__name__}: {e}"
+            else:
+                with self._lock:
+                    self.requests += 1
+                    self.bytes_sent += len(payload or b'')
+                if 200 <= response.status < 300:
+                    return json.loads(data) if data else {}
+                error = f"HTTP {response.status}: {_error_message(data)}"
+                if response.status not in RETRY_STATUSES:
+                    raise PushError(error)
+                retry_after = response.getheader('Retry-After')
+            if attempt == self.max_retries:
+                raise PushError(f"{error} ({self.max_retries}번 다시 시도 후)")
+            with self._lock:
+                self.retries += 1
+            self._backoff(attempt, retry_after)
+
+    def _values_path(self, spreadsheet, action):
+        return f"/v4/spreadsheets/{quote(spreadsheet, safe='')}/values:{action}"
+
+    def batch_update(self, spreadsheet, data, value_input_option=VALUE_INPUT_OPTION):
+        return self.request('POST', self._values_path(spreadsheet, 'batchUpdate'),
+                            {'valueInputOption': value_input_option, 'data': data})
+
+    def batch_clear(self, spreadsheet, ranges):
+        return self.request('POST', self._values_path(spreadsheet, 'batchClear'), {'ranges': ranges})
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+
+def _error_message(data):
+    """Sheets API 오류 응답 본문에서 메시지 추출"""
+    try:
+        return json.loads(data)['error']['message']
+    except (ValueError, KeyError, TypeError):
+        return data[:200].decode('utf-8', 'replace')
+
+
+def push_tsv(tsv_path, config, client=None):
+    """TSV(또는 샤드 목록)를 시트로 전송하고 결과 요약 딕셔너리 반환 - 실패하면 PushError"""
+    from translation_sync_manifest import digest_text
+    started = time.perf_counter()
+    rows = read_sheet_rows(tsv_path)
+    digests = [digest_text('\x1f'.join(row)) for row in rows]
+    width = max((len(row) for row in rows), default=1)
+
+    state_path = push_state_path_for(tsv_path)
+    previous = load_push_state(state_path, config) if config.mode == 'changed' else None
+    previous_count = None
+    if previous is not None:
+        previous, previous_width = previous
+        previous_count = len(previous)
+        width = max(width, previous_width)
+    runs = changed_runs(digests, previous)
+    requests = plan_requests(rows, runs, config.sheet, width, config.max_request_bytes)
+
+    # 마지막 행 아래에 남은 이전 행 지우기 (이전 행 수를 모르면 시트 끝까지)
+    clear_ranges = []
+    if previous_count is None:
+        clear_ranges.append(a1_range(config.sheet, len(rows) + 1, None, width))
+    elif previous_count > len(rows):
+        clear_ranges.append(a1_range(config.sheet, len(rows) + 1, previous_count, width))
+
+    owns_client = client is None
+    if owns_client:
+        client = SheetsClient(config.endpoint, config.token)
+    try:
+        with ThreadPoolExecutor(max_workers=min(config.workers, max(len(requests), 1))) as executor:
+            futures = [executor.submit(client.batch_update, config.spreadsheet, data) for data in requests]
+            if clear_ranges:
+                futures.append(executor.submit(client.batch_clear, config.spreadsheet, clear_ranges))
+            done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in pending:
+                future.cancel()
+            for future in done:
+                error = future.exception()
+                if error is not None:
+                    raise error if isinstance(error, PushError) else PushError(str(error))
+    finally:
+        if owns_client:
+            client.close()
+
+    save_push_state(state_path, config, digests, max((len(row) for row in rows), default=1))
+    return {
+        'mode': 'changed' if previous is not None else 'full',
+        'spreadsheet': config.spreadsheet,
+        'sheet': config.sheet,
+        'rows': len(rows),
+        'sent_rows': sum(end - start for start, end in runs),
+        'ranges': sum(len(data) for data in requests),
+        'requests': client.requests,
+        'retries': client.retries,
+        'connections': client.connections_opened,
+        'bytes': client.bytes_sent,
+        'cleared': clear_ranges,
+        'seconds': time.perf_counter() - started,
+        'state_path': state_path,
+    }
+
+
+def print_push_report(report):
+    target = report['spreadsheet'] + (f" / {report['sheet']}" if report['sheet'] else '')
+    if not report['sent_rows'] and not report['cleared']:
+        print(f"시트 전송: 지난 전송 이후 바뀐 행이 없습니다 ({target})")
+        return
+    print(f"시트 전송 ({report['mode']}): {report['rows']}행 중 {report['sent_rows']}행, "
+          f"범위 {report['ranges']}개, 요청 {report['requests']}번 "
+          f"({report['bytes'] / 1024 / 1024:.1f} MB, 연결 {report['connections']}개, {report['seconds']:.1f}초) → {target}")
+    if report['retries']:
+        print(f"  - 다시 시도한 요청: {report['retries']}번")
+    if report['cleared']:
+        print(f"  - 지운 범위: {', '.join(report['cleared'])}")
+
+
+def push_from_options(tsv_path, options):
+    """명령행 옵션으로 설정을 만들어 전송 (옵션 오류와 전송 실패 모두 PushError)"""
+    try:
+        config = PushConfig.from_options(options)
+    except (OSError, ValueError) as e:
+        raise PushError(str(e))
+    return push_tsv(tsv_path, config)
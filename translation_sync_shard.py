@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 샤드(여러 TSV) 출력
+
+시트 하나에 모든 행을 넣으면 구글 스프레드시트의 셀 수 제한(스프레드시트당 1,000만 칸)에 가까워지고
+큰 탭을 열거나 가져오기도 느려지므로, 행을 여러 TSV 로 나눠 씁니다.
+- rows:N     kr.json 순서대로 N행씩 (기본 50,000행 = 50만 칸)
+- category   카테고리 컬럼별 (카테고리가 처음 나온 순서대로)
+- prefix:N   키 앞 N글자별 (기본 1글자)
+
+나눈 TSV 들은 "<TSV 이름>_shards" 폴더에 쓰고, 샤드 순서를 적은 목록 파일 "<TSV 이름>.shards" 를 TSV 옆에 둡니다.
+목록 파일을 TSV 대신 넘기면 load_tsv_file / iter_tsv_data_rows 가 샤드들을 목록 순서대로 이어 한 시트처럼 읽고,
+다음 동기화도 목록에 적힌 방식으로 다시 나눠 씁니다. 각 샤드에는 같은 헤더 행이 들어갑니다.
+"""
+
+import csv
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import translation_sync_snapshot as sync_snapshot
+from translation_sync import (
+    SHARD_MANIFEST_SUFFIX, backup_existing_tsv, clean_plain_tsv_field, is_shard_manifest, iter_tsv_data_rows,
+    iter_updated_rows, load_tsv_file, parse_tsv_row, prepare_header_rows, progress_hooks, report_progress, PROGRESS_INTERVAL,
+    DEFAULT_FORMULA_MODE,
+)
+
+
+SHARD_VERSION = 1
+SHARD_MODES = ('rows', 'category', 'prefix')
+DEFAULT_SHARD_ROWS = 50000
+DEFAULT_PREFIX_LENGTH = 1
+MAX_WRITE_THREADS = 4
+UNCATEGORIZED = '미분류'
+_UNSAFE_NAME_RE = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+def shard_manifest_path_for(tsv_path):
+    """TSV 파일에 대응하는 샤드 목록 파일 경로 (이미 목록 파일이면 그대로)"""
+    if is_shard_manifest(tsv_path):
+        return tsv_path
+    return os.path.splitext(tsv_path)[0] + SHARD_MANIFEST_SUFFIX
+
+
+def shard_dir_for(manifest_path):
+    return os.path.splitext(manifest_path)[0] + '_shards'
+
+
+def parse_shard_option(option):
+    """--shard 옵션 값 → (방식, 크기) - 잘못된 값이면 ValueError"""
+    if option is True:
+        return 'rows', DEFAULT_SHARD_ROWS
+    mode, _, size = str(option).partition(':')
+    if mode not in SHARD_MODES:
+        raise ValueError(f"알 수 없는 샤드 방식입니다: {option} (rows:N / category / prefix:N)")
+    if mode == 'category':
+        if size:
+            raise ValueError(f"category 방식에는 크기를 지정하지 않습니다: {option}")
+        return mode, None
+    default = DEFAULT_SHARD_ROWS if mode == 'rows' else DEFAULT_PREFIX_LENGTH
+    try:
+        size = int(size) if size else default
+    except ValueError:
+        raise ValueError(f"샤드 크기는 정수여야 합니다: {option}") from None
+    if size < 1:
+        raise ValueError(f"샤드 크기는 1 이상이어야 합니다: {option}")
+    return mode, size
+
+
+def format_shard_spec(spec):
+    mode, size = spec
+    return mode if size is None else f'{mode}:{size}'
+
+
+def load_shard_manifest(manifest_path):
+    """샤드 목록 파일 로드 - 읽을 수 없으면 ValueError"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"샤드 목록 파일을 읽을 수 없습니다: {manifest_path} ({e})") from None
+    if data.get('version') != SHARD_VERSION or not isinstance(data.get('shards'), list):
+        raise ValueError(f"지원하지 않는 샤드 목록 파일입니다: {manifest_path}")
+    return data
+
+
+def shard_paths(manifest_path, manifest=None):
+    """목록 순서대로 샤드 TSV 절대 경로"""
+    manifest = manifest or load_shard_manifest(manifest_path)
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    return [os.path.join(base_dir, shard['file']) for shard in manifest['shards']]
+
+
+def resolve_shard_spec(option, tsv_path):
+    """--shard 옵션, 없으면 입력 목록 파일에 적힌 방식 → (방식, 크기)"""
+    if option:
+        return parse_shard_option(option)
+    manifest = load_shard_manifest(tsv_path)
+    return parse_shard_option(manifest.get('mode', 'rows') + (f":{manifest['size']}" if manifest.get('size') else ''))
+
+
+def shard_set_signature(manifest_path):
+    """목록 파일과 모든 샤드의 [수정 시각, 크기] (샤드 하나만 바뀌어도 달라짐)"""
+    st = os.stat(manifest_path)
+    signature = [[st.st_mtime_ns, st.st_size]]
+    try:
+        paths = shard_paths(manifest_path)
+    except ValueError:
+        return signature
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append([st.st_mtime_ns, st.st_size])
+        except OSError:
+            signature.append(None)
+    return signature
+
+
+def iter_shard_data_rows(manifest_path, header_rows=None):
+    """샤드들의 데이터 행을 목록 순서대로 이어서 내보냄 (헤더 행은 첫 샤드 것만 채움)"""
+    for i, path in enumerate(shard_paths(manifest_path)):
+        yield from iter_tsv_data_rows(path, header_rows if i == 0 else None)
+
+
+def load_shard_set(manifest_path):
+    """샤드들을 한 시트처럼 읽어 load_tsv_file 과 같은 (번역 데이터, 헤더 행) 반환
+
+    샤드마다 load_tsv_file 로 읽으므로 --snapshot 으로 쓴 샤드가 바뀌지 않았으면 파싱 스냅샷을 사용합니다.
+    """
+    translations = {}
+    header_rows = None
+    for path in shard_paths(manifest_path):
+        shard_translations, shard_header_rows = load_tsv_file(path)
+        translations.update(shard_translations)
+        if header_rows is None:
+            header_rows = shard_header_rows
+    return translations, header_rows or []
+
+
+def shard_label(spec, key, category):
+    """행이 들어갈 샤드 이름 (category 는 기록할 카테고리 칸, rows 방식은 None)"""
+    mode, size = spec
+    if mode == 'category':
+        return category.strip() or UNCATEGORIZED
+    if mode == 'prefix':
+        return key[:size]
+    return None
+
+
+def expected_key_order(json_data, existing_translations, spec):
+    """TSV 를 다시 쓰지 않을 때 샤드들을 이어 읽은 키 순서 (증분 비교의 TSV 순서 확인용)
+
+    kr.json 의 모든 키가 이미 TSV 에 있다는 전제로, 기존 행의 카테고리로 샤드를 나눠 create_sharded_tsv 와 같은 순서를 만듭니다.
+    """
+    if spec[0] == 'rows':
+        return list(json_data.keys())
+    groups = {}
+    for key in json_data:
+        trans_data = existing_translations.get(key)
+        category = clean_plain_tsv_field(trans_data['카테고리']) if trans_data is not None else ''
+        groups.setdefault(shard_label(spec, key, category), []).append(key)
+    return [key for keys in groups.values() for key in keys]
+
+
+def safe_file_name(label):
+    return _UNSAFE_NAME_RE.sub('_', label).strip('_.') or UNCATEGORIZED
+
+
+def write_shard(path, header_rows, rows, write_snapshot=False):
+    """샤드 TSV 하나 쓰기 (스레드 풀 작업 함수 - 기존 파일은 미리 백업해 둬야 함)"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
+        writer.writerows(header_rows)
+        writer.writerows(rows)
+    if write_snapshot:
+        snapshot = sync_snapshot.SnapshotWriter()
+        for row in rows:
+            snapshot.add_row(row)
+        try:
+            snapshot.save(path, header_rows)
+        except Exception as e:
+            print(f"TSV 스냅샷 저장 오류 (다음 실행 때 TSV 를 다시 파싱합니다): {e}")
+    return len(rows)
+
+
+def create_sharded_tsv(json_data, en_json_data, existing_translations, header_rows, manifest_path, spec,
+                       row_callback=None, backup_keep=None, suggest=None, carried=None, review=None,
+                       formula_mode=DEFAULT_FORMULA_MODE, write_snapshot=False, classify=None):
+    """create_updated_tsv 와 같은 행을 spec 방식으로 여러 TSV 에 나눠 쓰고 샤드 목록 파일 저장
+
+    행은 이 스레드에서 만들고(번역 메모리/원문 변경 확인 함수는 스레드 사이에 공유할 수 없음),
+    샤드 파일 쓰기는 스레드 풀에서 동시에 진행합니다. (새 키, 유지한 키, 삭제된 키) 목록을 반환합니다.
+    """
+    mode, size = spec
+    new_entries = []
+    updated_entries = []
+    header_rows, formula_mode = prepare_header_rows(header_rows, formula_mode)
+
+    groups = {}
+    seen_keys = set()
+    total = len(json_data) if hasattr(json_data, '__len__') else None
+    report_progress('write_tsv', 0, total)
+    rows = iter_updated_rows(json_data.items(), en_json_data, existing_translations, new_entries, updated_entries,
+                             suggest, carried, review, formula_mode, classify)
+    for key, value, row in rows:
+        seen_keys.add(key)
+        label = shard_label(spec, key, row[5])
+        if label is None:
+            label = (len(seen_keys) - 1) // size
+        groups.setdefault(label, []).append(row)
+        if row_callback is not None:
+            row_callback(key, value, parse_tsv_row(row)[1])
+        if progress_hooks and len(seen_keys) % PROGRESS_INTERVAL == 0:
+            report_progress('write_tsv', len(seen_keys), total)
+
+    shard_dir = shard_dir_for(manifest_path)
+    os.makedirs(shard_dir, exist_ok=True)
+    shards = []
+    for index, (label, shard_rows) in enumerate(groups.items(), 1):
+        name = f'{index:03d}.tsv' if mode == 'rows' else f'{index:03d}_{safe_file_name(label)}.tsv'
+        shards.append({
+            'file': os.path.relpath(os.path.join(shard_dir, name), os.path.dirname(os.path.abspath(manifest_path))),
+            'label': str(label) if mode != 'rows' else f'{index}',
+            'rows': len(shard_rows),
+        })
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    # 백업은 출력 순서가 섞이지 않도록 이 스레드에서 샤드 순서대로
+    for shard in shards:
+        backup_existing_tsv(os.path.join(base_dir, shard['file']), backup_keep)
+    with ThreadPoolExecutor(max_workers=min(MAX_WRITE_THREADS, len(shards)) or 1,
+                            thread_name_prefix='shard') as pool:
+        futures = [pool.submit(write_shard, os.path.join(base_dir, shard['file']), header_rows, shard_rows,
+                               write_snapshot)
+                   for shard, shard_rows in zip(shards, groups.values())]
+        for future in futures:
+            future.result()
+    report_progress('write_tsv', len(seen_keys), len(seen_keys))
+
+    # 지난 목록에만 있던 샤드(사라진 카테고리 등)와 그 파싱 스냅샷은 지움 (백업 저장소는 남김)
+    previous = []
+    if os.path.exists(manifest_path):
+        try:
+            previous = shard_paths(manifest_path)
+        except ValueError:
+            previous = []
+    current = {os.path.normcase(os.path.join(base_dir, shard['file'])) for shard in shards}
+    for path in previous:
+        if os.path.normcase(path) in current:
+            continue
+        for stale in (path, sync_snapshot.snapshot_path_for(path)):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+    save_shard_manifest(manifest_path, spec, shards)
+    deleted_entries = list(set(existing_translations.keys()) - seen_keys)
+    return new_entries, updated_entries, deleted_entries
+
+
+def save_shard_manifest(manifest_path, spec, shards):
+    mode, size = spec
+    data = {
+        'version': SHARD_VERSION,
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'mode': mode,
+        'size': size,
+        'count': sum(shard['rows'] for shard in shards),
+        'shards': shards,
+    }
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, manifest_path)
+
+
+def print_shard_summary(manifest_path, limit=10):
+    manifest = load_shard_manifest(manifest_path)
+    shards = manifest['shards']
+    print(f"\n샤드 {len(shards)}개 ({format_shard_spec(resolve_shard_spec(None, manifest_path))}), "
+          f"목록 파일: {manifest_path}")
+    for shard in shards[:limit]:
+        print(f"  - {shard['file']}: {shard['rows']}행")
+    if len(shards) > limit:
+        print(f"  ... 및 {len(shards) - limit}개 더")
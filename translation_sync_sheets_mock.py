@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 시트 전송 확인용 가짜 Sheets API 서버
+
+translation_sync_push 가 쓰는 values:batchUpdate / values:batchClear 와 값 읽기(GET values/<범위>)만
+흉내 내어 시트를 메모리에 보관합니다. 네트워크나 구글 계정 없이 --push 전체 과정을 확인할 때 씁니다.
+
+    python translation_sync_sheets_mock.py [--port=8765] [--fail-rate=0.1] [--latency=0.05] [--token=값]
+                                           [--max-body=바이트] [--dump=경로.tsv]
+    python translation_sync.py kr.json en.json 시트.tsv --push --spreadsheet=test \\
+        --push-endpoint=http://127.0.0.1:8765
+
+--fail-rate 를 주면 그 비율의 요청에 429/503 을 돌려주어 재시도를 확인할 수 있고,
+종료(Ctrl+C)할 때 --dump 경로에 받은 시트(탭별)를 TSV 로 저장합니다.
+코드에서는 with MockSheetsServer() as server: 로 띄우고 server.url 로 보내면 됩니다.
+"""
+
+import csv
+import json
+import random
+import re
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+
+DEFAULT_PORT = 8765
+DEFAULT_SHEET = 'Sheet1'
+# 실제 API 의 요청 크기 한도 (이보다 크면 413)
+DEFAULT_MAX_BODY = 10 * 1024 * 1024
+
+_PATH_RE = re.compile(r'/v4/spreadsheets/([^/]+)/values(?::(batchUpdate|batchClear)|/(.+))\Z')
+_CELL_RE = re.compile(r'([A-Z]+)(\d*)\Z')
+
+
+def column_number(letters):
+    """A → 1, AA → 27"""
+    number = 0
+    for char in letters:
+        number = number * 26 + ord(char) - ord('A') + 1
+    return number
+
+
+def parse_a1_range(text):
+    """"'탭'!A3:J10" → (탭 이름 또는 None, 첫 행, 마지막 행 또는 None, 첫 열, 마지막 열) - 행/열 번호는 0부터"""
+    sheet = None
+    if '!' in text:
+        sheet, _, text = text.rpartition('!')
+        if sheet.startswith("'") and sheet.endswith("'"):
+            sheet = sheet[1:-1].replace("''", "'")
+    start, _, end = text.partition(':')
+    start_match = _CELL_RE.match(start.upper())
+    end_match = _CELL_RE.match((end or start).upper())
+    if start_match is None or end_match is None:
+        raise ValueError(f"Unable to parse range: {text}")
+    first_row = int(start_match.group(2) or 1) - 1
+    last_row = int(end_match.group(2)) - 1 if end_match.group(2) else None
+    return (sheet, first_row, last_row,
+            column_number(start_match.group(1)) - 1, column_number(end_match.group(1)) - 1)
+
+
+class MockSpreadsheets:
+    """스프레드시트 ID → 탭 이름 → 행 목록 (행은 칸 문자열 목록)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sheets = {}
+
+    def grid(self, spreadsheet, sheet):
+        return self.sheets.setdefault(spreadsheet, {}).setdefault(sheet or DEFAULT_SHEET, [])
+
+    def write(self, spreadsheet, range_text, values):
+        sheet, first_row, _, first_col, _ = parse_a1_range(range_text)
+        with self.lock:
+            grid = self.grid(spreadsheet, sheet)
+            for offset, row_values in enumerate(values):
+                index = first_row + offset
+                while len(grid) <= index:
+                    grid.append([])
+                row = grid[index]
+                end = first_col + len(row_values)
+                if len(row) < end:
+                    row.extend([''] * (end - len(row)))
+                row[first_col:end] = ['' if value is None else str(value) for value in row_values]
+        return len(values)
+
+    def clear(self, spreadsheet, range_text):
+        sheet, first_row, last_row, first_col, last_col = parse_a1_range(range_text)
+        with self.lock:
+            grid = self.grid(spreadsheet, sheet)
+            for row in grid[first_row:None if last_row is None else last_row + 1]:
+                for col in range(first_col, min(last_col + 1, len(row))):
+                    row[col] = ''
+
+    def read(self, spreadsheet, range_text):
+        sheet, first_row, last_row, first_col, last_col = parse_a1_range(range_text)
+        with self.lock:
+            grid = self.grid(spreadsheet, sheet)
+            rows = [row[first_col:last_col + 1] for row in grid[first_row:None if last_row is None else last_row + 1]]
+        # 실제 API 처럼 뒤쪽 빈 칸과 빈 행은 빼고 돌려줌
+        rows = [row[:max((i + 1 for i, value in enumerate(row) if value), default=0)] for row in rows]
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    def rows(self, spreadsheet, sheet=None):
+        """탭 전체 (뒤쪽 빈 칸/빈 행 제외)"""
+        with self.lock:
+            width = max((len(row) for row in self.grid(spreadsheet, sheet)), default=1)
+        from translation_sync_push import a1_range
+        return self.read(spreadsheet, a1_range(sheet, 1, None, width))
+
+    def dump(self, output_path):
+        """받은 탭들을 TSV 로 저장 (탭이 여럿이면 <경로>_<스프레드시트>_<탭>.tsv)"""
+        tabs = [(spreadsheet, sheet) for spreadsheet, sheets in self.sheets.items() for sheet in sheets]
+        paths = []
+        for spreadsheet, sheet in tabs:
+            path = output_path if len(tabs) == 1 else \
+                output_path.rsplit('.', 1)[0] + f'_{spreadsheet}_{sheet}.tsv'
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                csv.writer(f, delimiter='\t', quoting=csv.QUOTE_MINIMAL).writerows(self.rows(spreadsheet, sheet))
+            paths.append(path)
+        return paths
+
+
+class MockSheetsHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # 연결 재사용 (keep-alive)
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.stats['connections'] += 1
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body, headers=()):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, status, message, headers=()):
+        self._send_json(status, {'error': {'code': status, 'message': message}}, headers)
+
+    def _check(self):
+        """인증, 지연, 일부러 낸 오류 처리 - 요청을 계속 처리해도 되면 True"""
+        server = self.server
+        with server.stats_lock:
+            server.stats['requests'] += 1
+        if server.latency:
+            time.sleep(server.latency)
+        if server.token and self.headers.get('Authorization') != f'Bearer {server.token}':
+            self._send_error(401, 'Request had invalid authentication credentials.')
+            return False
+        if server.fail_rate and server.random.random() < server.fail_rate:
+            with server.stats_lock:
+                server.stats['failures'] += 1
+            if server.random.random() < 0.5:
+                self._send_error(429, 'Quota exceeded (mock).', [('Retry-After', '0')])
+            else:
+                self._send_error(503, 'The service is currently unavailable (mock).')
+            return False
+        return True
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        data = self.rfile.read(length)  # 크기 초과여도 본문은 읽어야 다음 요청을 같은 연결로 받을 수 있음
+        if length > self.server.max_body:
+            self._send_error(413, f'Request payload size exceeds the limit: {self.server.max_body} bytes.')
+            return None
+        with self.server.stats_lock:
+            self.server.stats['bytes'] += length
+        try:
+            return json.loads(data or b'{}')
+        except ValueError:
+            self._send_error(400, 'Invalid JSON payload received.')
+            return None
+
+    def do_POST(self):
+        match = _PATH_RE.match(unquote(urlsplit(self.path).path))
+        if match is None or match.group(2) is None:
+            self._read_body()
+            self._send_error(404, 'Not found.')
+            return
+        body = self._read_body()
+        if body is None or not self._check():
+            return
+        spreadsheet, action = match.group(1), match.group(2)
+        store = self.server.store
+        try:
+            if action == 'batchUpdate':
+                updated_rows = 0
+                for value_range in body.get('data', []):
+                    updated_rows += store.write(spreadsheet, value_range['range'], value_range.get('values', []))
+                with self.server.stats_lock:
+                    self.server.stats['updated_rows'] += updated_rows
+                self._send_json(200, {'spreadsheetId': spreadsheet, 'totalUpdatedRows': updated_rows,
+                                      'responses': [{'updatedRange': r['range']} for r in body.get('data', [])]})
+            else:
+                for range_text in body.get('ranges', []):
+                    store.clear(spreadsheet, range_text)
+                self._send_json(200, {'spreadsheetId': spreadsheet, 'clearedRanges': body.get('ranges', [])})
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_error(400, f'Invalid request: {e}')
+
+    def do_GET(self):
+        match = _PATH_RE.match(unquote(urlsplit(self.path).path))
+        if match is None or match.group(3) is None:
+            self._send_error(404, 'Not found.')
+            return
+        if not self._check():
+            return
+        try:
+            values = self.server.store.read(match.group(1), match.group(3))
+        except ValueError as e:
+            self._send_error(400, str(e))
+            return
+        self._send_json(200, {'range': match.group(3), 'majorDimension': 'ROWS', 'values': values})
+
+
+class MockSheetsServer(ThreadingHTTPServer):
+    """가짜 Sheets API 서버 - with 문으로 쓰면 백그라운드 스레드에서 실행하고 끝나면 종료"""
+
+    daemon_threads = True
+
+    def __init__(self, port=0, host='127.0.0.1', fail_rate=0.0, latency=0.0, token=None,
+                 max_body=DEFAULT_MAX_BODY, seed=None, verbose=False):
+        super().__init__((host, port), MockSheetsHandler)
+        self.store = MockSpreadsheets()
+        self.fail_rate = fail_rate
+        self.latency = latency
+        self.token = token
+        self.max_body = max_body
+        self.random = random.Random(seed)
+        self.verbose = verbose
+        self.stats_lock = threading.Lock()
+        self.stats = {'connections': 0, 'requests': 0, 'failures': 0, 'bytes': 0, 'updated_rows': 0}
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def main():
+    from translation_sync import parse_cli_args
+    args, options = parse_cli_args(sys.argv[1:])
+    if args:
+        print("사용법: python translation_sync_sheets_mock.py [--port=8765] [--fail-rate=0.1] [--latency=0.05]"
+              " [--token=값] [--max-body=바이트] [--dump=경로.tsv]")
+        sys.exit(1)
+    server = MockSheetsServer(
+        port=int(options.get('port', DEFAULT_PORT)),
+        fail_rate=float(options.get('fail_rate', 0.0)),
+        latency=float(options.get('latency', 0.0)),
+        token=options.get('token') if options.get('token') is not True else None,
+        max_body=int(options.get('max_body', DEFAULT_MAX_BODY)),
+        verbose=bool(options.get('verbose')),
+    )
+    print(f"가짜 Sheets API 서버: {server.url} (Ctrl+C 로 종료)")
+    # 스크립트에서 kill 로 끝내도 Ctrl+C 처럼 통계를 출력하고 --dump 를 저장
+    signal.signal(signal.SIGTERM, _interrupt)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    stats = server.stats
+    print(f"\n요청 {stats['requests']}번 (일부러 낸 오류 {stats['failures']}번), 연결 {stats['connections']}개, "
+          f"받은 행 {stats['updated_rows']}개, {stats['bytes'] / 1024 / 1024:.1f} MB")
+    dump_path = options.get('dump')
+    if dump_path and dump_path is not True:
+        for path in server.store.dump(dump_path):
+            print(f"받은 시트를 저장했습니다: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 자리표시자/태그 검증
+
+번역을 마친 행마다 영문 원문과 번역 입력문을 비교해 게임에서 오류나 깨진 글자를 일으키는 차이를 찾습니다.
+- 자리표시자: {0}, {count} 처럼 중괄호로 감싼 값이 빠지거나 늘어난 경우
+- 태그: <color=#C40000>, <b>, </b> 같은 서식 태그가 빠지거나 늘어난 경우, 번역의 태그 짝이 맞지 않는 경우
+- 이스케이프: 복원되지 않은 백슬래시(예: \\x)나 줄바꿈(\\n) 수가 영문 원문과 다른 경우
+
+대부분의 행은 중괄호/꺾쇠/백슬래시/줄바꿈이 없으므로 글자 포함 여부만 확인하고 넘어가며,
+나머지 행만 미리 컴파일한 정규식으로 비교합니다. 비교할 행이 많고 CPU 가 여럿이면 묶음 단위로 프로세스 풀에 나눕니다.
+"""
+
+import multiprocessing
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from translation_sync import UNTRANSLATED_STATUSES
+
+
+REPORT_SUFFIX = '_validation_report.txt'
+CHUNK_SIZE = 5000
+# 비교할 행이 이보다 적으면 프로세스를 띄우는 비용이 더 커서 이 프로세스에서 바로 비교
+PARALLEL_MIN_ROWS = 20000
+
+PLACEHOLDER_RE = re.compile(r'\{[^{}\s]*\}')
+TAG_RE = re.compile(r'<\s*(/?)\s*([A-Za-z][\w-]*)\s*(?:=\s*([^<>]*?))?\s*(/?)\s*>')
+
+ISSUE_LABELS = {
+    'placeholder': '자리표시자',
+    'tag': '태그',
+    'nesting': '태그 짝',
+    'escape': '이스케이프',
+    'newline': '줄바꿈 수',
+}
+
+
+def report_path_for(tsv_path):
+    """TSV 파일에 대응하는 검증 보고서 경로"""
+    return os.path.splitext(tsv_path)[0] + REPORT_SUFFIX
+
+
+def needs_check(text):
+    """자리표시자/태그/이스케이프/줄바꿈이 있을 수 있는 문자열인지 (정규식 없이 글자만 확인)"""
+    return '{' in text or '<' in text or '\\' in text or '\n' in text
+
+
+def extract_tags(text):
+    """서식 태그 목록 [(닫는 태그 여부, 소문자 이름, 값, 스스로 닫는 태그 여부)]"""
+    return [(closing == '/', name.lower(), value.strip(' "\''), self_closing == '/')
+            for closing, name, value, self_closing in TAG_RE.findall(text)]
+
+
+def format_tag(tag):
+    closing, name, value, self_closing = tag
+    text = f'</{name}' if closing else f'<{name}'
+    if value:
+        text += f'={value}'
+    return text + ('/>' if self_closing else '>')
+
+
+def nesting_error(tags):
+    """태그 짝이 맞지 않으면 설명 문자열, 맞으면 None (<br> 처럼 닫는 태그가 없는 이름은 확인하지 않음)"""
+    closed = {name for closing, name, _, _ in tags if closing}
+    stack = []
+    for closing, name, _, self_closing in tags:
+        if self_closing or name not in closed:
+            continue
+        if not closing:
+            stack.append(name)
+        elif stack and stack[-1] == name:
+            stack.pop()
+        else:
+            return f'</{name}> 의 여는 태그가 없거나 순서가 다름'
+    if stack:
+        return f'<{stack[-1]}> 를 닫지 않음'
+    return None
+
+
+def _count_difference(source_items, target_items):
+    """(번역에 빠진 것, 번역에만 있는 것) - 개수까지 비교"""
+    source_counts = Counter(source_items)
+    target_counts = Counter(target_items)
+    return list((source_counts - target_counts).elements()), list((target_counts - source_counts).elements())
+
+
+def _describe(missing, extra):
+    parts = []
+    if missing:
+        parts.append('빠짐 ' + ' '.join(missing))
+    if extra:
+        parts.append('추가됨 ' + ' '.join(extra))
+    return ', '.join(parts)
+
+
+def check_pair(source, target):
+    """영문 원문과 번역 입력문(둘 다 이스케이프를 복원한 문자열) 비교 → [(종류, 설명)]"""
+    issues = []
+    # 대부분 같으므로 정렬한 목록만 비교하고, 다를 때만 무엇이 빠졌는지 셈
+    if '{' in source or '{' in target:
+        source_placeholders = PLACEHOLDER_RE.findall(source)
+        target_placeholders = PLACEHOLDER_RE.findall(target)
+        if sorted(source_placeholders) != sorted(target_placeholders):
+            issues.append(('placeholder', _describe(*_count_difference(source_placeholders, target_placeholders))))
+
+    if '<' in source or '<' in target:
+        source_tags = extract_tags(source)
+        target_tags = extract_tags(target)
+        if sorted(source_tags) != sorted(target_tags):
+            missing, extra = _count_difference(map(format_tag, source_tags), map(format_tag, target_tags))
+            issues.append(('tag', _describe(missing, extra)))
+        elif target_tags != source_tags and nesting_error(source_tags) is None:
+            # 태그 순서가 원문과 같으면 짝도 원문과 같음
+            error = nesting_error(target_tags)
+            if error is not None:
+                issues.append(('nesting', error))
+
+    if '\\' in target:
+        source_slashes = source.count('\\')
+        target_slashes = target.count('\\')
+        if source_slashes != target_slashes:
+            issues.append(('escape', f'백슬래시 {source_slashes}개 → {target_slashes}개'))
+    if '\n' in source or '\n' in target:
+        source_lines = source.count('\n')
+        target_lines = target.count('\n')
+        if source_lines != target_lines:
+            issues.append(('newline', f'\\n {source_lines}개 → {target_lines}개'))
+    return issues
+
+
+def check_chunk(rows):
+    """[(키, 영문 원문, 번역 입력문)] 묶음 검증 (프로세스 풀 작업 함수) → [(키, 종류, 설명)]"""
+    issues = []
+    for key, source, target in rows:
+        for kind, detail in check_pair(source, target):
+            issues.append((key, kind, detail))
+    return issues
+
+
+def iter_candidate_rows(translations):
+    """번역을 마친 행 중 비교가 필요한 (키, 영문 원문, 번역 입력문)"""
+    for key, trans_data in translations.items():
+        source = trans_data['영문_원문']
+        target = trans_data['번역_입력문']
+        if not source or not target or not (needs_check(source) or needs_check(target)):
+            continue
+        if trans_data['번역_상태'].strip() in UNTRANSLATED_STATUSES:
+            continue
+        yield key, source, target
+
+
+def use_process_pool(row_count):
+    return (row_count >= PARALLEL_MIN_ROWS and (os.cpu_count() or 1) > 1
+            and multiprocessing.current_process().name == 'MainProcess')
+
+
+def validate_translations(translations, workers=None, chunk_size=CHUNK_SIZE):
+    """TSV 번역 데이터 전체 검증 → 행 순서대로 [(키, 종류, 설명)]
+
+    workers 를 주지 않으면 비교할 행 수와 CPU 수를 보고 프로세스 풀 사용 여부를 정합니다.
+    """
+    rows = list(iter_candidate_rows(translations))
+    if workers is None:
+        workers = min(os.cpu_count() or 1, 8) if use_process_pool(len(rows)) else 1
+    if workers <= 1 or len(rows) <= chunk_size:
+        return check_chunk(rows)
+
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    issues = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map 은 묶음 순서대로 결과를 돌려주므로 보고서도 행 순서를 유지
+        for chunk_issues in pool.map(check_chunk, chunks):
+            issues.extend(chunk_issues)
+    return issues
+
+
+def save_validation_report(issues, translations, output_path):
+    """검증 결과를 텍스트 파일로 저장"""
+    counts = Counter(kind for _, kind, _ in issues)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(f"자리표시자/태그 검증 보고서 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write("=" * 50 + "\n\n")
+        f.write(f"문제가 있는 항목 수: {len({key for key, _, _ in issues})}\n")
+        for kind, label in ISSUE_LABELS.items():
+            if counts[kind]:
+                f.write(f"  - {label}: {counts[kind]}\n")
+        f.write("\n")
+
+        previous = None
+        for key, kind, detail in issues:
+            if key != previous:
+                if previous is not None:
+                    f.write("-" * 40 + "\n\n")
+                trans_data = translations.get(key)
+                f.write(f"아이템 ID: {key}\n")
+                if trans_data is not None:
+                    f.write(f"   영문 원문: {trans_data['영문_원문']!r}\n")
+                    f.write(f"   번역 입력문: {trans_data['번역_입력문']!r}\n")
+                previous = key
+            f.write(f"   [{ISSUE_LABELS.get(kind, kind)}] {detail}\n")
+        if previous is not None:
+            f.write("-" * 40 + "\n")
+
+
+def print_validation_summary(issues, limit=10):
+    if not issues:
+        print("\n자리표시자/태그 검증: 문제 없음")
+        return
+    counts = Counter(kind for _, kind, _ in issues)
+    summary = ', '.join(f"{ISSUE_LABELS.get(kind, kind)} {count}" for kind, count in counts.items())
+    print(f"\n주의: 자리표시자/태그 검증에서 문제 {len(issues)}건 ({summary})")
+    for key, kind, detail in issues[:limit]:
+        print(f"  - {key}: [{ISSUE_LABELS.get(kind, kind)}] {detail}")
+    if len(issues) > limit:
+        print(f"  ... 및 {len(issues) - limit}건 더")
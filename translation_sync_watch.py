@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 감시 모드
+
+kr.json, en.json, TSV 파일을 감시하다가 바뀌면 잠시(debounce) 기다렸다가 증분 동기화를 실행합니다.
+파싱한 입력은 ParsedInputCache 에 남아 있으므로 바뀐 파일만 다시 읽습니다.
+Linux 에서는 inotify 로 변경을 기다리고, 그 밖의 환경에서는 주기적으로 파일 정보를 확인합니다.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+import translation_sync
+
+
+DEFAULT_DEBOUNCE = 1.0
+DEFAULT_POLL_INTERVAL = 1.0
+
+# inotify 상수 (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def file_signature(path):
+    """변경 판단용 (수정 시각, 크기) - 파일이 잠시 없으면 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class PollingWatcher:
+    """주기적으로 파일 정보를 비교하는 감시기 (모든 환경에서 동작)"""
+
+    name = '주기 확인'
+
+    def __init__(self, paths, interval=DEFAULT_POLL_INTERVAL):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.interval = interval
+        self._signatures = {path: file_signature(path) for path in self.paths}
+
+    def wait(self, timeout=None):
+        """바뀐 파일이 생기거나 timeout 초가 지날 때까지 기다려 바뀐 경로 집합 반환"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                signature = file_signature(path)
+                if signature != self._signatures[path]:
+                    self._signatures[path] = signature
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(self.interval, remaining))
+            else:
+                time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """inotify 로 파일이 있는 폴더를 감시 (Linux 전용)
+
+    저장할 때 임시 파일을 쓴 뒤 이름을 바꾸는 프로그램도 있으므로 파일이 아니라 폴더를 감시하고
+    이벤트의 파일 이름으로 걸러냅니다.
+    """
+
+    name = 'inotify'
+
+    def __init__(self, paths):
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        self.paths = [os.path.abspath(path) for path in paths]
+        self._names = {}  # 감시 id → {파일 이름: 경로}
+        watched_dirs = {}
+        for path in self.paths:
+            directory, name = os.path.split(path)
+            if directory not in watched_dirs:
+                wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+                if wd < 0:
+                    self.close()
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch 실패: {directory}")
+                watched_dirs[directory] = wd
+                self._names[wd] = {}
+            self._names[watched_dirs[directory]][os.fsencode(name)] = path
+
+    def wait(self, timeout=None):
+        """바뀐 파일이 생기거나 timeout 초가 지날 때까지 기다려 바뀐 경로 집합 반환"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return set()
+            changed = self._read_events()
+            if changed:
+                return changed
+
+    def _read_events(self):
+        changed = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            path = self._names.get(wd, {}).get(name)
+            if path is not None:
+                changed.add(path)
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(paths, poll=False, interval=DEFAULT_POLL_INTERVAL):
+    """가능하면 inotify, 아니면 주기 확인 감시기 생성"""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError) as e:
+            print(f"inotify 를 사용할 수 없어 주기 확인으로 감시합니다: {e}")
+    return PollingWatcher(paths, interval)
+
+
+def watch(json_path, en_json_path, tsv_path, options=None, debounce=DEFAULT_DEBOUNCE,
+          poll=False, interval=DEFAULT_POLL_INTERVAL, max_runs=None):
+    """세 파일을 감시하며 바뀔 때마다 증분 동기화 (Ctrl+C 로 종료, max_runs 번 동기화 후 종료)"""
+    options = dict(options or {}, incremental=True)
+    paths = [os.path.abspath(p) for p in (json_path, en_json_path, tsv_path)]
+    cache = translation_sync.ParsedInputCache()
+
+    def run_sync():
+        started = time.perf_counter()
+        try:
+            result = translation_sync.sync(*paths, options, cache=cache)
+            print(f"[감시] 동기화 {time.perf_counter() - started:.2f}초 - {result.counts()}")
+        except translation_sync.SyncError as e:
+            print(f"[감시] 동기화 실패: {e}")
+        # 동기화가 직접 쓴 TSV/매니페스트 변경은 다시 동기화하지 않도록 현재 상태를 기준으로 삼음
+        return {path: file_signature(path) for path in paths}
+
+    print("[감시] 시작 시 한 번 동기화합니다.")
+    signatures = run_sync()
+    runs = 0
+
+    watcher = create_watcher(paths, poll, interval)
+    print(f"[감시] 감시 방식: {watcher.name}. 파일 변경을 기다립니다. (종료: Ctrl+C)")
+    for path in paths:
+        print(f"  - {path}")
+    try:
+        while max_runs is None or runs < max_runs:
+            changed = watcher.wait()
+            # 연달아 들어오는 쓰기가 잠잠해질 때까지 모음
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+
+            current = {path: file_signature(path) for path in paths}
+            if any(signature is None for signature in current.values()):
+                print("[감시] 파일이 아직 다 쓰이지 않았습니다. 다음 변경을 기다립니다.")
+                continue
+            actually_changed = [path for path in paths if current[path] != signatures[path]]
+            if not actually_changed:
+                continue
+
+            print(f"\n[감시] 변경 감지: {', '.join(os.path.basename(p) for p in actually_changed)}")
+            signatures = run_sync()
+            runs += 1
+    except KeyboardInterrupt:
+        print("\n[감시] 종료합니다.")
+    finally:
+        watcher.close()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타르코프 한글화 번역 동기화 도구 - 중복을 묶은 번역 작업 목록
+
+ShortName, 아이템 변형들의 같은 설명, 공통 UI 문구처럼 영문 원문이 같은 미번역 행이 많아
+시트에서는 같은 문장을 여러 번 번역하게 됩니다.
+
+- worklist: 미번역 행을 공백을 정리한 영문 원문(없으면 한글 원문)의 해시로 묶어
+  문장 하나당 작업 한 줄(나온 횟수 포함)로 "<TSV 이름>_worklist.tsv" 에 씁니다.
+  번역 입력문은 시트의 새 항목처럼 한글 원문으로 채우고, 같은 문장을 이미 번역한 행이나
+  번역 메모리 제안이 있으면 참고 번역 칸에 적습니다.
+- apply-worklist: 번역을 마친 작업(번역 입력문이 있고 번역 상태를 바꿨거나 한글 원문과 다른 번역)을
+  같은 묶음의 모든 미번역 행에 채웁니다. 이미 번역된 행은 건드리지 않습니다.
+
+작업 ID 는 원문 해시이므로 목록을 내보낸 뒤 TSV 가 다시 동기화되어도 그대로 맞고,
+그 사이 새로 생긴 같은 문장의 행에도 함께 채워집니다.
+"""
+
+import csv
+import os
+from datetime import datetime
+from itertools import chain
+
+from translation_sync import (
+    REVIEW_STATUS, UNTRANSLATED_STATUSES, TranslationRow, backup_existing_tsv, is_shard_manifest,
+    iter_tsv_data_rows, iter_tsv_rows, parse_tsv_row, prepare_translation_input, source_text_digest,
+    static_translation_value, unescape_special_chars,
+)
+
+
+WORKLIST_SUFFIX = '_worklist.tsv'
+WORKLIST_HEADER = ['작업 ID', '개수', '영문 원문', '한글 원문', '번역 입력문', '번역 상태', '참고 번역', '예시 키']
+WORK_ID_SIZE = 6  # 작업 ID 로 쓰는 원문 해시 바이트 수 (hex 12자리)
+EXAMPLE_KEYS = 3
+
+# TSV 칸 번호 (build_tsv_row 순서)
+_TRANSLATION_CELL = 3
+_INPUT_CELL = 4
+_STATUS_CELL = 6
+_NOTE_CELL = 7
+_ROW_WIDTH = 10
+
+
+def default_output_path(tsv_path):
+    """TSV 와 같은 폴더의 <TSV 이름>_worklist.tsv"""
+    return os.path.splitext(tsv_path)[0] + WORKLIST_SUFFIX
+
+
+def work_id(trans_data):
+    """행이 속한 작업 묶음 ID (공백을 정리한 영문 원문, 없으면 한글 원문의 해시)"""
+    source = trans_data['영문_원문'] if trans_data['영문_원문'].strip() else trans_data['한글_원문']
+    return source_text_digest(source)[:WORK_ID_SIZE].hex()
+
+
+def is_untranslated(trans_data):
+    return trans_data['번역_상태'].strip() in UNTRANSLATED_STATUSES
+
+
+class WorkItem:
+    """같은 원문을 가진 미번역 행 묶음"""
+
+    __slots__ = ('work_id', 'first', 'keys', 'count', 'reference')
+
+    def __init__(self, work_id, first):
+        self.work_id = work_id
+        self.first = first      # 처음 나온 행 (TranslationRow) - 원문과 번역 입력문을 이 행에서 가져옴
+        self.keys = []          # 예시 키 (처음 EXAMPLE_KEYS 개)
+        self.count = 0
+        self.reference = ''     # 같은 원문을 이미 번역한 행의 번역 입력문 (없으면 번역 메모리 제안)
+
+    def row(self):
+        first = self.first
+        return [
+            self.work_id,
+            str(self.count),
+            prepare_translation_input(first['영문_원문']),
+            prepare_translation_input(first['한글_원문']),
+            prepare_translation_input(first['한글_원문']),
+            '미번역',
+            prepare_translation_input(self.reference),
+            ', '.join(self.keys) + (f' 외 {self.count - len(self.keys)}개' if self.count > len(self.keys) else ''),
+        ]
+
+
+def collect_work_items(tsv_path):
+    """TSV 를 한 번 읽어 (작업 묶음 목록, 미번역 행 수, 전체 행 수) 반환 - 묶음은 나온 횟수가 많은 순"""
+    items = {}
+    translated = {}  # 작업 ID → 번역된 행의 번역 입력문 (미번역 묶음에 참고로 붙임)
+    untranslated_rows = 0
+    total = 0
+    for key, trans_data in iter_tsv_rows(tsv_path):
+        total += 1
+        item_id = work_id(trans_data)
+        if not is_untranslated(trans_data):
+            if trans_data['번역_입력문'].strip():
+                translated.setdefault(item_id, trans_data['번역_입력문'])
+            continue
+        untranslated_rows += 1
+        item = items.get(item_id)
+        if item is None:
+            item = items[item_id] = WorkItem(item_id, trans_data)
+            if trans_data['번역_입력문'] != trans_data['한글_원문']:
+                item.reference = trans_data['번역_입력문']  # 번역 메모리 제안 (검토 전이라 미번역)
+        item.count += 1
+        if len(item.keys) < EXAMPLE_KEYS:
+            item.keys.append(key)
+    for item_id, text in translated.items():
+        item = items.get(item_id)
+        if item is not None:
+            item.reference = text
+    # dict 는 처음 나온 순서를 유지하므로 정렬 후에도 같은 개수끼리는 시트 순서
+    ordered = sorted(items.values(), key=lambda item: -item.count)
+    return ordered, untranslated_rows, total
+
+
+def export_worklist(tsv_path, output_path):
+    """미번역 행을 원문별 작업 한 줄로 묶어 output_path 에 저장 - 결과 요약 딕셔너리 반환"""
+    items, untranslated_rows, total = collect_work_items(tsv_path)
+    # 모든 칸을 번역 입력문처럼 이스케이프하므로(따옴표는 \", 탭은 공백, 개행은 \n) 따옴표 없이 쓰며,
+    # 따옴표로 시작하는 칸이 없어 시트에 가져와도 칸이 바뀌지 않음
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter='\t', quoting=csv.QUOTE_NONE, quotechar=None)
+        writer.writerow(WORKLIST_HEADER)
+        writer.writerows(item.row() for item in items)
+    os.replace(tmp_path, output_path)
+    return {
+        'tsv': tsv_path,
+        'output': output_path,
+        'total': total,
+        'untranslated': untranslated_rows,
+        'items': len(items),
+        'shared': sum(1 for item in items if item.count > 1),
+        'with_reference': sum(1 for item in items if item.reference),
+        'top': [(item.count, item.first['영문_원문'] or item.first['한글_원문']) for item in items[:5] if item.count > 1],
+    }
+
+
+def load_finished_work(worklist_path):
+    """작업 목록에서 번역을 마친 작업 → (번역 입력문, 번역 상태) - 그 밖의 작업 수도 함께 반환"""
+    from translation_sync_merge import is_translated
+    finished = {}
+    pending = 0
+    with open(worklist_path, 'r', encoding='utf-8') as f:
+        # export_worklist 가 쓴 파일과 시트에서 내보낸 파일 모두 따옴표 규칙이 없음
+        for row in csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE, quotechar=None):
+            if not row or row[0] == WORKLIST_HEADER[0] or not row[0].strip():
+                continue
+            row = row + [''] * (len(WORKLIST_HEADER) - len(row))
+            trans_data = TranslationRow(
+                한글_원문=unescape_special_chars(row[3]),
+                번역_입력문=unescape_special_chars(row[4]),
+                번역_상태=row[5],
+            )
+            if is_translated(trans_data):
+                status = trans_data['번역_상태'].strip()
+                finished[row[0].strip()] = (trans_data['번역_입력문'],
+                                            REVIEW_STATUS if status in UNTRANSLATED_STATUSES else status)
+            else:
+                pending += 1
+    return finished, pending
+
+
+def apply_worklist(tsv_path, worklist_path, output_path=None, backup_keep=None):
+    """번역을 마친 작업을 같은 묶음의 미번역 행 모두에 채워 TSV 를 다시 씀 - 결과 요약 딕셔너리 반환
+
+    행은 읽은 칸 그대로 두고 번역 입력문, 번역 상태, 비고 (번역문 칸이 계산된 값이면 그 값도) 만 바꿉니다.
+    output_path 를 주지 않으면 TSV 를 백업한 뒤 그 자리에 씁니다.
+    """
+    if output_path is None:
+        if is_shard_manifest(tsv_path):
+            raise ValueError("샤드 목록 파일에는 바로 쓸 수 없습니다. --output=<TSV 경로> 를 지정하세요.")
+        output_path = tsv_path
+    finished, pending = load_finished_work(worklist_path)
+    report = {
+        'tsv': tsv_path, 'output': output_path, 'finished': len(finished), 'pending': pending,
+        'filled': 0, 'used': set(), 'output_written': False,
+    }
+    if not finished:
+        report['unused'] = 0
+        return report
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    header_rows = []
+    tmp_path = output_path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
+            rows = iter_tsv_data_rows(tsv_path, header_rows)
+            # 첫 행을 꺼내야 헤더 행이 채워짐
+            first = next(rows, None)
+            writer.writerows(header_rows)
+            for row in chain([first], rows) if first is not None else ():
+                parsed = parse_tsv_row(row)
+                if parsed is not None and is_untranslated(parsed[1]):
+                    item_id = work_id(parsed[1])
+                    work = finished.get(item_id)
+                    if work is not None:
+                        row = _fill_row(row, work, item_id, today)
+                        report['filled'] += 1
+                        report['used'].add(item_id)
+                writer.writerow(row)
+        backup_existing_tsv(output_path, backup_keep)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    report['output_written'] = True
+    report['unused'] = len(finished) - len(report['used'])
+    return report
+
+
+def _fill_row(row, work, item_id, today):
+    """TSV 한 행(칸 목록)에 작업 번역 적용"""
+    text, status = work
+    row = row + [''] * (_ROW_WIDTH - len(row))
+    translation_input = prepare_translation_input(text)
+    row[_INPUT_CELL] = translation_input
+    if row[_TRANSLATION_CELL] and not row[_TRANSLATION_CELL].startswith('='):
+        row[_TRANSLATION_CELL] = static_translation_value(translation_input)  # --formula=static 으로 쓴 TSV
+    row[_STATUS_CELL] = status
+    note = f'작업 목록 {item_id} 적용 ({today})'
+    row[_NOTE_CELL] = f"{row[_NOTE_CELL]} / {note}" if row[_NOTE_CELL] else note
+    return row
+
+
+def print_export_report(report):
+    print("\n=== 번역 작업 목록 ===")
+    print(f"전체 {report['total']}행 중 미번역 {report['untranslated']}행 → 작업 {report['items']}개"
+          + (f" ({report['untranslated'] / report['items']:.1f}배 줄어듦)" if report['items'] else ""))
+    if report['shared']:
+        print(f"  - 여러 행이 같은 원문인 작업: {report['shared']}개")
+    if report['with_reference']:
+        print(f"  - 참고 번역(같은 원문의 기존 번역, 번역 메모리 제안)이 있는 작업: {report['with_reference']}개")
+    for count, text in report['top']:
+        print(f"  {count:>6}행  {text[:60]}")
+    print(f"\n작업 목록 파일: {report['output']}")
+    print("번역 입력문을 채우고 번역 상태를 바꾼 뒤 apply-worklist 로 TSV 에 적용하세요.")
+
+
+def print_apply_report(report):
+    print("\n=== 작업 목록 적용 ===")
+    print(f"번역을 마친 작업: {report['finished']}개 (아직인 작업 {report['pending']}개)")
+    if not report['output_written']:
+        print("적용할 번역이 없어 TSV 를 그대로 두었습니다.")
+        return
+    print(f"채운 행: {report['filled']}개 (작업 {len(report['used'])}개)")
+    if report['unused']:
+        print(f"  - 맞는 미번역 행이 없는 작업: {report['unused']}개 (이미 번역되었거나 원문이 바뀜)")
+    print(f"\n업데이트된 TSV 파일: {report['output']}")